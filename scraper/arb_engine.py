@@ -0,0 +1,130 @@
+"""
+Arbitrage maths for 2-, 3- and N-way markets, vectorized over every market in a run.
+
+Each market is an agency x outcome odds matrix (a betting-page block). All of a run's
+markets are packed into one (markets x agencies x outcomes) array padded with 0 odds,
+and one NumPy pass gives, per market:
+  best[j]      highest odds for outcome j, and the agency offering it
+  market %     100 * sum_j 1 / best[j]   (under 100 is an arb)
+  roi          100 / market % - 1
+A market with an outcome nobody prices can't be covered, so it gets no result.
+"""
+import re
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+_NUM_RE = re.compile(r"(\d+(?:\.\d+)?)")
+
+
+def to_odds(x: Any) -> float:
+    """Decimal odds from a table cell ("2.10", "$2.10", 2.1); 0.0 when there's no price."""
+    try:
+        v = float(x)
+    except (TypeError, ValueError):
+        m = _NUM_RE.findall(x) if isinstance(x, str) else None
+        v = float(m[-1]) if m else 0.0
+    return v if v > 0 else 0.0
+
+
+def outcome_names(table: Dict[str, Any]) -> List[str]:
+    """The block's outcome headers; older two-way blocks only have headers[1:3]."""
+    names = table.get("outcomes")
+    if names:
+        return list(names)
+    headers = table.get("headers") or []
+    return [headers[1] if len(headers) > 1 else "Left", headers[2] if len(headers) > 2 else "Right"]
+
+
+def row_odds(row: Dict[str, Any], n: int) -> List[Any]:
+    """One agency's prices, one per outcome (missing outcomes as None)."""
+    odds = row.get("odds")
+    if odds and len(odds) == n:
+        return list(odds)
+    out: List[Any] = [None] * n  # row/header layouts disagree: keep the outer two like the two-way path
+    out[0], out[-1] = row.get("left"), row.get("right")
+    return out
+
+
+def evaluate(tables: Sequence[Optional[Dict[str, Any]]],
+             legs: Optional[Sequence[int]] = None) -> List[Optional[Dict[str, Any]]]:
+    """
+    Best price per outcome and market % for every table in one pass.
+    legs[i] == 2 prices only the first and last outcome of table i (a two-way bet on a
+    block that also lists a draw, as the two-way stage always did); otherwise every
+    outcome has to be covered. Returns, per table:
+      {"outcomes": [{"name", "agency", "odds"}, ...], "market_percentage", "roi"}
+    or None when there is no table, the table has fewer outcomes than the bet has legs,
+    or an outcome has no price.
+    """
+    cols: List[List[int]] = []
+    names: List[List[str]] = []
+    agencies: List[List[str]] = []
+    m_idx: List[int] = []
+    a_idx: List[int] = []
+    j_idx: List[int] = []
+    vals: List[float] = []
+    for m, table in enumerate(tables):
+        all_names = outcome_names(table) if table and table.get("rows") else []
+        n = len(all_names)
+        if not n or (legs is not None and legs[m] > n):
+            cols.append([])
+            names.append([])
+            agencies.append([])
+            continue
+        use = [0, n - 1] if legs is not None and legs[m] == 2 and n > 2 else list(range(n))
+        cols.append(use)
+        names.append([all_names[j] for j in use])
+        agencies.append([r.get("agency") or "" for r in table["rows"]])
+        for a, row in enumerate(table["rows"]):
+            prices = row_odds(row, n)
+            for k, j in enumerate(use):
+                v = to_odds(prices[j])
+                if v:
+                    m_idx.append(m)
+                    a_idx.append(a)
+                    j_idx.append(k)
+                    vals.append(v)
+
+    n_markets = len(tables)
+    n_agencies = max((len(a) for a in agencies), default=0)
+    n_outcomes = max((len(c) for c in cols), default=0)
+    if not n_markets or not n_agencies or not n_outcomes:
+        return [None] * n_markets
+
+    odds = np.zeros((n_markets, n_agencies, n_outcomes))
+    odds[m_idx, a_idx, j_idx] = vals
+    used = np.arange(n_outcomes) < np.array([len(c) for c in cols])[:, None]  # (markets, outcomes)
+
+    best = odds.max(axis=1)              # (markets, outcomes)
+    best_agency = odds.argmax(axis=1)
+    covered = (best > 0) | ~used
+    inv = np.divide(1.0, best, out=np.zeros_like(best), where=used & (best > 0))
+    market_pct = inv.sum(axis=1) * 100.0
+    ok = covered.all(axis=1) & (market_pct > 0)  # also False for the empty (skipped) rows
+    roi = np.divide(100.0, market_pct, out=np.zeros_like(market_pct), where=ok) - 1.0
+
+    out: List[Optional[Dict[str, Any]]] = []
+    for m in range(n_markets):
+        if not ok[m]:
+            out.append(None)
+            continue
+        out.append({
+            "outcomes": [{"name": names[m][k], "agency": agencies[m][best_agency[m, k]],
+                          "odds": float(best[m, k])} for k in range(len(cols[m]))],
+            "market_percentage": float(market_pct[m]),
+            "roi": float(roi[m]),
+        })
+    return out
+
+
+def best_prices(rows: List[Dict[str, Any]], n: int) -> Tuple[List[Optional[str]], List[Optional[float]]]:
+    """Best (agency, odds) per outcome for one block's rows (first agency wins ties)."""
+    agencies: List[Optional[str]] = [None] * n
+    best: List[Optional[float]] = [None] * n
+    for r in rows:
+        for j, price in enumerate(row_odds(r, n)):
+            v = to_odds(price)
+            if v and (best[j] is None or v > best[j]):
+                agencies[j], best[j] = r.get("agency"), v
+    return agencies, best
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Benchmark the HTML extraction hot paths on the fixture pages.
+
+For every fixture (small realistic pages and the large worst-case .html.gz ones):
+  multibet/*  -> scraper.parse_multibet_html
+  betting/*   -> scraper.parse_betting_page
+  discover/*  -> discover_active_compids.analyze_page
+it reports ms/page (best of --repeat runs, timeit-style), rows/sec and the tracemalloc peak of
+one run, then compares ms/page with the stored baseline. A page slower than
+baseline * (1 + --tolerance) is a regression and the exit code is 1.
+
+Timings only compare on the same kind of machine: record the baseline where the
+check runs (--update-baseline), and keep the tolerance loose on shared runners.
+
+Usage: python scraper/bench.py [--repeat 7] [--tolerance 0.25] [--baseline scraper/bench_baseline.json]
+                               [--update-baseline] [--backend lxml]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, Tuple
+
+import parsers
+import scraper
+import discover_active_compids as discover
+from parser_parity import fixture_files, read_page
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def _betting_rows(index: Dict[str, Any]) -> int:
+    return sum(len((block or {}).get("rows") or []) for block in index.values())
+
+
+# kind -> (extract, rows produced by one result)
+BENCHES: Dict[str, Tuple[Callable[[str], Any], Callable[[Any], int]]] = {
+    "multibet": (lambda html: scraper.parse_multibet_html(html, 0), len),
+    "betting":  (scraper.parse_betting_page, _betting_rows),
+    "discover": (discover.analyze_page, lambda _: 1),
+}
+
+
+def bench_page(extract: Callable[[str], Any], count_rows: Callable[[Any], int],
+               html: str, repeat: int) -> Dict[str, float]:
+    # warm-up (imports, regex caches), and size the inner loop to ~50ms so small pages aren't all timer noise
+    t0 = time.perf_counter()
+    result = extract(html)
+    number = max(1, int(0.05 / max(time.perf_counter() - t0, 1e-6)))
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for _ in range(number):
+            extract(html)
+        times.append((time.perf_counter() - t0) / number)
+    rows = count_rows(result)
+
+    tracemalloc.start()
+    extract(html)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    ms = min(times) * 1000  # like timeit: the fastest run is the one least disturbed by the machine
+    return {
+        "kb": round(len(html) / 1024, 1),
+        "rows": rows,
+        "ms_per_page": round(ms, 3),
+        "rows_per_sec": round(rows / (ms / 1000), 1) if ms > 0 else 0.0,
+        "peak_kb": round(peak / 1024, 1),
+    }
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Benchmark the HTML extraction functions on the fixtures.")
+    ap.add_argument("--fixtures", default=os.path.join(HERE, "fixtures"))
+    ap.add_argument("--baseline", default=os.path.join(HERE, "bench_baseline.json"))
+    ap.add_argument("--update-baseline", action="store_true", help="Write this run as the new baseline")
+    ap.add_argument("--repeat", type=int, default=7)
+    ap.add_argument("--tolerance", type=float, default=0.25, help="Allowed ms/page slowdown (0.25 = 25%%)")
+    ap.add_argument("--backend", default=None, help="HTML parser backend (default: HTML_PARSER / auto)")
+    ap.add_argument("--json", default=None, help="Also write the results here")
+    args = ap.parse_args()
+
+    if args.backend:
+        parsers.PARSER_BACKEND = parsers.resolve_backend(args.backend)
+
+    baseline: Dict[str, Any] = {}
+    if os.path.exists(args.baseline) and not args.update_baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+    base_pages = baseline.get("pages", {})
+
+    results: Dict[str, Dict[str, float]] = {}
+    for kind, (extract, count_rows) in BENCHES.items():
+        for path in fixture_files(args.fixtures, kind):
+            rel = os.path.relpath(path, args.fixtures)
+            html = read_page(path)
+            r = bench_page(extract, count_rows, html, args.repeat)
+            base = (base_pages.get(rel) or {}).get("ms_per_page")
+            if base and r["ms_per_page"] > base * (1 + args.tolerance):
+                # one noisy neighbour shouldn't fail the run: measure a suspect page again, twice as long
+                retry = bench_page(extract, count_rows, html, args.repeat * 2)
+                if retry["ms_per_page"] < r["ms_per_page"]:
+                    r = retry
+            results[rel] = r
+    if baseline and baseline.get("backend") != parsers.PARSER_BACKEND:
+        print(f"[bench] note: baseline was recorded with {baseline.get('backend')}, "
+              f"this run uses {parsers.PARSER_BACKEND}")
+
+    regressions = 0
+    print(f"{'fixture':<36} {'KiB':>7} {'rows':>6} {'ms/page':>9} {'rows/s':>10} {'peak KiB':>9} {'vs base':>8}")
+    for rel, r in results.items():
+        base = (base_pages.get(rel) or {}).get("ms_per_page")
+        delta = ""
+        if base:
+            change = r["ms_per_page"] / base - 1.0
+            delta = f"{change:+.0%}"
+            if change > args.tolerance:
+                regressions += 1
+                delta += " !"
+        print(f"{rel:<36} {r['kb']:>7} {r['rows']:>6} {r['ms_per_page']:>9.2f} "
+              f"{r['rows_per_sec']:>10.0f} {r['peak_kb']:>9.0f} {delta:>8}")
+
+    payload = {"backend": parsers.PARSER_BACKEND, "python": sys.version.split()[0],
+               "repeat": args.repeat, "pages": results}
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(payload, f, indent=2)
+    if args.update_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(payload, f, indent=2)
+        print(f"[bench] baseline written to {args.baseline}")
+        return 0
+
+    if not baseline:
+        print("[bench] no baseline yet; run with --update-baseline to record one")
+    elif regressions:
+        print(f"[bench] {regressions} page(s) slower than baseline by more than {args.tolerance:.0%}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,13 +1,20 @@
 #!/usr/bin/env python3
 import argparse
 import json
+import multiprocessing
 import os
+import queue
 import re
 import sys
+import threading
 import time
-from typing import Dict, List, Optional, Set, Tuple
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Set, Tuple
 
-from bs4 import BeautifulSoup
+import requests
+from bs4 import SoupStrainer
+from requests.adapters import HTTPAdapter
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
@@ -16,11 +23,23 @@ from selenium.common.exceptions import TimeoutException, WebDriverException
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 
-BASE_URL = "http://odds.aussportsbetting.com/betting?competitionid={}"
+from parsers import make_soup
+from readiness import POLL_SECS, wait_for_quiescence, wait_summary
+from replay import page_key, record_page
+
+ODDS_BASE_URL = os.getenv("ODDS_BASE_URL", "http://odds.aussportsbetting.com").rstrip("/")
+BASE_URL = ODDS_BASE_URL + "/betting?competitionid={}"
+USER_AGENT = ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+              "AppleWebKit/537.36 (KHTML, like Gecko) "
+              "Chrome/124.0.0.0 Safari/537.36")
 
 # Module-level: side-channel for league names
 LEAGUES_BY_COMPID: Dict[str, str] = {}
 
+# --engine auto: how many IDs the HTTP probe settled vs escalated to Chrome
+PROBE_STATS = {"http": 0, "browser": 0}
+_PROBE_LOCK = threading.Lock()
+
 
 def make_driver(headful: bool = False) -> webdriver.Chrome:
     """
@@ -52,11 +71,9 @@ def make_driver(headful: bool = False) -> webdriver.Chrome:
     opts.add_argument("--disable-ipv6")
     # Allow loading plain-HTTP origin in newer Chrome
     opts.add_argument("--allow-running-insecure-content")
-    opts.add_argument("--unsafely-treat-insecure-origin-as-secure=http://odds.aussportsbetting.com")
+    opts.add_argument(f"--unsafely-treat-insecure-origin-as-secure={ODDS_BASE_URL}")
     # Realistic UA
-    opts.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                      "AppleWebKit/537.36 (KHTML, like Gecko) "
-                      "Chrome/124.0.0.0 Safari/537.36")
+    opts.add_argument(f"--user-agent={USER_AGENT}")
 
     # Wire the exact Chrome/Driver installed by setup-chrome
     chrome_bin = os.environ.get("CHROME_BIN") or os.environ.get("GOOGLE_CHROME_SHIM")
@@ -106,9 +123,15 @@ def save_screenshot(driver: webdriver.Chrome, dirpath: Optional[str], comp_id: i
     driver.save_screenshot(os.path.join(dirpath, f"comp_{comp_id}.png"))
 
 
-def extract_league_name(page_html: str) -> Optional[str]:
+# Only the title strip is needed for the league name; pages with no odds markers at all
+# are parsed with this strainer instead of building the whole tree.
+_TITLE_ONLY = SoupStrainer("td", id="datapage-title-strip")
+
+_NO_COUNTS = {"td_more_market_odds": 0, "a_addSelection": 0, "market_header_tables": 0}
+
+
+def _league_from_soup(soup) -> Optional[str]:
     """Read <td id="datapage-title-strip"><h1>…</h1></td> and strip trailing 'live odds'."""
-    soup = BeautifulSoup(page_html, "html.parser")
     td = soup.find("td", id="datapage-title-strip")
     if not td:
         return None
@@ -122,51 +145,63 @@ def extract_league_name(page_html: str) -> Optional[str]:
     return txt.strip() or None
 
 
-def inspect_dom(page_html: str) -> Tuple[bool, str, Dict[str, int]]:
+def _raw_markers(page_html: str) -> Tuple[bool, bool, bool]:
+    """Substring pre-check: which of the three heuristics could possibly match this page."""
+    return ("more-market-odds" in page_html,
+            "addSelection(" in page_html,
+            "market" in page_html.lower())
+
+
+def _activity_from_soup(soup, could_match: Tuple[bool, bool, bool] = (True, True, True)
+                        ) -> Tuple[bool, str, Dict[str, int]]:
     """
     Decide if page shows odds rows. Return (is_active, reason, counts).
-    Heuristics (all from rendered DOM):
+    Heuristics (all from rendered DOM), stopping at the first that matches:
       1) any <td id="more-market-odds"> cells
       2) any anchor with onclick containing 'addSelection('
       3) any table/tbody whose first row has a 'Market %' header cell
+    `could_match` (from _raw_markers) skips tree walks the raw HTML already rules out.
     """
-    soup = BeautifulSoup(page_html, "html.parser")
+    odds_cells, select_links, market_word = could_match
 
     # 1) direct odds cells
-    tds = soup.find_all("td", id="more-market-odds")
-    if len(tds) > 0:
-        return True, f"td#more-market-odds x{len(tds)}", {
-            "td_more_market_odds": len(tds), "a_addSelection": 0, "market_header_tables": 0
-        }
+    if odds_cells:
+        tds = soup.find_all("td", id="more-market-odds")
+        if len(tds) > 0:
+            return True, f"td#more-market-odds x{len(tds)}", dict(_NO_COUNTS, td_more_market_odds=len(tds))
 
     # 2) anchors calling addSelection
-    anchors = soup.find_all("a", onclick=True)
-    a_sel = sum(1 for a in anchors if "addSelection(" in (a.get("onclick") or ""))
-    if a_sel > 0:
-        return True, f"<a onclick=addSelection> x{a_sel}", {
-            "td_more_market_odds": 0, "a_addSelection": a_sel, "market_header_tables": 0
-        }
+    if select_links:
+        a_sel = sum(1 for a in soup.find_all("a", onclick=True) if "addSelection(" in (a.get("onclick") or ""))
+        if a_sel > 0:
+            return True, f"<a onclick=addSelection> x{a_sel}", dict(_NO_COUNTS, a_addSelection=a_sel)
 
     # 3) tables that look like the odds listing (header has "Market %")
-    tables = soup.find_all("tbody")
     header_hits = 0
-    for tb in tables:
-        first_tr = tb.find("tr")
-        if not first_tr:
-            continue
-        headers = [td.get_text(strip=True) for td in first_tr.find_all("td")]
-        if any(h.lower() in ("market %", "market%") for h in headers):
-            rows = tb.find_all("tr", recursive=False)
-            if len(rows) > 1:
-                header_hits += 1
+    if market_word:
+        for tb in soup.find_all("tbody"):
+            first_tr = tb.find("tr")
+            if not first_tr:
+                continue
+            headers = [td.get_text(strip=True) for td in first_tr.find_all("td")]
+            if any(h.lower() in ("market %", "market%") for h in headers):
+                rows = tb.find_all("tr", recursive=False)
+                if len(rows) > 1:
+                    header_hits += 1
     if header_hits > 0:
-        return True, f'table with "Market %" header x{header_hits}', {
-            "td_more_market_odds": 0, "a_addSelection": 0, "market_header_tables": header_hits
-        }
+        return True, f'table with "Market %" header x{header_hits}', dict(_NO_COUNTS, market_header_tables=header_hits)
 
-    return False, "no odds markers found", {
-        "td_more_market_odds": 0, "a_addSelection": 0, "market_header_tables": 0
-    }
+    return False, "no odds markers found", dict(_NO_COUNTS)
+
+
+def extract_league_name(page_html: str) -> Optional[str]:
+    """League title of a competition page (see _league_from_soup)."""
+    return _league_from_soup(make_soup(page_html, parse_only=_TITLE_ONLY))
+
+
+def inspect_dom(page_html: str) -> Tuple[bool, str, Dict[str, int]]:
+    """Activity verdict of a competition page: (is_active, reason, counts)."""
+    return _activity_from_soup(make_soup(page_html), _raw_markers(page_html))
 
 
 def _load_with_retries(driver: webdriver.Chrome, url: str, wait_secs: int) -> None:
@@ -178,7 +213,7 @@ def _load_with_retries(driver: webdriver.Chrome, url: str, wait_secs: int) -> No
     for _ in range(3):
         try:
             driver.get(url)
-            WebDriverWait(driver, wait_secs).until(
+            WebDriverWait(driver, wait_secs, poll_frequency=POLL_SECS).until(
                 EC.presence_of_all_elements_located((By.TAG_NAME, "table"))
             )
             return
@@ -189,58 +224,344 @@ def _load_with_retries(driver: webdriver.Chrome, url: str, wait_secs: int) -> No
         raise last
 
 
+def analyze_page(page_html: str) -> Tuple[bool, str, Dict[str, int], Optional[str]]:
+    """
+    Verdict, counts and league name from ONE parse; top-level so the parse pool can pickle it.
+    A page with none of the raw odds markers only has its title strip parsed.
+    """
+    could_match = _raw_markers(page_html)
+    soup = make_soup(page_html, parse_only=None if any(could_match) else _TITLE_ONLY)
+    is_active, reason, counts = _activity_from_soup(soup, could_match)
+    return is_active, reason, counts, _league_from_soup(soup)
+
+
+def load_competition_page(
+    driver: webdriver.Chrome,
+    comp_id: int,
+    wait_secs: int,
+    extra_sleep: float,
+    quiet_ms: int,
+    save_all_html_dir: Optional[str],
+    save_all_screens_dir: Optional[str],
+) -> str:
+    """Navigate to one competition, wait for it to settle and return its HTML."""
+    _load_with_retries(driver, BASE_URL.format(comp_id), wait_secs)
+
+    # settle until the page stops mutating (plus any explicit extra sleep)
+    wait_for_quiescence(driver, "discover-settle", quiet_ms=quiet_ms, css="table")
+    if extra_sleep > 0:
+        time.sleep(extra_sleep)
+
+    html = driver.page_source
+    record_page(page_key(BASE_URL.format(comp_id)), html)
+
+    # Save assets if requested
+    if save_all_html_dir:
+        save_html(save_all_html_dir, comp_id, html)
+    if save_all_screens_dir:
+        save_screenshot(driver, save_all_screens_dir, comp_id)
+    return html
+
+
+def finish_check(
+    comp_id: int,
+    html: str,
+    analysis: Tuple[bool, str, Dict[str, int], Optional[str]],
+    save_bad_html_dir: Optional[str],
+    very_verbose: bool
+) -> Tuple[int, bool, str, Dict[str, int]]:
+    is_active, reason, counts, league = analysis
+
+    # Capture league name if present
+    if league:
+        LEAGUES_BY_COMPID[str(comp_id)] = league
+    if not is_active and html:
+        save_html(save_bad_html_dir, comp_id, html)
+
+    return comp_id, is_active, (reason if not very_verbose else f"{reason} | counts={counts}"), counts
+
+
 def check_competition(
     driver: webdriver.Chrome,
     comp_id: int,
     wait_secs: int,
     extra_sleep: float,
+    quiet_ms: int,
     save_bad_html_dir: Optional[str],
     save_bad_screens_dir: Optional[str],
     save_all_html_dir: Optional[str],
     save_all_screens_dir: Optional[str],
     very_verbose: bool
 ) -> Tuple[int, bool, str, Dict[str, int]]:
-    url = BASE_URL.format(comp_id)
     try:
-        _load_with_retries(driver, url, wait_secs)
+        html = load_competition_page(driver, comp_id, wait_secs, extra_sleep, quiet_ms,
+                                     save_all_html_dir, save_all_screens_dir)
+        result = finish_check(comp_id, html, analyze_page(html), save_bad_html_dir, very_verbose)
+        if not result[1]:
+            save_screenshot(driver, save_bad_screens_dir, comp_id)
+        return result
+
+    except WebDriverException as e:
+        return comp_id, False, f"webdriver error: {e.__class__.__name__}", {}
 
-        if extra_sleep > 0:
-            time.sleep(extra_sleep)
 
-        html = driver.page_source
-        is_active, reason, counts = inspect_dom(html)
+def make_http_session(pool_size: int = 10) -> requests.Session:
+    """Plain-HTTP session for --engine http (no proxies from the runner env, browser UA)."""
+    session = requests.Session()
+    session.trust_env = False
+    session.headers.update({"User-Agent": USER_AGENT, "Accept": "text/html,application/xhtml+xml"})
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
 
-        # Capture league name if present
-        league = extract_league_name(html)
+
+def fetch_competition_page(session: requests.Session, comp_id: int, wait_secs: int,
+                           save_all_html_dir: Optional[str]) -> str:
+    """--engine http: GET the competition page as served (no JS), with the same 3 tries as the browser."""
+    last = None
+    for _ in range(3):
+        try:
+            r = session.get(BASE_URL.format(comp_id), timeout=wait_secs)
+            r.raise_for_status()
+            html = r.text
+            record_page(page_key(BASE_URL.format(comp_id)), html)
+            if save_all_html_dir:
+                save_html(save_all_html_dir, comp_id, html)
+            return html
+        except requests.RequestException as e:
+            last = e
+            time.sleep(0.8)
+    raise last
+
+
+def parse_shard(spec: Optional[str]) -> Optional[Tuple[int, int]]:
+    """ "i/n" (1-based) -> (i, n)."""
+    if not spec:
+        return None
+    i, n = (int(x) for x in spec.split("/", 1))
+    if n < 1 or not 1 <= i <= n:
+        raise ValueError(f"bad --shard {spec!r}: want i/n with 1 <= i <= n")
+    return i, n
+
+
+def shard_ids(ids: List[int], shard: Optional[Tuple[int, int]]) -> List[int]:
+    """Every n-th candidate, interleaved so each shard gets its share of the (dense) low IDs."""
+    if shard is None:
+        return ids
+    i, n = shard
+    return ids[i - 1::n]
+
+
+def merge_outputs(paths: List[str]) -> Dict:
+    """Union of several shard outputs into one active_comp_ids*.json payload."""
+    active: Set[int] = set()
+    leagues: Dict[str, str] = {}
+    counts: Dict[str, Dict[str, int]] = {}
+    skip: Set[int] = set()
+    ranges: List[str] = []
+    for path in paths:
+        with open(path, "r", encoding="utf-8") as f:
+            d = json.load(f)
+        active.update(int(x) for x in d.get("active_comp_ids", []))
+        leagues.update(d.get("leagues_by_compid") or {})
+        counts.update({str(k): v for k, v in (d.get("debug_counts") or {}).items()})
+        skip.update(int(x) for x in d.get("skip", []))
+        if d.get("range") and d["range"] not in ranges:
+            ranges.append(d["range"])
+    return {
+        "discoveredAt": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "range": ",".join(ranges),
+        "skip": sorted(skip),
+        "active_comp_ids": sorted(active),
+        "leagues_by_compid": leagues,
+        "debug_counts": counts,
+        "merged_from": len(paths),
+    }
+
+
+def load_state(path: str) -> Dict[str, Dict]:
+    """Per-ID memory from earlier runs: {"<id>": {status, last_checked, last_active, fails, league}}."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return (json.load(f) or {}).get("ids", {})
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        print(f"[state] couldn't read {path} ({e.__class__.__name__}); probing everything", file=sys.stderr)
+        return {}
+
+
+def save_state(path: str, ids: Dict[str, Dict]) -> None:
+    write_output(path, {"updatedAt": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()), "ids": ids})
+
+
+def is_due(entry: Optional[Dict], now: float, base_hours: float, max_days: float, recent_days: float) -> bool:
+    """
+    Unknown, errored, active and recently-active IDs are always re-checked.
+    An ID that has been inactive `fails` times in a row waits base_hours * 2**(fails-1), capped at max_days.
+    """
+    if not entry or entry.get("status") != "inactive":
+        return True
+    last_active = entry.get("last_active")
+    if last_active and now - last_active < recent_days * 86400:
+        return True
+    fails = max(1, int(entry.get("fails", 1)))
+    wait = min(base_hours * 3600 * 2 ** (fails - 1), max_days * 86400)
+    return now - entry.get("last_checked", 0) >= wait
+
+
+def update_state(ids: Dict[str, Dict], cid: int, status: str, league: Optional[str], now: float) -> None:
+    entry = ids.setdefault(str(cid), {"fails": 0, "last_active": None})
+    if status == "error":
+        # transient: keep the old verdict and backoff, just retry next run
+        entry.setdefault("status", "error")
+        entry["last_error"] = now
+        return
+    entry["status"] = status
+    entry["last_checked"] = now
+    if status == "active":
+        entry["last_active"] = now
+        entry["fails"] = 0
         if league:
-            LEAGUES_BY_COMPID[str(comp_id)] = league
-
-        # Save assets if requested
-        if save_all_html_dir:
-            save_html(save_all_html_dir, comp_id, html)
-        if save_all_screens_dir:
-            save_screenshot(driver, save_all_screens_dir, comp_id)
-        if not is_active:
-            save_html(save_bad_html_dir, comp_id, html)
-            save_screenshot(driver, save_bad_screens_dir, comp_id)
+            entry["league"] = league
+    else:
+        entry["fails"] = int(entry.get("fails", 0)) + 1
 
-        return comp_id, is_active, (reason if not very_verbose else f"{reason} | counts={counts}"), counts
 
-    except WebDriverException as e:
-        return comp_id, False, f"webdriver error: {e.__class__.__name__}", {}
+def write_output(path: str, payload: Dict) -> None:
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, ensure_ascii=False, indent=2)
+
+
+def _done(value) -> Future:
+    fut: Future = Future()
+    fut.set_result(value)
+    return fut
+
+
+def probe_verdict(analysis: Tuple[bool, str, Dict[str, int], Optional[str]]) -> Optional[bool]:
+    """
+    HTTP pre-probe: True when the raw page already shows odds markers, None otherwise.
+    Only a rendered page may call an ID inactive: the raw HTML of a live comp can lack
+    markers that JS fills in, and we have no recorded inactive page to key a notice on.
+    (So --engine auto only saves Chrome time on active IDs; it isn't the default.)
+    """
+    if analysis[0]:
+        return True
+    return None
+
+
+def discover_worker(args, todo: "queue.Queue[int]", record, pool: Optional[ProcessPoolExecutor],
+                    get_driver: Optional[Callable[[], webdriver.Chrome]] = None,
+                    session: Optional[requests.Session] = None) -> None:
+    """
+    Drain IDs from the shared queue.
+      - browser: render every page in this worker's Chrome
+      - http:    raw HTML only
+      - auto:    raw HTML first; only pages the HTTP probe can't confirm active go to Chrome
+                 (started on first use, so a sweep the probe settles never starts one)
+    With a parse pool, rendered pages are parsed in worker processes while this worker
+    loads the next ID; results are still recorded in this worker's own load order.
+    """
+    pending: "deque[Tuple[int, str, Future]]" = deque()
+
+    def drain(block: bool) -> None:
+        # finish results in load order, as soon as the head of the queue is parsed
+        while pending and (block or pending[0][2].done()):
+            cid, html, fut = pending.popleft()
+            try:
+                analysis = fut.result()
+            except Exception as e:
+                analysis = (False, f"parse error: {e.__class__.__name__}", {}, None)
+            record(finish_check(cid, html, analysis, args.save_bad_html, args.very_verbose))
+
+    while True:
+        try:
+            cid = todo.get_nowait()
+        except queue.Empty:
+            break
+
+        if session is not None:
+            try:
+                html = fetch_competition_page(session, cid, args.wait, args.save_all_html)
+                if get_driver is None:
+                    # --engine http: the raw page is the verdict
+                    fut = pool.submit(analyze_page, html) if pool is not None else _done(analyze_page(html))
+                    pending.append((cid, html, fut))
+                    drain(block=False)
+                    continue
+                analysis = analyze_page(html)
+            except requests.RequestException as e:
+                if get_driver is None:
+                    pending.append((cid, "", _done((False, f"http error: {e.__class__.__name__}", {}, None))))
+                    drain(block=False)
+                    continue
+                html, analysis = "", (False, "", {}, None)
+
+            verdict = probe_verdict(analysis)
+            with _PROBE_LOCK:
+                PROBE_STATS["http" if verdict is not None else "browser"] += 1
+            if verdict is not None:
+                ok, reason, counts, league = analysis
+                reason = f"http: {reason}"
+                pending.append((cid, html, _done((ok, reason, counts, league))))
+                drain(block=False)
+                continue
+
+        driver = get_driver()
+        if pool is None:
+            record(check_competition(
+                driver, cid, args.wait, args.sleep, args.quiet_ms,
+                args.save_bad_html, args.save_bad_screens,
+                args.save_all_html, args.save_all_screens,
+                args.very_verbose
+            ))
+            continue
+        try:
+            html = load_competition_page(driver, cid, args.wait, args.sleep, args.quiet_ms,
+                                         args.save_all_html, args.save_all_screens)
+            fut = pool.submit(analyze_page, html)
+        except WebDriverException as e:
+            html, fut = "", _done((False, f"webdriver error: {e.__class__.__name__}", {}, None))
+        pending.append((cid, html, fut))
+        drain(block=False)
+    drain(block=True)
 
 
-def main():
+def main(defaults: Optional[Dict] = None):
     ap = argparse.ArgumentParser(description="Discover active competition IDs via Selenium.")
     mx = ap.add_mutually_exclusive_group()
     mx.add_argument("--range", help='ID range/list, e.g. "1-150" or "1-20,40,41"')
     mx.add_argument("--single", type=int, help="Test a single comp ID")
+    mx.add_argument("--merge", nargs="+", metavar="JSON", help="Merge shard outputs into --out and exit")
 
     ap.add_argument("--skip", default="72,73,108,114", help="Comma-separated IDs to skip")
     ap.add_argument("--out", default="server/data/active_comp_ids.json", help="Where to write JSON list")
     ap.add_argument("--wait", type=int, default=12, help="Max seconds to wait for <table>")
-    ap.add_argument("--sleep", type=float, default=0.8, help="Extra sleep after wait (settle time)")
+    ap.add_argument("--sleep", type=float, default=0.0, help="Extra fixed sleep after the settle wait")
+    ap.add_argument("--quiet-ms", type=int, default=150, help="DOM must be mutation-free this long to count as settled")
     ap.add_argument("--headful", action="store_true", help="Show a real browser (non-headless)")
+    ap.add_argument("--parse-procs", type=int, default=max(1, (os.cpu_count() or 2) - 1),
+                    help="Processes that parse pages while Chrome loads the next ID (0 = parse inline)")
+    # browser stays the default: until the HTTP probe can call a page inactive (that needs a
+    # recorded inactive page to key on), auto still renders most of a sweep in Chrome
+    ap.add_argument("--engine", choices=["auto", "browser", "http"], default="browser",
+                    help="browser = every page rendered in Chrome; auto = plain-HTTP probe, Chrome for "
+                         "every page it can't confirm active; http = raw HTML only (no JS)")
+    ap.add_argument("--workers", type=int, default=1,
+                    help="Parallel Chrome instances (browser) or concurrent requests (http)")
+    ap.add_argument("--shard", default=None,
+                    help='Only check shard i of n ("2/8"); merge the outputs with --merge')
+    ap.add_argument("--state", default=None,
+                    help="State file: remember per-ID results and re-probe inactive IDs on a backoff")
+    ap.add_argument("--full", action="store_true", help="With --state: ignore the backoff and probe everything")
+    ap.add_argument("--backoff-hours", type=float, default=20.0,
+                    help="Wait after the first inactive result; doubles per further inactive result")
+    ap.add_argument("--backoff-max-days", type=float, default=14.0, help="Cap on the re-probe wait")
+    ap.add_argument("--recent-days", type=float, default=7.0,
+                    help="IDs active within this many days are re-checked every run")
 
     ap.add_argument("-v", "--verbose", action="store_true", help="Per-ID status lines")
     ap.add_argument("-vv", "--very-verbose", action="store_true", help="Verbose + include heuristic counts")
@@ -249,10 +570,21 @@ def main():
     ap.add_argument("--save-all-html", default=None, help="Dir to save HTML for all pages")
     ap.add_argument("--save-all-screens", default=None, help="Dir to save screenshots for all pages")
 
+    if defaults:
+        ap.set_defaults(**defaults)
     args = ap.parse_args()
     if args.very_verbose:
         args.verbose = True
 
+    if args.merge:
+        payload = merge_outputs(args.merge)
+        write_output(args.out, payload)
+        print(",".join(str(x) for x in payload["active_comp_ids"]))
+        if args.verbose:
+            print(f"Merged {len(args.merge)} shard files: {len(payload['active_comp_ids'])} active IDs",
+                  file=sys.stderr)
+        return
+
     # Build candidate IDs
     if args.single is not None:
         ids = [args.single]
@@ -261,51 +593,125 @@ def main():
         ids = parse_range(rng)
 
     skip: Set[int] = set(int(x.strip()) for x in args.skip.split(",") if x.strip())
-    candidates = [i for i in ids if i not in skip]
-
-    if not candidates:
+    shard = parse_shard(args.shard)
+    candidates = shard_ids([i for i in ids if i not in skip], shard)
+
+    state: Dict[str, Dict] = load_state(args.state) if args.state else {}
+    backed_off: List[int] = []
+    if args.state and not args.full:
+        now = time.time()
+        due = [c for c in candidates
+               if is_due(state.get(str(c)), now, args.backoff_hours, args.backoff_max_days, args.recent_days)]
+        backed_off = [c for c in candidates if c not in set(due)]
+        if args.verbose:
+            print(f"[state] {len(due)} due, {len(backed_off)} still backing off", file=sys.stderr)
+        candidates = due
+
+    if not candidates and not backed_off:
         print("", end="")  # print empty CSV
         return
 
     active: List[int] = []
     meta_per_id: Dict[int, Dict[str, int]] = {}
+    status_per_id: Dict[int, str] = {}
+    record_lock = threading.Lock()
 
-    start = time.time()
-    driver = make_driver(headful=args.headful)
-    try:
-        for cid in candidates:
-            cid, ok, reason, counts = check_competition(
-                driver, cid, args.wait, args.sleep,
-                args.save_bad_html, args.save_bad_screens,
-                args.save_all_html, args.save_all_screens,
-                args.very_verbose
-            )
+    def record(result: Tuple[int, bool, str, Dict[str, int]]) -> None:
+        cid, ok, reason, counts = result
+        with record_lock:
             meta_per_id[cid] = counts
+            errored = reason.startswith(("webdriver error", "http error", "parse error"))
+            status_per_id[cid] = "active" if ok else ("error" if errored else "inactive")
             if args.verbose:
                 print(f"[{cid:>3}] {'ACTIVE' if ok else '----- '}  {reason}", file=sys.stderr)
             if ok:
                 active.append(cid)
+
+    # Parse in worker processes while Chrome moves on to the next ID.
+    # Bad-page screenshots need the verdict while the page is still loaded, so they parse inline.
+    pool = None
+    if args.parse_procs > 0 and not (args.save_bad_screens and args.engine != "http"):
+        pool = ProcessPoolExecutor(max_workers=args.parse_procs,
+                                   mp_context=multiprocessing.get_context("spawn"))
+
+    todo: "queue.Queue[int]" = queue.Queue()
+    for cid in candidates:
+        todo.put(cid)
+    workers = max(1, min(args.workers, len(candidates) or 1))
+    session = make_http_session(pool_size=workers) if args.engine != "browser" else None
+
+    def run_worker(i: int) -> None:
+        drivers: List[webdriver.Chrome] = []
+
+        def get_driver() -> webdriver.Chrome:
+            if not drivers:
+                drivers.append(make_driver(headful=args.headful))
+            return drivers[0]
+
+        try:
+            discover_worker(args, todo, record, pool,
+                            get_driver=None if args.engine == "http" else get_driver,
+                            session=session)
+        finally:
+            for driver in drivers:
+                driver.quit()
+
+    start = time.time()
+    try:
+        if not candidates:
+            pass
+        elif workers == 1:
+            run_worker(0)
+        else:
+            with ThreadPoolExecutor(max_workers=workers) as ex:
+                for i, fut in enumerate([ex.submit(run_worker, i) for i in range(workers)]):
+                    try:
+                        fut.result()
+                    except Exception as e:
+                        # e.g. Chrome failed to start; the other workers drain the queue
+                        print(f"[workers] worker {i} failed: {e.__class__.__name__}: {e}", file=sys.stderr)
     finally:
-        driver.quit()
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+        if session is not None:
+            session.close()
+
+    if args.state:
+        now = time.time()
+        for cid, status in status_per_id.items():
+            update_state(state, cid, status, LEAGUES_BY_COMPID.get(str(cid)), now)
+        save_state(args.state, state)
 
     active.sort()
-    os.makedirs(os.path.dirname(args.out), exist_ok=True)
-    with open(args.out, "w", encoding="utf-8") as f:
-        json.dump({
-            "discoveredAt": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
-            "range": args.range or (f"{args.single}" if args.single is not None else "1-150"),
-            "skip": sorted(list(skip)),
-            "active_comp_ids": active,
-            "leagues_by_compid": LEAGUES_BY_COMPID,
-            "debug_counts": meta_per_id,
-        }, f, ensure_ascii=False, indent=2)
+    payload = {
+        "discoveredAt": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "range": args.range or (f"{args.single}" if args.single is not None else "1-150"),
+        "skip": sorted(list(skip)),
+        "active_comp_ids": active,
+        "leagues_by_compid": LEAGUES_BY_COMPID,
+        "debug_counts": meta_per_id,
+    }
+    if shard is not None:
+        payload["shard"] = args.shard
+    if args.state:
+        payload["state_backed_off"] = len(backed_off)
+    if args.engine == "auto":
+        payload["probe"] = dict(PROBE_STATS)
+    write_output(args.out, payload)
 
     # Print compact CSV for CI piping
     print(",".join(str(x) for x in active))
 
     dur = time.time() - start
     if args.verbose:
-        print(f"Discovered {len(active)} active IDs in {dur:.1f}s", file=sys.stderr)
+        print(f"Discovered {len(active)} active IDs in {dur:.1f}s "
+              f"({len(candidates)} checked, engine={args.engine}, workers={workers})", file=sys.stderr)
+        if args.engine == "auto":
+            print(f"[probe] settled over HTTP: {PROBE_STATS['http']}  "
+                  f"escalated to Chrome: {PROBE_STATS['browser']}", file=sys.stderr)
+        summary = wait_summary()
+        if summary:
+            print(summary, file=sys.stderr)
 
 
 if __name__ == "__main__":
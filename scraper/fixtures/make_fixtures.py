@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Write deterministic HTML fixtures modelled on the live odds.aussportsbetting.com markup:
+
+  multibet/  rendered MultiBet pages (nested game -> market -> #more-market-odds tables)
+  betting/   betting?function=... pages (td.subheading blocks in the normal,
+             wide "main market" and line-draw layouts)
+  discover/  betting?competitionid=N pages (active, and a bare stand-in for inactive)
+
+Real captures can sit next to these: CAPTURE_DIR payloads go in multibet/,
+discovery --save-all-html pages go in discover/.
+
+Usage: python scraper/fixtures/make_fixtures.py [--out scraper/fixtures]
+"""
+import argparse
+import gzip
+import os
+import random
+from typing import List
+
+AGENCIES = ["Sportsbet", "TAB (NSW)", "Neds", "Bet365", "Ladbrokes", "PointsBet", "Unibet",
+            "Betfair - Back", "PlayUp", "Palmerbet", "BetRight", "Dabble", "Betr", "BoomBet"]
+
+PAGE_HEAD = """<html><head><title>{title}</title></head><body>
+<table width="100%"><tr><td id="datapage-title-strip"><h1>{title} live odds</h1></td></tr></table>
+"""
+PAGE_TAIL = "</body></html>\n"
+
+
+def _odds(r: random.Random, lo: float = 1.45, hi: float = 2.6) -> str:
+    return f"{r.uniform(lo, hi):.2f}"
+
+
+def multibet_page(seed: int, games: int, markets_per_game: int, sport: str = "AFL",
+                  compid: int = 11, three_way_every: int = 0, extra_links: bool = False) -> str:
+    """
+    A rendered MultiBet page.
+    three_way_every=N makes every Nth market a real three-way cell (which the two-way
+    stage skips); every 7th market is a two-way cell with the dummy 'Draw - 1.00'.
+    extra_links adds non-outcome links to every cell (form guide, more markets); they
+    don't draw from the RNG, so the page prices match the same seed without them.
+    """
+    r = random.Random(seed)
+    out: List[str] = [PAGE_HEAD.format(title="MultiBet")]
+    out.append('<form id="mb"><input type="text" name="compid" value="%d">'
+               '<button id="update" type="button">Update</button>' % compid)
+    out.append('<select class="dd-select" name="sport">')
+    for s in ("Soccer", "AFL", "Baseball", "Basketball - US", "Rugby League"):
+        sel = " selected" if s == sport else ""
+        out.append(f'<option value="{s}"{sel}>{s}</option>')
+    out.append("</select></form>\n<table class=\"multibet\">")
+    market_names = ["Head to Head", "Line", "Total Points", "Win Margin", "First Goal", "Half Time"]
+    n = 0
+    for g in range(games):
+        home, away = f"Home{g}", f"Away{g}"
+        out.append(f'<tr class="game"><td>{g + 1}</td><td>{1 + g % 28:02d}/11/2025 19:{g % 60:02d}</td>'
+                   f'<td>{home} v {away}</td></tr>')
+        out.append('<tr><td colspan="3"><table class="markets">')
+        for m in range(markets_per_game):
+            n += 1
+            name = market_names[m % len(market_names)]
+            if m and m % 5 == 0:
+                name = "Win " + name
+            marketid = 1000 + g * 50 + m
+            args = f"'{compid}','{g}','{marketid}','{compid}','{g + 1}','0','odds'"
+            if name == "Line":
+                line = f"{r.choice(['+', '-'])}{r.randint(1, 30)}.5"
+                left, right = f"{home} {line}", f"{away} {line.replace('-', '#').replace('+', '-').replace('#', '+')}"
+            elif name == "Total Points":
+                total = f"{r.randint(140, 200)}.5"
+                left, right = f"Over {total}", f"Under {total}"
+            else:
+                left, right = home, away
+            cells = [f'<a href="#" onclick="addSelection({args});">{left} - {_odds(r)}</a>']
+            if three_way_every and n % three_way_every == 0:
+                cells.append(f'<a href="#" onclick="addSelection({args});">Draw - {_odds(r, 3.0, 4.5)}</a>')
+            elif n % 7 == 0:
+                cells.append('<a href="#">Draw - 1.00</a>')
+            cells.append(f'<a href="#" onclick="addSelection({args});">{right} - {_odds(r)}</a>')
+            if extra_links:
+                cells.append(f'<a href="/form/{compid}/{g + 1}">Form - 2024</a>')
+                cells.append(f'<a href="#" onclick="showMarkets({args});">+12 markets</a>')
+            out.append(f'<tr><td class="market"><a href="#">{name}</a></td></tr>')
+            out.append('<tr><td><table class="odds"><tr>'
+                       f'<td id="more-market-odds">{" ".join(cells)}</td>'
+                       '</tr></table></td></tr>')
+        out.append("</table></td></tr>")
+    out.append("</table>\n")
+    out.append(PAGE_TAIL)
+    return "\n".join(out)
+
+
+def _updated_cell(r: random.Random) -> str:
+    ms = 1761900000000 + r.randint(0, 86_400_000)
+    return f"<td><script>write_local_time({ms})</script></td>"
+
+
+def betting_page(seed: int, blocks: int, agencies: int, layout: str = "normal") -> str:
+    """
+    A betting?function=... page with `blocks` td.subheading sections.
+    layout: "normal" (agency, left, right, updated), "wide" (main-market header
+    with more than five cells) or "linedraw" (agency, left, draw, right, updated).
+    """
+    r = random.Random(seed)
+    out: List[str] = [PAGE_HEAD.format(title="Match Betting")]
+    out.append('<table class="betting">')
+    for b in range(blocks):
+        heading = f"Home{b} v Away{b}" if b % 2 == 0 else f"Under {150 + b}.5"
+        if layout == "wide":
+            out.append(f'<tr><td class="subheading">{heading}</td><td></td><td>Home{b}</td><td>Draw</td>'
+                       f'<td>Away{b}</td><td>Market %</td><td>Updated</td></tr>')
+        elif layout == "linedraw":
+            out.append(f'<tr><td class="subheading">{heading}</td><td>Home{b}</td><td>Draw</td>'
+                       f'<td>Away{b}</td><td>Updated</td></tr>')
+        else:
+            out.append(f'<tr><td class="subheading">{heading}</td><td></td><td>Home{b}</td>'
+                       f'<td>Away{b}</td><td>Updated</td></tr>')
+        for a in range(agencies):
+            name = AGENCIES[a % len(AGENCIES)] + ("" if a < len(AGENCIES) else f" {a}")
+            cells = [f'<td><a href="#">{name}</a></td>', f"<td>{_odds(r)}</td>"]
+            if layout in ("wide", "linedraw"):
+                cells.append(f"<td>{_odds(r, 3.0, 4.5)}</td>")
+            cells.append(f"<td>{_odds(r)}</td>")
+            cells.append(_updated_cell(r))
+            out.append("<tr>" + "".join(cells) + "</tr>")
+        out.append("<tr><td></td><td></td></tr>")
+    out.append("</table>\n")
+    out.append(PAGE_TAIL)
+    return "\n".join(out)
+
+
+def discover_page(seed: int, kind: str) -> str:
+    """betting?competitionid=N page: kind is "active", "market_header" or "inactive"."""
+    r = random.Random(seed)
+    title = {"active": "AFL", "market_header": "NBA Basketball", "inactive": "Polish Ekstraklasa"}[kind]
+    out: List[str] = [PAGE_HEAD.format(title=title)]
+    if kind == "active":
+        out.append(multibet_page(seed, games=4, markets_per_game=3).split("<body>", 1)[1].rsplit("</body>", 1)[0])
+    elif kind == "market_header":
+        out.append("<table><tbody>")
+        out.append("<tr><td>Date</td><td>Match</td><td>Home</td><td>Away</td><td>Market %</td></tr>")
+        for g in range(6):
+            out.append(f"<tr><td>0{g + 1}/11/2025</td><td>Team{g}A v Team{g}B</td>"
+                       f"<td>{_odds(r)}</td><td>{_odds(r)}</td><td>{r.uniform(100, 106):.1f}%</td></tr>")
+        out.append("</tbody></table>")
+    # inactive: the title strip and nothing else. The live site's wording for an empty
+    # competition isn't known; swap in a recorded page (RECORD_DIR=... discovery run) when we have one.
+    out.append(PAGE_TAIL)
+    return "\n".join(out)
+
+
+FIXTURES = {
+    "multibet/afl_small.html":        lambda: multibet_page(1, games=6, markets_per_game=4),
+    "multibet/afl_extra_links.html":  lambda: multibet_page(1, games=6, markets_per_game=4, extra_links=True),
+    "multibet/soccer_three_way.html": lambda: multibet_page(2, games=10, markets_per_game=3,
+                                                            sport="Soccer", compid=5, three_way_every=2),
+    "betting/normal.html":            lambda: betting_page(3, blocks=4, agencies=8),
+    "betting/wide_main_market.html":  lambda: betting_page(4, blocks=2, agencies=10, layout="wide"),
+    "betting/line_draw.html":         lambda: betting_page(5, blocks=3, agencies=8, layout="linedraw"),
+    "discover/active.html":           lambda: discover_page(6, "active"),
+    "discover/market_header.html":    lambda: discover_page(7, "market_header"),
+    "discover/inactive.html":         lambda: discover_page(8, "inactive"),
+    # worst-case sizes for bench.py (gzipped to keep the repo small)
+    "multibet/large_comp.html.gz":    lambda: multibet_page(10, games=120, markets_per_game=12,
+                                                            sport="Soccer", compid=5, three_way_every=4),
+    "betting/normal_large.html.gz":   lambda: betting_page(11, blocks=60, agencies=28),
+    "betting/wide_large.html.gz":     lambda: betting_page(12, blocks=40, agencies=28, layout="wide"),
+    "betting/line_draw_large.html.gz": lambda: betting_page(13, blocks=40, agencies=28, layout="linedraw"),
+}
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Write the synthetic HTML fixtures.")
+    ap.add_argument("--out", default=os.path.dirname(os.path.abspath(__file__)))
+    args = ap.parse_args()
+    for rel, build in FIXTURES.items():
+        path = os.path.join(args.out, rel)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        data = build()
+        if path.endswith(".gz"):
+            # mtime=0 keeps the bytes identical between runs
+            with gzip.GzipFile(path, "wb", compresslevel=9, mtime=0) as f:
+                f.write(data.encode("utf-8"))
+        else:
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(data)
+        print(f"wrote {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+"""
+Run metrics for the scraper: timed stage spans, counters and gauges, exported once per run.
+
+  with span("goto_multibet"): ...        time a stage
+  with span("comp", key=compid): ...     per-compid / per-URL timings keep their key
+  observe("wait.odds-settle", secs)      a duration measured elsewhere
+  incr("retries.goto_multibet")          counters
+  gauge("rows.verified", n)              gauges
+
+write_report() puts a JSON run report and a Prometheus textfile (for node_exporter's
+textfile collector) next to opportunities.json; summary_table() is the end-of-run table.
+Everything is process-local and thread-safe; reset() starts a new run (daemon cycles).
+"""
+import os
+import re
+import json
+import time
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# The scrape job's hard limit (scrape.yml timeout-minutes); the report flags runs creeping toward it
+RUN_TIMEOUT_SECS = float(os.getenv("RUN_TIMEOUT_SECS", "1800"))
+RUN_WARN_FRACTION = float(os.getenv("RUN_WARN_FRACTION", "0.8"))
+
+# Per-key timings kept in the JSON report for each stage (slowest first)
+REPORT_TOP_KEYS = int(os.getenv("METRICS_TOP_KEYS", "50"))
+
+_LOCK = threading.Lock()
+_SPANS: List[Tuple[str, Optional[str], float]] = []  # (stage, key, seconds)
+_COUNTERS: Dict[str, float] = {}
+_GAUGES: Dict[str, float] = {}
+_STARTED = time.time()
+
+
+def reset() -> None:
+    global _STARTED
+    with _LOCK:
+        _SPANS.clear()
+        _COUNTERS.clear()
+        _GAUGES.clear()
+        _STARTED = time.time()
+
+
+def observe(stage: str, secs: float, key: Any = None) -> None:
+    with _LOCK:
+        _SPANS.append((stage, None if key is None else str(key), secs))
+
+
+@contextmanager
+def span(stage: str, key: Any = None) -> Iterator[None]:
+    """Time the block as `stage` (recorded even when it raises; failures are counted too)."""
+    t0 = time.perf_counter()
+    try:
+        yield
+    except BaseException:
+        incr(f"errors.{stage}")
+        raise
+    finally:
+        observe(stage, time.perf_counter() - t0, key)
+
+
+def incr(name: str, n: float = 1) -> None:
+    with _LOCK:
+        _COUNTERS[name] = _COUNTERS.get(name, 0) + n
+
+
+def gauge(name: str, value: float) -> None:
+    with _LOCK:
+        _GAUGES[name] = value
+
+
+def _pct(xs: List[float], q: float) -> float:
+    return xs[min(len(xs) - 1, int(q * len(xs)))]
+
+
+def snapshot() -> Dict[str, Any]:
+    """The run so far: per-stage totals, slowest keys per stage, counters and gauges."""
+    with _LOCK:
+        spans = list(_SPANS)
+        counters = dict(_COUNTERS)
+        gauges = dict(_GAUGES)
+        started = _STARTED
+    by_stage: Dict[str, List[float]] = {}
+    by_key: Dict[str, Dict[str, float]] = {}
+    for stage, key, secs in spans:
+        by_stage.setdefault(stage, []).append(secs)
+        if key is not None:
+            keys = by_key.setdefault(stage, {})
+            keys[key] = keys.get(key, 0.0) + secs
+
+    stages = {}
+    for stage, xs in sorted(by_stage.items()):
+        xs = sorted(xs)
+        stages[stage] = {"count": len(xs), "total": round(sum(xs), 4), "mean": round(sum(xs) / len(xs), 4),
+                         "p50": round(_pct(xs, 0.5), 4), "p95": round(_pct(xs, 0.95), 4),
+                         "max": round(xs[-1], 4)}
+    keys = {stage: [{"key": k, "secs": round(v, 4)}
+                    for k, v in sorted(ks.items(), key=lambda kv: kv[1], reverse=True)[:REPORT_TOP_KEYS]]
+            for stage, ks in sorted(by_key.items())}
+
+    duration = time.time() - started
+    return {
+        "started": started,
+        "duration": round(duration, 3),
+        "timeout": RUN_TIMEOUT_SECS,
+        "timeout_fraction": round(duration / RUN_TIMEOUT_SECS, 4) if RUN_TIMEOUT_SECS > 0 else 0.0,
+        "stages": stages,
+        "slowest": keys,
+        "counters": dict(sorted(counters.items())),
+        "gauges": dict(sorted(gauges.items())),
+    }
+
+
+_NAME_RE = re.compile(r"[^a-zA-Z0-9_]+")
+
+
+def _metric(name: str) -> str:
+    return "scraper_" + _NAME_RE.sub("_", name).strip("_").lower()
+
+
+def _label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def prometheus_text(report: Dict[str, Any]) -> str:
+    """Prometheus exposition text for one run (stages as labels, counters/gauges as their own metrics)."""
+    lines = [
+        "# HELP scraper_run_duration_seconds Wall time of the last run.",
+        "# TYPE scraper_run_duration_seconds gauge",
+        f"scraper_run_duration_seconds {report['duration']}",
+        "# HELP scraper_run_timeout_seconds Job timeout the run has to finish within.",
+        "# TYPE scraper_run_timeout_seconds gauge",
+        f"scraper_run_timeout_seconds {report['timeout']}",
+        "# HELP scraper_last_run_timestamp_seconds When the last run finished.",
+        "# TYPE scraper_last_run_timestamp_seconds gauge",
+        f"scraper_last_run_timestamp_seconds {round(report['started'] + report['duration'], 3)}",
+    ]
+    for metric, field, help_text in (("stage_seconds", "total", "Total seconds spent in each stage."),
+                                     ("stage_count", "count", "Spans recorded for each stage."),
+                                     ("stage_max_seconds", "max", "Slowest single span of each stage.")):
+        lines.append(f"# HELP scraper_{metric} {help_text}")
+        lines.append(f"# TYPE scraper_{metric} gauge")
+        for stage, s in report["stages"].items():
+            lines.append(f'scraper_{metric}{{stage="{_label(stage)}"}} {s[field]}')
+    for values in (report["counters"], report["gauges"]):
+        for name, value in values.items():
+            lines.append(f"# TYPE {_metric(name)} gauge")  # the file is rewritten per run, so per-run values
+            lines.append(f"{_metric(name)} {value}")
+    return "\n".join(lines) + "\n"
+
+
+def _write_atomic(path: str, text: str) -> None:
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp, path)  # the textfile collector must never see a half-written file
+
+
+def write_report(out_dir: str, report: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Write run_report.json and scraper.prom into out_dir; returns the report."""
+    report = snapshot() if report is None else report
+    os.makedirs(out_dir, exist_ok=True)
+    _write_atomic(os.path.join(out_dir, "run_report.json"), json.dumps(report, indent=2))
+    _write_atomic(os.path.join(out_dir, "scraper.prom"), prometheus_text(report))
+    return report
+
+
+def summary_table(report: Dict[str, Any]) -> str:
+    lines = [f"[metrics] {'stage':<24} {'n':>5} {'total s':>9} {'mean s':>8} {'p95 s':>8} {'max s':>8}"]
+    for stage, s in sorted(report["stages"].items(), key=lambda kv: kv[1]["total"], reverse=True):
+        lines.append(f"[metrics] {stage:<24} {s['count']:>5} {s['total']:>9.2f} {s['mean']:>8.3f} "
+                     f"{s['p95']:>8.3f} {s['max']:>8.3f}")
+    if report["counters"]:
+        lines.append("[metrics] " + " ".join(f"{k}={v:g}" for k, v in report["counters"].items()))
+    if report["gauges"]:
+        lines.append("[metrics] " + " ".join(f"{k}={v:g}" for k, v in report["gauges"].items()))
+    lines.append(f"[metrics] run took {report['duration']:.1f}s "
+                 f"({report['timeout_fraction']:.0%} of the {report['timeout']:.0f}s job timeout)")
+    if RUN_TIMEOUT_SECS > 0 and report["timeout_fraction"] >= RUN_WARN_FRACTION:
+        lines.append(f"[metrics] WARNING: run is past {RUN_WARN_FRACTION:.0%} of the job timeout")
+    return "\n".join(lines)
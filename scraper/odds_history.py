@@ -0,0 +1,375 @@
+#!/usr/bin/env python3
+"""
+Append-only odds history: every verified (event, event_date, market, agency, side, odds,
+updatedMs) observation, kept in compact columnar segments. `side` is the outcome name, so
+three-way markets keep their draw; `event_date` (the game's dateISO) tells a fixture
+apart from the same pairing on a later date.
+
+Layout:
+  <root>/<YYYY-MM-DD>/seg-<first observed ms>-<pid>.ohs     one segment per append (UTC date partitions)
+  <root>/<YYYY-MM-DD>/seg-<first observed ms>-compact.ohs   a compacted day
+The first append into a new UTC day compacts the days before it into one segment each.
+A compacted segment's header lists the segments it replaces; readers skip those, so a
+crash between writing it and deleting its inputs can't double-count rows, and the next
+compaction deletes the leftovers.
+
+Segment = MAGIC, 4-byte header length, JSON header, then one zlib blob per column:
+  - strings (event, event_date, market, agency, side) are dictionary-encoded: the
+    header holds each dictionary, the column holds uint32 codes (segments written
+    before event_date existed read it back as "")
+  - observed_ms / updated_ms are delta-encoded int64 (mostly zeros, compress to nothing)
+  - odds are int32 thousandths (0 = missing), competitionid int32
+The header also carries the min/max observed_ms so range scans skip whole segments.
+
+Usage:
+  python scraper/odds_history.py stats   [--root DIR]
+  python scraper/odds_history.py scan    [--root DIR] --start 2026-10-01 [--end ...] [--agency Sportsbet] ...
+  python scraper/odds_history.py compact [--root DIR] [--date YYYY-MM-DD]
+"""
+import os
+import sys
+import json
+import zlib
+import struct
+import argparse
+import datetime as dt
+from array import array
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from arb_engine import outcome_names, row_odds, to_odds
+
+MAGIC = b"OHS1"
+STRING_COLS = ("event", "event_date", "market", "agency", "side")
+ODDS_SCALE = 1000
+
+Observation = Dict[str, Any]
+TimeArg = Union[None, int, float, str, dt.date, dt.datetime]
+
+
+def _to_ms(t: TimeArg) -> Optional[int]:
+    """Epoch ms from ms, a date/datetime (naive = UTC) or an ISO string."""
+    if t is None:
+        return None
+    if isinstance(t, (int, float)):
+        return int(t)
+    if isinstance(t, str):
+        t = dt.datetime.fromisoformat(t.replace("Z", "+00:00"))
+    if not isinstance(t, dt.datetime):
+        t = dt.datetime(t.year, t.month, t.day)
+    if t.tzinfo is None:
+        t = t.replace(tzinfo=dt.timezone.utc)
+    return int(t.timestamp() * 1000)
+
+
+def _day(ms: int) -> str:
+    return dt.datetime.fromtimestamp(ms / 1000, tz=dt.timezone.utc).strftime("%Y-%m-%d")
+
+
+def observations_from_items(items: Iterable[Dict[str, Any]], observed_ms: int) -> List[Observation]:
+    """
+    One observation per (agency, outcome) price in each item's book_table, draw included.
+    Items that share a betting table (same game, date and market) only contribute it once.
+    """
+    out: List[Observation] = []
+    seen = set()
+    for it in items:
+        table = it.get("book_table") or {}
+        if not table.get("rows"):
+            continue
+        sides = outcome_names(table)
+        event, market = it.get("game") or "", it.get("market") or ""
+        event_date = it.get("dateISO") or it.get("date") or ""
+        for row in table["rows"]:
+            for side, price in zip(sides, row_odds(row, len(sides))):
+                odds = to_odds(price)
+                if not odds:
+                    continue
+                key = (event, event_date, market, row.get("agency"), side)
+                if key in seen:
+                    continue
+                seen.add(key)
+                out.append({
+                    "observed_ms": observed_ms,
+                    "updated_ms": row.get("updatedMs"),
+                    "competitionid": it.get("competitionid"),
+                    "event": event,
+                    "event_date": event_date,
+                    "market": market,
+                    "agency": row.get("agency") or "",
+                    "side": side or "",
+                    "odds": odds,
+                })
+    return out
+
+
+# --- encoding ---
+def _delta(values: List[int]) -> array:
+    out, prev = array("q"), 0
+    for v in values:
+        out.append(v - prev)
+        prev = v
+    return out
+
+
+def _undelta(deltas: array) -> List[int]:
+    out, acc = [], 0
+    for d in deltas:
+        acc += d
+        out.append(acc)
+    return out
+
+
+def encode_segment(obs: List[Observation], replaces: Iterable[str] = ()) -> bytes:
+    header: Dict[str, Any] = {"rows": len(obs), "dicts": {}, "cols": []}
+    if replaces:
+        header["replaces"] = sorted(replaces)
+    blobs: List[bytes] = []
+
+    def add(name: str, arr: array) -> None:
+        blob = zlib.compress(arr.tobytes(), 6)
+        header["cols"].append([name, arr.typecode, len(blob)])
+        blobs.append(blob)
+
+    for col in STRING_COLS:
+        codes: Dict[str, int] = {}
+        arr = array("I", (codes.setdefault(o.get(col) or "", len(codes)) for o in obs))
+        header["dicts"][col] = list(codes)
+        add(col, arr)
+
+    observed = [int(o["observed_ms"]) for o in obs]
+    add("observed_ms", _delta(observed))
+    add("updated_ms", _delta([int(o.get("updated_ms") or 0) for o in obs]))
+    add("competitionid", array("i", (int(o.get("competitionid") or 0) for o in obs)))
+    add("odds", array("i", (int(round((o.get("odds") or 0.0) * ODDS_SCALE)) for o in obs)))
+
+    header["min_ms"] = min(observed) if observed else 0
+    header["max_ms"] = max(observed) if observed else 0
+    head = json.dumps(header, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return MAGIC + struct.pack("<I", len(head)) + head + b"".join(blobs)
+
+
+def _read_header(f) -> Tuple[Dict[str, Any], int]:
+    if f.read(4) != MAGIC:
+        raise ValueError("not an odds-history segment")
+    (n,) = struct.unpack("<I", f.read(4))
+    return json.loads(f.read(n).decode("utf-8")), 8 + n
+
+
+class Segment:
+    """A decoded segment: string dictionaries plus one array per column."""
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            self.header, _ = _read_header(f)
+            self.cols: Dict[str, Any] = {}
+            for name, typecode, size in self.header["cols"]:
+                arr = array(typecode)
+                arr.frombytes(zlib.decompress(f.read(size)))
+                self.cols[name] = _undelta(arr) if typecode == "q" else arr
+        self.dicts: Dict[str, List[str]] = self.header["dicts"]
+        self.rows: int = self.header["rows"]
+        for col in STRING_COLS:
+            if col not in self.cols:  # an older segment: the column is all ""
+                self.cols[col] = array("I", bytes(4 * self.rows))
+                self.dicts[col] = [""]
+
+    def row(self, i: int) -> Observation:
+        c = self.cols
+        odds = c["odds"][i]
+        return {
+            "observed_ms": c["observed_ms"][i],
+            "updated_ms": c["updated_ms"][i] or None,
+            "competitionid": c["competitionid"][i],
+            "event": self.dicts["event"][c["event"][i]],
+            "event_date": self.dicts["event_date"][c["event_date"][i]],
+            "market": self.dicts["market"][c["market"][i]],
+            "agency": self.dicts["agency"][c["agency"][i]],
+            "side": self.dicts["side"][c["side"][i]],
+            "odds": odds / ODDS_SCALE if odds else None,
+        }
+
+
+# --- store ---
+class OddsHistory:
+    def __init__(self, root: str):
+        self.root = root
+
+    def append(self, obs: List[Observation]) -> int:
+        """
+        Write observations as new segment(s), one per UTC day. Returns bytes written.
+        Opening a new day's partition compacts the earlier days first.
+        """
+        by_day: Dict[str, List[Observation]] = {}
+        for o in obs:
+            by_day.setdefault(_day(int(o["observed_ms"])), []).append(o)
+        known = set(self.days())
+        new_days = [d for d in by_day if d not in known]
+        if new_days:
+            self._compact_before(min(new_days))
+        written = 0
+        for day, rows in by_day.items():
+            written += self._write(day, rows, f"seg-{rows[0]['observed_ms']}-{os.getpid()}.ohs")
+        return written
+
+    def _compact_before(self, day: str) -> None:
+        """Compact every day before `day` that still has more than one segment (normally just yesterday)."""
+        for earlier in self.days():
+            if earlier >= day or len(self.segments(earlier)) < 2:
+                continue
+            try:
+                n, rows = self.compact(earlier)
+                print(f"[history] compacted {earlier}: {n} segments, {rows} rows")
+            except (OSError, ValueError) as e:
+                print(f"[history] compacting {earlier} failed: {type(e).__name__}: {e}")
+
+    def _write(self, day: str, rows: List[Observation], name: str, replaces: Iterable[str] = ()) -> int:
+        part = os.path.join(self.root, day)
+        os.makedirs(part, exist_ok=True)
+        data = encode_segment(rows, replaces)
+        path = os.path.join(part, name)
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+        return len(data)
+
+    def days(self) -> List[str]:
+        try:
+            return sorted(d for d in os.listdir(self.root) if len(d) == 10 and d[4] == "-")
+        except FileNotFoundError:
+            return []
+
+    def segments(self, day: str) -> List[str]:
+        """The day's live segments: any a compacted segment says it replaced are left out."""
+        live, _ = self._partition(day)
+        return live
+
+    def _partition(self, day: str) -> Tuple[List[str], List[str]]:
+        """(live, replaced) segment paths of a day."""
+        part = os.path.join(self.root, day)
+        try:
+            names = sorted(n for n in os.listdir(part) if n.endswith(".ohs"))
+        except FileNotFoundError:
+            return [], []
+        replaced = set()
+        for name in names:
+            if not name.endswith("-compact.ohs"):
+                continue
+            with open(os.path.join(part, name), "rb") as f:
+                header, _ = _read_header(f)
+            replaced.update(n for n in header.get("replaces", ()) if n != name)
+        live = [os.path.join(part, n) for n in names if n not in replaced]
+        stale = [os.path.join(part, n) for n in names if n in replaced]
+        return live, stale
+
+    def scan(self, start: TimeArg = None, end: TimeArg = None, **filters: Any) -> Iterator[Observation]:
+        """
+        Observations with start <= observed_ms < end, oldest segment first.
+        filters: exact matches on event/event_date/market/agency/side/competitionid, e.g.
+        scan("2026-10-01", "2026-11-01", agency="Sportsbet", market="Head to Head").
+        String filters are resolved against each segment's dictionary, so segments
+        that never saw the value are skipped without decoding rows.
+        """
+        start_ms, end_ms = _to_ms(start), _to_ms(end)
+        first = _day(start_ms) if start_ms is not None else ""
+        last = _day(end_ms) if end_ms is not None else "9999-99-99"
+        for day in self.days():
+            if day < first or day > last:
+                continue
+            for path in self.segments(day):
+                yield from self._scan_segment(path, start_ms, end_ms, filters)
+
+    def _scan_segment(self, path: str, start_ms: Optional[int], end_ms: Optional[int],
+                      filters: Dict[str, Any]) -> Iterator[Observation]:
+        with open(path, "rb") as f:
+            header, _ = _read_header(f)
+        if (start_ms is not None and header["max_ms"] < start_ms) or \
+           (end_ms is not None and header["min_ms"] >= end_ms):
+            return
+        for col, value in filters.items():
+            if col in STRING_COLS and value not in header["dicts"].get(col, [""]):
+                return
+
+        seg = Segment(path)
+        wanted: List[Tuple[Any, int]] = []
+        for col, value in filters.items():
+            if col in STRING_COLS:
+                wanted.append((seg.cols[col], seg.dicts[col].index(value)))
+            elif col == "competitionid":
+                wanted.append((seg.cols[col], int(value)))
+            else:
+                raise ValueError(f"unknown filter column: {col}")
+
+        observed = seg.cols["observed_ms"]
+        for i in range(seg.rows):
+            ms = observed[i]
+            if (start_ms is not None and ms < start_ms) or (end_ms is not None and ms >= end_ms):
+                continue
+            if all(arr[i] == code for arr, code in wanted):
+                yield seg.row(i)
+
+    def compact(self, day: str) -> Tuple[int, int]:
+        """
+        Merge a day's segments into one (safe to re-run, and to crash part-way).
+        The merged segment names its inputs and is in place before any input is
+        removed; inputs left behind by an earlier crash are removed here.
+        Returns (segments merged, rows).
+        """
+        paths, stale = self._partition(day)
+        for path in stale:
+            os.remove(path)
+        if len(paths) < 2:
+            return len(paths), 0
+        rows: List[Observation] = []
+        for path in paths:
+            seg = Segment(path)
+            rows.extend(seg.row(i) for i in range(seg.rows))
+        rows.sort(key=lambda o: o["observed_ms"])
+        name = f"seg-{rows[0]['observed_ms']}-compact.ohs"
+        self._write(day, rows, name, replaces=[os.path.basename(p) for p in paths])
+        merged = os.path.join(self.root, day, name)
+        for path in paths:
+            if path != merged:
+                os.remove(path)
+        return len(paths), len(rows)
+
+
+def main() -> None:
+    default_root = os.getenv("ODDS_HISTORY_DIR") or os.path.join(
+        os.path.dirname(__file__), "..", "server", "data", "odds_history")
+    ap = argparse.ArgumentParser(description="Inspect and maintain the odds history store.")
+    ap.add_argument("command", choices=["stats", "scan", "compact"])
+    ap.add_argument("--root", default=default_root)
+    ap.add_argument("--start", default=None, help="ISO date/time (UTC), inclusive")
+    ap.add_argument("--end", default=None, help="ISO date/time (UTC), exclusive")
+    ap.add_argument("--date", default=None, help="compact: only this YYYY-MM-DD partition")
+    for col in STRING_COLS:
+        ap.add_argument(f"--{col}", default=None)
+    ap.add_argument("--competitionid", type=int, default=None)
+    args = ap.parse_args()
+
+    store = OddsHistory(args.root)
+    if args.command == "stats":
+        for day in store.days():
+            paths = store.segments(day)
+            rows = 0
+            for p in paths:
+                with open(p, "rb") as f:
+                    rows += _read_header(f)[0]["rows"]
+            size = sum(os.path.getsize(p) for p in paths)
+            print(f"{day}: {len(paths)} segments, {rows} rows, {size / 1024:.1f} KiB "
+                  f"({size / max(rows, 1):.1f} B/row)")
+    elif args.command == "scan":
+        filters = {c: getattr(args, c) for c in (*STRING_COLS, "competitionid") if getattr(args, c) is not None}
+        cols = ["observed_ms", "updated_ms", "competitionid", "event", "event_date", "market", "agency", "side", "odds"]
+        print(",".join(cols))
+        for o in store.scan(args.start, args.end, **filters):
+            print(",".join(json.dumps(o[c]) if isinstance(o[c], str) else str(o[c]) for c in cols))
+    else:
+        for day in ([args.date] if args.date else store.days()):
+            n, rows = store.compact(day)
+            print(f"{day}: merged {n} segments" + (f" ({rows} rows)" if rows else ""))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
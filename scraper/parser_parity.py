@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Check that every HTML parser backend gives the same extraction results.
+
+Runs the real extraction functions over the fixture pages with each backend:
+  multibet/*  -> scraper.parse_multibet_html
+  betting/*   -> scraper.parse_betting_page
+  discover/*  -> discover_active_compids.analyze_page, inspect_dom and extract_league_name
+Files may be .html or .html.gz. Exits 1 if any backend disagrees with html.parser.
+
+Usage: python scraper/parser_parity.py [--fixtures scraper/fixtures] [--backends html.parser,lxml]
+"""
+import argparse
+import glob
+import gzip
+import json
+import os
+import sys
+from typing import Any, Callable, Dict, List
+
+import parsers
+import scraper
+import discover_active_compids as discover
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+EXTRACTORS: Dict[str, Callable[[str], Any]] = {
+    "multibet": lambda html: scraper.parse_multibet_html(html, 0),
+    "betting":  lambda html: scraper.parse_betting_page(html),
+    "discover": lambda html: [discover.analyze_page(html),
+                              discover.inspect_dom(html), discover.extract_league_name(html)],
+}
+
+
+def read_page(path: str) -> str:
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        return f.read()
+
+
+def fixture_files(root: str, kind: str) -> List[str]:
+    base = os.path.join(root, kind)
+    return sorted(glob.glob(os.path.join(base, "*.html")) + glob.glob(os.path.join(base, "*.html.gz")))
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Compare extraction results across HTML parser backends.")
+    ap.add_argument("--fixtures", default=os.path.join(HERE, "fixtures"))
+    ap.add_argument("--backends", default="html.parser,lxml")
+    args = ap.parse_args()
+
+    backends = [b.strip() for b in args.backends.split(",") if b.strip()]
+    reference, others = backends[0], backends[1:]
+    failures = 0
+    checked = 0
+    for kind, extract in EXTRACTORS.items():
+        for path in fixture_files(args.fixtures, kind):
+            html = read_page(path)
+            results = {}
+            for backend in backends:
+                parsers.PARSER_BACKEND = parsers.resolve_backend(backend)
+                # round-trip through JSON so tuples/lists compare the same way
+                results[backend] = json.loads(json.dumps(extract(html), sort_keys=True))
+            checked += 1
+            bad = [b for b in others if results[b] != results[reference]]
+            rel = os.path.relpath(path, args.fixtures)
+            if bad:
+                failures += 1
+                print(f"DIFF {rel}: {', '.join(bad)} != {reference}")
+            else:
+                print(f"ok   {rel}")
+
+    print(f"{checked} pages, {failures} mismatched")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
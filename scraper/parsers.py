@@ -0,0 +1,38 @@
+"""
+One place to choose the BeautifulSoup tree builder for every scraper.
+
+HTML_PARSER=auto (default) uses lxml when it's installed and falls back to the
+stdlib "html.parser". Set HTML_PARSER=html.parser or HTML_PARSER=lxml to pin one.
+The extraction code only uses the bs4 API, so the backend is a drop-in swap;
+run parser_parity.py against recorded pages after changing it.
+"""
+import os
+from typing import Optional
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+
+def _lxml_available() -> bool:
+    try:
+        import lxml  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def resolve_backend(name: Optional[str] = None) -> str:
+    name = (name or os.getenv("HTML_PARSER", "auto")).strip().lower()
+    if name == "auto":
+        return "lxml" if _lxml_available() else "html.parser"
+    if name == "lxml" and not _lxml_available():
+        print("[parser] HTML_PARSER=lxml but lxml isn't installed; using html.parser")
+        return "html.parser"
+    return name
+
+
+PARSER_BACKEND = resolve_backend()
+
+
+def make_soup(html: str, backend: Optional[str] = None,
+              parse_only: Optional[SoupStrainer] = None) -> BeautifulSoup:
+    return BeautifulSoup(html, backend or PARSER_BACKEND, parse_only=parse_only)
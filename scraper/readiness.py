@@ -0,0 +1,112 @@
+"""
+Event-driven readiness waits shared by the scraper and the discovery scripts.
+
+Instead of fixed time.sleep() settles we:
+  - wait for the DOM to go quiet (MutationObserver, no mutations for quiet_ms)
+  - or, if async scripts fail, wait for a CSS row count to stop changing
+Every wait records how long it actually took, so runs can report where the time went.
+"""
+import time
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+
+# Fast polling for WebDriverWait (Selenium's default is 0.5s, which is mostly dead time)
+POLL_SECS = 0.05
+
+# (label, seconds) for every wait in this process
+WAIT_LOG: List[Tuple[str, float]] = []
+_WAIT_LOCK = threading.Lock()
+
+# Resolves with the elapsed ms once the document has had no mutations for quietMs,
+# or when maxMs runs out (whichever comes first).
+_QUIESCENCE_JS = """
+const quietMs = arguments[0], maxMs = arguments[1], done = arguments[arguments.length - 1];
+const root = document.body || document.documentElement;
+if (!root) { done(-1); return; }
+const t0 = performance.now();
+let quiet = null, hard = null;
+const obs = new MutationObserver(() => { clearTimeout(quiet); quiet = setTimeout(finish, quietMs); });
+function finish() { obs.disconnect(); clearTimeout(quiet); clearTimeout(hard); done(performance.now() - t0); }
+obs.observe(root, {childList: true, subtree: true, characterData: true, attributes: true});
+quiet = setTimeout(finish, quietMs);
+hard = setTimeout(finish, maxMs);
+"""
+
+
+def record_wait(label: str, secs: float) -> None:
+    with _WAIT_LOCK:
+        WAIT_LOG.append((label, secs))
+
+
+def reset_waits() -> None:
+    """Forget recorded waits (the daemon reports per cycle)."""
+    with _WAIT_LOCK:
+        WAIT_LOG.clear()
+
+
+def wait_summary() -> str:
+    """One line per label: count, total, mean and max seconds actually waited."""
+    with _WAIT_LOCK:
+        entries = list(WAIT_LOG)
+    by_label: Dict[str, List[float]] = {}
+    for label, secs in entries:
+        by_label.setdefault(label, []).append(secs)
+    lines = []
+    for label, xs in sorted(by_label.items()):
+        lines.append(f"[wait] {label:<20} n={len(xs):<4} total={sum(xs):6.2f}s "
+                     f"avg={sum(xs) / len(xs):.3f}s max={max(xs):.3f}s")
+    return "\n".join(lines)
+
+
+def wait_for_stable_count(driver, css: str, quiet_secs: float = 0.15, max_secs: float = 5.0) -> float:
+    """Poll len(find_elements(css)) until it's non-zero and unchanged for quiet_secs."""
+    t0 = time.time()
+    last, stable_since = -1, t0
+    while True:
+        n = len(driver.find_elements(By.CSS_SELECTOR, css))
+        now = time.time()
+        if n != last:
+            last, stable_since = n, now
+        elif n > 0 and now - stable_since >= quiet_secs:
+            break
+        if now - t0 >= max_secs:
+            break
+        time.sleep(POLL_SECS)
+    return time.time() - t0
+
+
+def wait_for_quiescence(driver, label: str, quiet_ms: int = 150, max_secs: float = 5.0,
+                        css: Optional[str] = None) -> float:
+    """
+    Return as soon as the current document stops mutating.
+    Falls back to a stable row count on `css` when the observer script can't run.
+    Returns (and records) the seconds actually waited.
+    """
+    t0 = time.time()
+    try:
+        driver.set_script_timeout(max_secs + 2)
+        driver.execute_async_script(_QUIESCENCE_JS, int(quiet_ms), int(max_secs * 1000))
+    except Exception:
+        if css:
+            wait_for_stable_count(driver, css, quiet_ms / 1000.0, max(0.0, max_secs - (time.time() - t0)))
+    elapsed = time.time() - t0
+    record_wait(label, elapsed)
+    return elapsed
+
+
+def wait_for_document(driver, timeout: float, label: str = "document") -> float:
+    """Wait until readyState is interactive/complete and <body> has content."""
+    t0 = time.time()
+    try:
+        WebDriverWait(driver, timeout, poll_frequency=POLL_SECS).until(
+            lambda d: d.execute_script(
+                "return (document.readyState === 'interactive' || document.readyState === 'complete')"
+                " && !!document.body && document.body.children.length > 0"
+            )
+        )
+    finally:
+        record_wait(label, time.time() - t0)
+    return time.time() - t0
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Record every page the scrapers fetch, and serve the recording back from a local
+stand-in for odds.aussportsbetting.com.
+
+Record (RECORD_DIR=path on scraper.py or discover_active_compids.py):
+  <dir>/index.jsonl          one {"key", "file", "ts"} line per page, appended as we go
+  <dir>/pages/<sha1>.html.gz the page HTML
+Keys are the request path + query ("/betting?function=...") so a recording works under
+any base URL; the MultiBet stage stores each comp's rendered page as "multibet/<compid>".
+If a page is fetched twice, the last copy wins on replay.
+
+Replay:
+  python scraper/replay.py serve --archive DIR [--port 8765] [--latency-ms 0]
+  ODDS_BASE_URL=http://127.0.0.1:8765 python scraper/discover_active_compids.py ...
+The stand-in serves recorded betting and discovery pages by path, so the HTTP
+verification and discovery stages run against it unchanged (tests/test_replay.py).
+It also serves a minimal /multibet shell (compid input + update button) whose
+update swaps in the recorded page for that comp, minus that page's own compid
+control and update button so the shell's stay the only ones. The shell hasn't
+been driven by the Selenium MultiBet stage in CI (no Chrome there); the tests
+check the swapped-in fragment parses like the original page.
+
+  python scraper/replay.py stats --archive DIR
+"""
+import os
+import re
+import sys
+import gzip
+import json
+import time
+import hashlib
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+RECORD_DIR = os.getenv("RECORD_DIR") or None
+
+
+def page_key(url: str) -> str:
+    """Path + query of a URL: the archive key for a fetched page."""
+    parts = urlsplit(url)
+    return parts.path + (f"?{parts.query}" if parts.query else "")
+
+
+def multibet_key(compid: int) -> str:
+    return f"multibet/{compid}"
+
+
+class PageArchive:
+    def __init__(self, root: str):
+        self.root = root
+        self._lock = threading.Lock()
+        os.makedirs(os.path.join(root, "pages"), exist_ok=True)
+
+    def record(self, key: str, html: str) -> None:
+        data = html.encode("utf-8")
+        name = hashlib.sha1(data).hexdigest() + ".html.gz"
+        path = os.path.join(self.root, "pages", name)
+        with self._lock:
+            if not os.path.exists(path):
+                with gzip.GzipFile(path + ".tmp", "wb", mtime=0) as f:
+                    f.write(data)
+                os.replace(path + ".tmp", path)
+            with open(os.path.join(self.root, "index.jsonl"), "a", encoding="utf-8") as f:
+                f.write(json.dumps({"key": key, "file": name, "ts": round(time.time(), 3)}) + "\n")
+
+    def index(self) -> Dict[str, str]:
+        """key -> page file (latest recording wins)."""
+        out: Dict[str, str] = {}
+        try:
+            with open(os.path.join(self.root, "index.jsonl"), "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue  # a half-written last line from an interrupted run
+                    out[entry["key"]] = entry["file"]
+        except FileNotFoundError:
+            pass
+        return out
+
+    def read(self, name: str) -> str:
+        with gzip.open(os.path.join(self.root, "pages", name), "rt", encoding="utf-8") as f:
+            return f.read()
+
+
+_RECORDER: Optional[PageArchive] = None
+_RECORDER_LOCK = threading.Lock()
+
+
+def record_page(key: str, html: Optional[str]) -> None:
+    """Archive a fetched page when RECORD_DIR is set (no-op otherwise)."""
+    global _RECORDER
+    if not RECORD_DIR or not html:
+        return
+    with _RECORDER_LOCK:
+        if _RECORDER is None:
+            _RECORDER = PageArchive(RECORD_DIR)
+    _RECORDER.record(key, html)
+
+
+# --- stand-in server ---
+MULTIBET_SHELL = """<html><head><title>MultiBet</title></head><body>
+<form id="replay-form" onsubmit="return false;">
+<input type="text" name="compid" value="">
+<button id="update" type="button">Update</button>
+</form>
+<div id="replay-content"></div>
+<script>
+document.getElementById('update').addEventListener('click', function () {
+  var compid = document.getElementsByName('compid')[0].value.trim();
+  fetch('/_replay/multibet/' + encodeURIComponent(compid))
+    .then(function (r) { return r.text(); })
+    .then(function (html) { document.getElementById('replay-content').innerHTML = html; });
+});
+</script>
+</body></html>
+"""
+
+_BODY_RE = re.compile(r"<body[^>]*>(.*)</body>", re.IGNORECASE | re.DOTALL)
+
+# the recorded page's own form controls; left in, the shell would have two of each
+_FORM_CONTROL_RES = [
+    re.compile(r"<select\b[^>]*\bname=[\"']?compid\b[^>]*>.*?</select\s*>", re.IGNORECASE | re.DOTALL),
+    re.compile(r"<input\b[^>]*\b(?:name=[\"']?compid|id=[\"']?update)\b[^>]*>", re.IGNORECASE),
+    re.compile(r"<(button|a)\b[^>]*\bid=[\"']?update\b[^>]*>.*?</\1\s*>", re.IGNORECASE | re.DOTALL),
+]
+
+
+def _body(html: str) -> str:
+    m = _BODY_RE.search(html)
+    return m.group(1) if m else html
+
+
+def _fragment(html: str) -> str:
+    """A recorded MultiBet page's body without its compid control and update button."""
+    body = _body(html)
+    for pattern in _FORM_CONTROL_RES:
+        body = pattern.sub("", body)
+    return body
+
+
+def make_handler(archive: PageArchive, latency_ms: float = 0.0):
+    index = archive.index()
+
+    class Handler(BaseHTTPRequestHandler):
+        def _send(self, code: int, body: str) -> None:
+            data = body.encode("utf-8")
+            self.send_response(code)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            if latency_ms > 0:
+                time.sleep(latency_ms / 1000.0)
+            path = self.path
+            if path.split("?", 1)[0] == "/multibet":
+                return self._send(200, MULTIBET_SHELL)
+            if path.startswith("/_replay/multibet/"):
+                name = index.get(multibet_key(path.rsplit("/", 1)[1]))
+                return self._send(200, _fragment(archive.read(name)) if name else "<p>no recording</p>")
+            name = index.get(path)
+            if name is None:
+                return self._send(404, "<html><body>not in recording</body></html>")
+            return self._send(200, archive.read(name))
+
+        def log_message(self, fmt, *args):
+            pass
+
+    return Handler
+
+
+def serve(archive_dir: str, host: str = "127.0.0.1", port: int = 8765, latency_ms: float = 0.0) -> ThreadingHTTPServer:
+    archive = PageArchive(archive_dir)
+    server = ThreadingHTTPServer((host, port), make_handler(archive, latency_ms))
+    server.daemon_threads = True
+    return server
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Serve or inspect a recorded page archive.")
+    ap.add_argument("command", choices=["serve", "stats"])
+    ap.add_argument("--archive", default=RECORD_DIR, required=RECORD_DIR is None)
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--latency-ms", type=float, default=0.0, help="Delay every response (simulate the real site)")
+    args = ap.parse_args()
+
+    if args.command == "stats":
+        archive = PageArchive(args.archive)
+        index = archive.index()
+        comps = sum(1 for k in index if k.startswith("multibet/"))
+        size = sum(os.path.getsize(os.path.join(args.archive, "pages", n)) for n in set(index.values()))
+        print(f"{len(index)} pages ({comps} multibet comps, {len(index) - comps} other), "
+              f"{size / 1024:.1f} KiB compressed")
+        return 0
+
+    server = serve(args.archive, args.host, args.port, args.latency_ms)
+    print(f"[replay] serving {args.archive} on http://{args.host}:{args.port} "
+          f"(ODDS_BASE_URL=http://{args.host}:{args.port})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,143 @@
+"""
+Adaptive per-competition refresh intervals.
+
+Each compid gets its own interval between SCHEDULE_MIN_SECS and SCHEDULE_MAX_SECS,
+shortened by whichever is most urgent:
+  - change:  how often its arb rows changed between scrapes (EMA of 0/1)
+  - yield:   how many verified arbs it has been producing (EMA, saturates at YIELD_FULL)
+  - start:   how soon its earliest game starts (from the rows' "date" / "dateISO")
+New compids are always due. A cycle only scrapes the due ones; the others keep the
+verified items from their last scrape, which live in the state file with the stats.
+Carried items go out marked `carried: true` with the `scraped_at` of the scrape
+that produced them, so readers can tell them from this run's prices.
+"""
+import os
+import json
+import hashlib
+import datetime as dt
+from typing import Any, Dict, List, Optional
+
+SCHEDULE_MIN_SECS = float(os.getenv("SCHEDULE_MIN_SECS", "60"))
+SCHEDULE_MAX_SECS = float(os.getenv("SCHEDULE_MAX_SECS", "1800"))
+# A comp is due once this fraction of its interval has passed, so it isn't
+# pushed back a whole cycle by a few seconds of jitter.
+DUE_SLACK  = 0.9
+EMA_ALPHA  = 0.3
+YIELD_FULL = 5.0
+
+# (hours until the earliest game, urgency)
+START_URGENCY = [(3.0, 1.0), (24.0, 0.6), (72.0, 0.2)]
+
+
+def rows_fingerprint(rows: List[Dict[str, Any]]) -> str:
+    """Hash of what the MultiBet page showed: the game, market and both selections with odds."""
+    keys = sorted(f"{r.get('game')}|{r.get('market')}|{r.get('match')}" for r in rows)
+    return hashlib.sha1("\n".join(keys).encode("utf-8")).hexdigest()
+
+
+def _row_start(row: Dict[str, Any]) -> Optional[dt.datetime]:
+    for value, fmt in ((row.get("date"), "%d/%m/%Y %H:%M"), (row.get("dateISO"), "%Y-%m-%d")):
+        if not value:
+            continue
+        try:
+            return dt.datetime.strptime(value, fmt)
+        except ValueError:
+            try:
+                return dt.datetime.fromisoformat(value)
+            except ValueError:
+                continue
+    return None
+
+
+def earliest_start(rows: List[Dict[str, Any]]) -> Optional[float]:
+    """Epoch seconds of the earliest game in rows (site-local times read as local; coarse is fine here)."""
+    starts = [s for s in (_row_start(r) for r in rows) if s is not None]
+    return min(starts).timestamp() if starts else None
+
+
+class RefreshSchedule:
+    def __init__(self, path: str, min_secs: float = SCHEDULE_MIN_SECS, max_secs: float = SCHEDULE_MAX_SECS):
+        self.path = path
+        self.min_secs = min_secs
+        self.max_secs = max(max_secs, min_secs)
+        self.comps: Dict[str, Dict[str, Any]] = {}
+
+    @classmethod
+    def load(cls, path: str, **kwargs) -> "RefreshSchedule":
+        sched = cls(path, **kwargs)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                sched.comps = (json.load(f) or {}).get("comps", {})
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            print(f"[schedule] couldn't read {path} ({type(e).__name__}); starting fresh")
+        return sched
+
+    def save(self) -> None:
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"comps": self.comps}, f, ensure_ascii=False)
+        os.replace(tmp, self.path)
+
+    def interval(self, st: Dict[str, Any], now: float) -> float:
+        urgency = max(st.get("change", 1.0), min(1.0, st.get("yield", 0.0) / YIELD_FULL))
+        start = st.get("start")
+        if start is not None:
+            hours = (start - now) / 3600.0
+            for limit, u in START_URGENCY:
+                if hours <= limit:
+                    urgency = max(urgency, u)
+                    break
+        return self.max_secs - (self.max_secs - self.min_secs) * urgency
+
+    def due(self, comp_ids: List[int], now: float) -> List[int]:
+        out = []
+        for compid in comp_ids:
+            st = self.comps.get(str(compid))
+            if st is None or now - st.get("last", 0.0) >= DUE_SLACK * self.interval(st, now):
+                out.append(compid)
+        return out
+
+    def record(self, compid: int, scraped: List[Dict[str, Any]], verified: List[Dict[str, Any]],
+               now: float) -> None:
+        """
+        Update a comp's stats after a scrape. `scraped` drives change and start time;
+        `verified` drives yield (candidates that don't verify aren't arbs) and is
+        what later cycles carry over, stamped with this scrape's time.
+        """
+        st = self.comps.get(str(compid))
+        fp = rows_fingerprint(scraped)
+        if st is None:
+            st = {"change": 1.0, "yield": float(len(verified))}
+        else:
+            changed = 1.0 if fp != st.get("fp") else 0.0
+            st["change"] = (1 - EMA_ALPHA) * st.get("change", 1.0) + EMA_ALPHA * changed
+            st["yield"]  = (1 - EMA_ALPHA) * st.get("yield", 0.0) + EMA_ALPHA * len(verified)
+        scraped_at = dt.datetime.utcfromtimestamp(now).isoformat() + "Z"
+        st["fp"] = fp
+        st["last"] = now
+        st["start"] = earliest_start(scraped)
+        st["items"] = [{**it, "scraped_at": scraped_at} for it in verified]
+        self.comps[str(compid)] = st
+
+    def carried_items(self, comp_ids: List[int]) -> List[Dict[str, Any]]:
+        """Copies of these comps' last verified items, marked carried (scraped_at stays the original)."""
+        items: List[Dict[str, Any]] = []
+        for compid in comp_ids:
+            for it in (self.comps.get(str(compid)) or {}).get("items") or []:
+                items.append({**it, "carried": True})
+        return items
+
+    def forget_except(self, comp_ids: List[int]) -> None:
+        """Drop comps that are no longer in the active list."""
+        keep = {str(c) for c in comp_ids}
+        self.comps = {k: v for k, v in self.comps.items() if k in keep}
+
+    def summary(self, comp_ids: List[int], now: float) -> str:
+        ivs = [self.interval(self.comps[str(c)], now) for c in comp_ids if str(c) in self.comps]
+        if not ivs:
+            return "[schedule] no history yet"
+        return (f"[schedule] intervals: min={min(ivs):.0f}s median={sorted(ivs)[len(ivs) // 2]:.0f}s "
+                f"max={max(ivs):.0f}s over {len(ivs)} comps")
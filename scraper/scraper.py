@@ -1,36 +1,150 @@
 import os
 import re
+import gzip
+import fcntl
+import signal
+import argparse
 import time
 import json
+import base64
+import csv
+import io
+import hashlib
+import threading
+import queue
+import asyncio
+import multiprocessing
+import functools
 import datetime as dt
-from typing import List, Dict, Any, Optional, Tuple
-
-from bs4 import BeautifulSoup, NavigableString
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Callable, Iterable, List, Dict, Any, Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from bs4 import NavigableString
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import (
+    NoSuchFrameException, StaleElementReferenceException,
+)
 
 import psycopg2
 from psycopg2.extras import execute_values
 
+import metrics
+from arb_engine import best_prices, evaluate as evaluate_markets
+from parsers import PARSER_BACKEND, make_soup
+from schedule import RefreshSchedule
+from stakes import STAKE_BANKROLLS, STAKE_STEPS, add_stake_plans
+from stream import NdjsonStream, write_json_atomic
+from odds_history import OddsHistory, observations_from_items
+from replay import multibet_key, page_key, record_page
+from readiness import (POLL_SECS, WAIT_LOG, record_wait, reset_waits, wait_for_document,
+                       wait_for_quiescence, wait_summary)
+
 # === Paths & constants ===
 DATA_PATH   = os.path.join(os.path.dirname(__file__), '..', 'server', 'data', 'opportunities.json')
-TARGET_URL  = "http://odds.aussportsbetting.com/multibet"
+# Site root; point it at `replay.py serve` to run the whole pipeline against a recording
+ODDS_BASE_URL = os.getenv("ODDS_BASE_URL", "http://odds.aussportsbetting.com").rstrip("/")
+TARGET_URL  = f"{ODDS_BASE_URL}/multibet"
 SKIP_IDS    = {72, 73, 108, 114}  # keep your historical skip list
+USER_AGENT  = ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+               "AppleWebKit/537.36 (KHTML, like Gecko) "
+               "Chrome/124.0.0.0 Safari/537.36")
+
+# Betting-page fetch engine: "http" (pooled keep-alive client, Selenium fallback) or "selenium"
+FETCH_ENGINE = os.getenv("FETCH_ENGINE", "http").strip().lower()
+HTTP_TIMEOUT = float(os.getenv("HTTP_TIMEOUT", "15"))
+
+# Number of Chrome workers for the MultiBet stage (each worker owns one driver)
+SCRAPE_WORKERS = max(1, int(os.getenv("SCRAPE_WORKERS", "1")))
+
+# Keep one /multibet page per driver and only switch compid between comps ("0" = reload per comp)
+MULTIBET_SESSION = os.getenv("MULTIBET_SESSION", "1").strip().lower() not in ("0", "false", "no")
+
+# How MultiBet odds are collected after clicking update:
+#   "dom" = wait for the table to render, then read page_source
+#   "cdp" = take the response body behind the table straight from Chrome's Network events
+CAPTURE_MODE    = os.getenv("CAPTURE_MODE", "dom").strip().lower()
+CAPTURE_TIMEOUT = float(os.getenv("CAPTURE_TIMEOUT", "10"))
+CAPTURE_DIR     = os.getenv("CAPTURE_DIR") or None  # optional: archive each comp's raw payload (.html.gz)
+
+# Worker processes that parse page HTML while the drivers move on to the next page (0 = parse inline)
+PARSE_PROCESSES = max(0, int(os.getenv("PARSE_PROCESSES", str(max(1, (os.cpu_count() or 2) - 1)))))
+
+# Daemon mode: seconds between cycle starts, and when to replace a warm driver
+SCRAPE_INTERVAL    = float(os.getenv("SCRAPE_INTERVAL", "60"))
+DRIVER_MAX_PAGES   = int(os.getenv("DRIVER_MAX_PAGES", "500"))     # 0 = never recycle on page count
+DRIVER_MAX_RSS_MB  = float(os.getenv("DRIVER_MAX_RSS_MB", "1500"))  # chromedriver + Chrome tree; 0 = ignore
+
+# Batches at least this big are staged with COPY instead of multi-row INSERTs
+DB_COPY_THRESHOLD = int(os.getenv("DB_COPY_THRESHOLD", "500"))
+
+# Odds history: append every verified book_table price to a columnar store (see odds_history.py).
+# Off by default: it only accumulates on a host whose disk outlives the run (daemon mode),
+# not on a throwaway CI runner.
+ODDS_HISTORY     = os.getenv("ODDS_HISTORY", "").lower() in ("1", "true", "yes")
+ODDS_HISTORY_DIR = os.getenv("ODDS_HISTORY_DIR") or os.path.join(os.path.dirname(DATA_PATH), "odds_history")
+
+# Adaptive refresh: only scrape comps whose own interval has elapsed (see schedule.py)
+ADAPTIVE_SCHEDULE = os.getenv("ADAPTIVE_SCHEDULE", "").lower() in ("1", "true", "yes")
+SCHEDULE_STATE    = os.getenv("SCHEDULE_STATE") or os.path.join(os.path.dirname(DATA_PATH), "schedule_state.json")
+
+# Streaming output: verify each comp as soon as it's scraped and push its rows out right away.
+#   STREAM_OUTPUT = "ndjson" (append to STREAM_PATH), "db" (upsert into Postgres), or "ndjson,db"
+# The sorted snapshot (opportunities.json, and STREAM_PATH rewritten) still lands at the end.
+STREAM_OUTPUT = {x.strip() for x in os.getenv("STREAM_OUTPUT", "").lower().split(",") if x.strip()}
+STREAM_PATH   = os.getenv("STREAM_PATH") or os.path.join(os.path.dirname(DATA_PATH), "opportunities.ndjson")
+
+# Run report (run_report.json) and Prometheus textfile (scraper.prom) go here; "0" disables them
+METRICS_DIR = os.getenv("METRICS_DIR", os.path.dirname(DATA_PATH))
+
+# Verification stage: total in-flight betting fetches, per-host cap, and min gap between
+# request starts on the same host (politeness)
+VERIFY_CONCURRENCY      = max(1, int(os.getenv("VERIFY_CONCURRENCY", "8")))
+VERIFY_HOST_CONCURRENCY = max(1, int(os.getenv("VERIFY_HOST_CONCURRENCY", "4")))
+VERIFY_HOST_DELAY       = float(os.getenv("VERIFY_HOST_DELAY", "0.05"))
 
 # Filter: skip noisy Baseball O/U +0.5 pairs (e.g., "Over +0.5" vs "Under +0.5")
 _RE_OVER_05  = re.compile(r'\bover\s*\(?\+?0\.5\)?\b', re.I)
 _RE_UNDER_05 = re.compile(r'\bunder\s*\(?\+?0\.5\)?\b', re.I)
 
+# A MultiBet selection link reads "<outcome> - <odds>"; onclick="addSelection(..., marketid, ...)"
+_SELECTION_RE = re.compile(r'\S\s+-\s+\d+(?:\.\d+)?\s*$')
+_ADD_SELECTION_RE = re.compile(r"addSelection\((.*)\);")
+
 
 # === Small helpers ===
 def _is_bad_baseball_half_total(txt: str) -> bool:
     s = re.sub(r'\s+', ' ', txt or '').lower().replace('−', '-')
     return bool(_RE_OVER_05.search(s) and _RE_UNDER_05.search(s))
 
+def _selection_anchors(a_tags: List[Any]) -> List[Any]:
+    """
+    The links in a #more-market-odds cell that are outcomes of its market: priced
+    ("<outcome> - <odds>") and, when the cell has addSelection(...) links, only those
+    for the first one's marketid. Anything else (form guide, more-markets links) isn't a leg.
+    """
+    priced = [a for a in a_tags if _SELECTION_RE.search(a.text.strip())]
+    market = None
+    picks = []
+    for a in priced:
+        m = _ADD_SELECTION_RE.search(a.get("onclick") or "")
+        args = [x.strip().strip("'") for x in m.group(1).split(",")] if m else []
+        if len(args) < 3:
+            continue
+        if market is None:
+            market = args[2]
+        if args[2] == market:
+            picks.append(a)
+    return picks if len(picks) >= 2 else priced
+
 def _epoch_ms_to_iso(ms: int) -> str:
     return dt.datetime.fromtimestamp(ms / 1000, tz=dt.timezone.utc).isoformat().replace("+00:00", "Z")
 
@@ -95,12 +209,10 @@ def make_driver() -> webdriver.Chrome:
     # ✅ Allow loading from a plain-HTTP origin in newer Chrome
     # (these relax mixed/insecure content restrictions that tightened in Chrome 140+)
     opts.add_argument("--allow-running-insecure-content")
-    opts.add_argument("--unsafely-treat-insecure-origin-as-secure=http://odds.aussportsbetting.com")
+    opts.add_argument(f"--unsafely-treat-insecure-origin-as-secure={ODDS_BASE_URL}")
 
     # Realistic UA (same as your original/test)
-    opts.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                      "AppleWebKit/537.36 (KHTML, like Gecko) "
-                      "Chrome/124.0.0.0 Safari/537.36")
+    opts.add_argument(f"--user-agent={USER_AGENT}")
 
     # Use the exact Chrome from setup-chrome
     chrome_bin = os.environ.get("CHROME_BIN") or os.environ.get("GOOGLE_CHROME_SHIM")
@@ -111,43 +223,86 @@ def make_driver() -> webdriver.Chrome:
     chromedriver_path = os.environ.get("CHROMEDRIVER_PATH") or os.environ.get("CHROMEWEBDRIVER")
     service = Service(chromedriver_path) if chromedriver_path else Service()
 
+    # CDP capture reads Network.* events from the performance log
+    if CAPTURE_MODE == "cdp":
+        opts.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+
     drv = webdriver.Chrome(service=service, options=opts)
     drv.set_page_load_timeout(45)
+    if CAPTURE_MODE == "cdp":
+        drv.execute_cdp_cmd("Network.enable", {
+            "maxTotalBufferSize": 64 * 1024 * 1024,
+            "maxResourceBufferSize": 16 * 1024 * 1024,
+        })
     print(f"[driver] chrome_bin={getattr(opts, 'binary_location', None)} | chromedriver={chromedriver_path} | headless={headless}")
     return drv
 
-def _find_in_any_frame(driver, by, value, timeout=15):
+def make_http_session(pool_size: int = 10) -> requests.Session:
+    """
+    Keep-alive HTTP client for the betting pages:
+      - one pooled connection set per host, reused across every verification fetch
+      - same UA as the Chrome driver
+      - ignore proxy env, like make_driver() does for Chrome
+    """
+    s = requests.Session()
+    s.trust_env = False
+    s.headers.update({
+        "User-Agent": USER_AGENT,
+        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+        "Accept-Language": "en-AU,en;q=0.9",
+    })
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size, max_retries=1)
+    s.mount("http://", adapter)
+    s.mount("https://", adapter)
+    return s
+
+def _locate_in_frames(driver, by, value, timeout=15):
     """
     Same frame search behavior as your test script:
     try top document, then all iframes, until found or timeout.
+    Each context is checked with an immediate find_elements, so we never sit out
+    a per-frame wait when the element lives somewhere else.
+    Returns (element, iframe element or None for the top document), leaving the
+    driver switched into that frame.
     """
-    deadline = time.time() + timeout
-    while time.time() < deadline:
-        try:
+    with metrics.span("frame_search", key=value):
+        t0 = time.time()
+        deadline = t0 + timeout
+        while True:
             driver.switch_to.default_content()
-            return WebDriverWait(driver, 2).until(EC.presence_of_element_located((by, value)))
-        except Exception:
-            pass
-        frames = driver.find_elements(By.TAG_NAME, "iframe")
-        for fr in frames:
-            try:
-                driver.switch_to.default_content()
-                driver.switch_to.frame(fr)
-                return WebDriverWait(driver, 2).until(EC.presence_of_element_located((by, value)))
-            except Exception:
-                pass
-        time.sleep(0.3)
-    driver.switch_to.default_content()
-    raise TimeoutError(f"Could not locate {value} in any frame")
+            found = driver.find_elements(by, value)
+            if found:
+                record_wait(f"frame:{value}", time.time() - t0)
+                return found[0], None
+            frames = driver.find_elements(By.TAG_NAME, "iframe")
+            for fr in frames:
+                try:
+                    driver.switch_to.default_content()
+                    driver.switch_to.frame(fr)
+                    found = driver.find_elements(by, value)
+                    if found:
+                        record_wait(f"frame:{value}", time.time() - t0)
+                        return found[0], fr
+                except Exception:
+                    pass
+            if time.time() >= deadline:
+                break
+            time.sleep(POLL_SECS)
+        driver.switch_to.default_content()
+        raise TimeoutError(f"Could not locate {value} in any frame")
+
+def _find_in_any_frame(driver, by, value, timeout=15):
+    return _locate_in_frames(driver, by, value, timeout)[0]
 
 
 def extract_search_phrase(match_text: str) -> str:
     """
-    From "Home - 1.90 | Under 200.5 - 1.95" return the right side label before odds.
+    From "Home - 1.90 | Under 200.5 - 1.95" return the right side label before odds
+    (the last leg, so three-way "Home | Draw | Away" anchors on the away side too).
     Used to anchor into the betting page sub-table.
     """
     try:
-        right = match_text.split('|')[1].strip()
+        right = match_text.split('|')[-1].strip()
         phrase = right.split(' - ')[0].strip()
         if 'Under' in phrase:
             phrase = phrase.replace('+', '')
@@ -169,49 +324,211 @@ def _goto_multibet(driver: webdriver.Chrome, timeout: int = 20) -> None:
     Super small, robust nav:
       - try http then https (some runners/proxies refuse http)
       - 3 quick attempts each
-      - ensure document.readyState, and that the DOM isn't an empty <body></body>
+      - wait until document.readyState is ready and <body> has content (no fixed settle)
     """
-    urls = [
-        "http://odds.aussportsbetting.com/multibet",
-        "https://odds.aussportsbetting.com/multibet",
-    ]
+    urls = [TARGET_URL]
+    if TARGET_URL.startswith("http://"):
+        urls.append("https://" + TARGET_URL[len("http://"):])
     last_err = None
-    for url in urls:
-        for _ in range(3):
-            try:
-                driver.get(url)
-                WebDriverWait(driver, timeout).until(
-                    lambda d: d.execute_script("return document.readyState") in ("interactive","complete")
-                )
-                # tiny settle helps CI paint
-                time.sleep(0.5)
-                html = (driver.page_source or "").replace("\n","").replace(" ","")
-                if "<body></body>" not in html:
+    with metrics.span("goto_multibet"):
+        for url in urls:
+            for _ in range(3):
+                try:
+                    driver.get(url)
+                    wait_for_document(driver, timeout, label="multibet-load")
+                    _drain_performance_log(driver)
                     return
-            except Exception as e:
-                last_err = e
-            time.sleep(0.5)
-    raise TimeoutError(f"Failed to load MultiBet page (last error: {last_err})")
+                except Exception as e:
+                    last_err = e
+                metrics.incr("retries.goto_multibet")
+                time.sleep(0.5)
+        raise TimeoutError(f"Failed to load MultiBet page (last error: {last_err})")
 
 
 # === First stage: scrape MultiBet page for pairs ===
-def scrape_competition(driver: webdriver.Chrome, compid: int) -> List[Dict[str, Any]]:
-    rows: List[Dict[str, Any]] = []
-    _goto_multibet(driver)
-
-    # EXACTLY like the test script: look for name="compid" and id="update"
-    input_el = _find_in_any_frame(driver, By.NAME, "compid", timeout=20)
-    driver.execute_script("arguments[0].value = arguments[1];", input_el, compid)
-    driver.execute_script("arguments[0].dispatchEvent(new Event('change', {bubbles:true}));", input_el)
+# Marks the odds cells already on the page, so after clicking update we only accept fresh ones
+_MARK_OLD_ODDS_JS = "document.querySelectorAll('#more-market-odds').forEach(e => e.setAttribute('data-arb-old', '1'));"
+_FRESH_ODDS_CSS = "td#more-market-odds:not([data-arb-old])"
+
+def _wait_for_odds(driver: webdriver.Chrome) -> None:
+    t0 = time.time()
+    WebDriverWait(driver, 20, poll_frequency=POLL_SECS).until(
+        EC.presence_of_element_located((By.CSS_SELECTOR, _FRESH_ODDS_CSS))
+    )
+    record_wait("more-market-odds", time.time() - t0)
+    # return once the odds table stops mutating instead of a fixed settle
+    wait_for_quiescence(driver, "odds-settle", css="td#more-market-odds")
+
+# how each comp's odds HTML was obtained: "cdp" payload vs rendered "dom"
+CAPTURE_STATS: Dict[str, int] = {"cdp": 0, "dom": 0}
+_STATS_LOCK = threading.Lock()
+
+def _drain_performance_log(driver: webdriver.Chrome) -> None:
+    """
+    Throw away buffered Network events. Called after every navigation and before
+    each update click, so a capture only ever sees responses to that click and the
+    log never piles up a page load's worth of events.
+    """
+    if CAPTURE_MODE != "cdp":
+        return
+    try:
+        driver.get_log("performance")
+    except Exception:
+        pass
 
-    driver.switch_to.default_content()
-    update_btn = _find_in_any_frame(driver, By.ID, "update", timeout=20)
-    update_btn.click()
+def _capture_odds_payload(driver: webdriver.Chrome, timeout: float = CAPTURE_TIMEOUT) -> Optional[str]:
+    """
+    Watch Chrome's Network events for the response that carries the odds table
+    (the first finished HTML/JSON/text body containing 'more-market-odds') and
+    return that body. None if nothing matching arrives before the timeout.
+    """
+    t0 = time.time()
+    pending: Dict[str, str] = {}  # requestId -> mimeType, for candidate responses
+    while time.time() - t0 < timeout:
+        for entry in driver.get_log("performance"):
+            try:
+                msg = json.loads(entry["message"])["message"]
+            except Exception:
+                continue
+            method = msg.get("method")
+            params = msg.get("params") or {}
+            if method == "Network.responseReceived":
+                mime = ((params.get("response") or {}).get("mimeType") or "").lower()
+                if "html" in mime or "json" in mime or "text/plain" in mime:
+                    pending[params.get("requestId")] = mime
+            elif method == "Network.loadingFinished" and params.get("requestId") in pending:
+                rid = params["requestId"]
+                pending.pop(rid, None)
+                try:
+                    res = driver.execute_cdp_cmd("Network.getResponseBody", {"requestId": rid})
+                except Exception:
+                    continue
+                body = res.get("body") or ""
+                if res.get("base64Encoded"):
+                    body = base64.b64decode(body).decode("utf-8", "replace")
+                if "more-market-odds" in body:
+                    record_wait("cdp-payload", time.time() - t0)
+                    return body
+        time.sleep(POLL_SECS)
+    return None
+
+def _click_update_and_collect(driver: webdriver.Chrome, update_el) -> str:
+    """
+    Click update and return the HTML holding the fresh odds.
+    In CDP mode that's the captured response body; otherwise, or if nothing was
+    captured, the rendered page_source. Either way the page has stopped
+    re-rendering before this returns, so the next select doesn't race it.
+    """
+    driver.execute_script(_MARK_OLD_ODDS_JS)
+    _drain_performance_log(driver)
+    update_el.click()
+
+    if CAPTURE_MODE == "cdp":
+        payload = _capture_odds_payload(driver)
+        if payload is not None:
+            # the body is in hand, but the page is still swapping it in
+            wait_for_quiescence(driver, "cdp-settle", css="td#more-market-odds")
+            with _STATS_LOCK:
+                CAPTURE_STATS["cdp"] += 1
+            return payload
+    _wait_for_odds(driver)
+    with _STATS_LOCK:
+        CAPTURE_STATS["dom"] += 1
+    return driver.page_source
+
+def _archive_payload(compid: int, html: str) -> None:
+    if not CAPTURE_DIR:
+        return
+    os.makedirs(CAPTURE_DIR, exist_ok=True)
+    with gzip.open(os.path.join(CAPTURE_DIR, f"comp_{compid}.html.gz"), "wt", encoding="utf-8") as f:
+        f.write(html)
 
-    WebDriverWait(driver, 20).until(EC.presence_of_element_located((By.ID, "more-market-odds")))
-    time.sleep(1.0)  # small settle to ensure table is populated
+class MultibetSession:
+    """
+    One /multibet page per driver.
+    The page is loaded once and the compid input, the update button and the frames
+    they live in are cached. Each competition just sets compid and clicks update.
+    Stale handles are re-resolved in place first, and the page is only reloaded
+    when that fails.
+    """
 
-    soup = BeautifulSoup(driver.page_source, "html.parser")
+    def __init__(self, driver: webdriver.Chrome):
+        self.driver = driver
+        self.input_el = self.input_frame = None
+        self.update_el = self.update_frame = None
+        self.page_loads = 0
+        self.switches = 0
+
+    def _resolve(self, timeout: int = 20) -> None:
+        self.input_el, self.input_frame = _locate_in_frames(self.driver, By.NAME, "compid", timeout=timeout)
+        self.update_el, self.update_frame = _locate_in_frames(self.driver, By.ID, "update", timeout=timeout)
+
+    def _open(self) -> None:
+        _goto_multibet(self.driver)
+        self.page_loads += 1
+        self._resolve()
+
+    def _enter(self, frame) -> None:
+        self.driver.switch_to.default_content()
+        if frame is not None:
+            self.driver.switch_to.frame(frame)
+
+    def _select_once(self, compid: int) -> str:
+        drv = self.driver
+        self._enter(self.input_frame)
+        drv.execute_script("arguments[0].value = arguments[1];", self.input_el, compid)
+        drv.execute_script("arguments[0].dispatchEvent(new Event('change', {bubbles:true}));", self.input_el)
+
+        self._enter(self.update_frame)
+        return _click_update_and_collect(drv, self.update_el)
+
+    def select(self, compid: int) -> str:
+        """Show `compid` on the page and return the HTML holding its odds."""
+        if self.input_el is None:
+            self._open()
+        try:
+            html = self._select_once(compid)
+        except (StaleElementReferenceException, NoSuchFrameException):
+            # handles went stale (update re-rendered the form): re-find them without a reload
+            metrics.incr("retries.session_resolve")
+            try:
+                self._resolve(timeout=2)
+            except TimeoutError:
+                metrics.incr("retries.session_reload")
+                self._open()
+            html = self._select_once(compid)
+        self.switches += 1
+        return html
+
+def scrape_competition(driver: webdriver.Chrome, compid: int,
+                       session: Optional[MultibetSession] = None) -> List[Dict[str, Any]]:
+    return parse_multibet_html(collect_competition_html(driver, compid, session), compid)
+
+def collect_competition_html(driver: webdriver.Chrome, compid: int,
+                             session: Optional[MultibetSession] = None) -> str:
+    """Drive the MultiBet page to `compid` and return the HTML holding its odds."""
+    if session is not None:
+        html = session.select(compid)
+    else:
+        _goto_multibet(driver)
+
+        # EXACTLY like the test script: look for name="compid" and id="update"
+        input_el = _find_in_any_frame(driver, By.NAME, "compid", timeout=20)
+        driver.execute_script("arguments[0].value = arguments[1];", input_el, compid)
+        driver.execute_script("arguments[0].dispatchEvent(new Event('change', {bubbles:true}));", input_el)
+
+        driver.switch_to.default_content()
+        update_btn = _find_in_any_frame(driver, By.ID, "update", timeout=20)
+        html = _click_update_and_collect(driver, update_btn)
+
+    _archive_payload(compid, html)
+    record_page(multibet_key(compid), html)
+    return html
+
+def parse_multibet_html(html: str, compid: int) -> List[Dict[str, Any]]:
+    """Candidate arb rows from a rendered MultiBet page for one competition."""
+    rows: List[Dict[str, Any]] = []
+    soup = make_soup(html)
 
     # sport name
     sport_value = "Unknown Sport"
@@ -223,21 +540,21 @@ def scrape_competition(driver: webdriver.Chrome, compid: int) -> List[Dict[str,
 
     # iterate all odds cells
     for td in soup.find_all("td", id="more-market-odds"):
-        a_tags = td.find_all("a")
+        # one leg per priced selection: 2 is two-way, 3 is the draw case below,
+        # 4+ an N-way market (the betting block has to list that many outcomes)
+        a_tags = _selection_anchors(td.find_all("a"))
         if len(a_tags) < 2:
             continue
 
-        # 3-anchor case: middle draw @ 1.00 -> use outer two
-        use_outer_two = False
+        # 3-anchor case: a middle draw @ 1.00 is a placeholder -> use the outer two;
+        # a priced draw makes it a real three-way market (every leg has to be covered)
         if len(a_tags) == 3:
             try:
                 mid_odds = float(a_tags[1].text.split('-')[-1].strip())
             except Exception:
-                mid_odds = None
-            if mid_odds is not None and abs(mid_odds - 1.0) < 1e-6:
-                use_outer_two = True
-            else:
                 continue
+            if abs(mid_odds - 1.0) < 1e-6:
+                a_tags = [a_tags[0], a_tags[2]]
 
         # market/game/date via parent traversal
         market_name = "Unknown Market"
@@ -267,23 +584,18 @@ def scrape_competition(driver: webdriver.Chrome, compid: int) -> List[Dict[str,
         except Exception:
             pass
 
-        if use_outer_two:
-            left_anchor, right_anchor = a_tags[0], a_tags[2]
-        else:
-            left_anchor, right_anchor = a_tags[0], a_tags[1]
-
-        link_text_1 = left_anchor.text.strip()
-        link_text_2 = right_anchor.text.strip()
+        link_texts = [a.text.strip() for a in a_tags]
+        match_pair = " | ".join(link_texts)
 
         # baseball +0.5 noise filter
-        if 'baseball' in (sport_value or '').lower() and _is_bad_baseball_half_total(f"{link_text_1} | {link_text_2}"):
+        if 'baseball' in (sport_value or '').lower() and _is_bad_baseball_half_total(match_pair):
             continue
 
         # build betting URL when onclick has addSelection(...)
-        onclick_1 = left_anchor.get("onclick")
+        onclick_1 = a_tags[0].get("onclick")
         full_url = None
         if onclick_1:
-            m = re.search(r"addSelection\((.*)\);", onclick_1)
+            m = _ADD_SELECTION_RE.search(onclick_1)
             if m:
                 args = [arg.strip().strip("'") for arg in m.group(1).split(",")]
                 if len(args) >= 7:
@@ -293,16 +605,15 @@ def scrape_competition(driver: webdriver.Chrome, compid: int) -> List[Dict[str,
                     period        = args[5]
                     function      = args[6]
                     full_url = (
-                        f"http://odds.aussportsbetting.com/betting?function={function}"
+                        f"{ODDS_BASE_URL}/betting?function={function}"
                         f"&competitionid={competitionid}&period={period}&marketid={marketid}"
                         f"&matchnumber={matchnumber}&websiteid=1856&oddsType=&swif=&whitelabel="
                     )
 
-        # parse odds -> market% & ROI
+        # parse odds -> market% & ROI (one leg per outcome)
         try:
-            a = float(link_text_1.split(" - ")[1])
-            b = float(link_text_2.split(" - ")[1])
-            market_pct = ((1/a) + (1/b)) * 100 if a > 0 and b > 0 else 100.0
+            odds = [float(t.split(" - ")[1]) for t in link_texts]
+            market_pct = sum(1 / o for o in odds) * 100 if all(o > 0 for o in odds) else 100.0
         except Exception:
             continue
 
@@ -311,7 +622,6 @@ def scrape_competition(driver: webdriver.Chrome, compid: int) -> List[Dict[str,
 
         roi = (1.0 / (market_pct / 100.0)) - 1.0
 
-        match_pair = f"{link_text_1} | {link_text_2}"
         row = {
             "url": full_url,  # may be None
             "market_percentage": round(market_pct, 2),
@@ -340,27 +650,313 @@ def scrape_competition(driver: webdriver.Chrome, compid: int) -> List[Dict[str,
 
     return rows
 
-# === Second stage: open betting page and compute best-agency odds ===
-def _scrape_betting_table_for_search(driver: webdriver.Chrome, url: str, search_phrase: str) -> Optional[Dict[str, Any]]:
-    if not url:
+def _timed(fn, *args):
+    """(fn(*args), seconds): lets parse time measured in a pool worker reach the run's metrics."""
+    t0 = time.perf_counter()
+    out = fn(*args)
+    return out, time.perf_counter() - t0
+
+def make_parse_pool(processes: int = PARSE_PROCESSES) -> Optional[ProcessPoolExecutor]:
+    """
+    Process pool for the CPU-heavy parsing, or None to parse inline.
+    Uses "spawn" so children never inherit the driver/asyncio threads mid-lock.
+    """
+    if processes <= 0:
         return None
+    return ProcessPoolExecutor(max_workers=processes, mp_context=multiprocessing.get_context("spawn"))
+
+def _process_tree_rss_mb(root_pid: int) -> Optional[float]:
+    """Resident memory of a process and all its descendants, from /proc (Linux only)."""
     try:
-        driver.get(url)
+        children: Dict[int, List[int]] = {}
+        rss_kb: Dict[int, int] = {}
+        for entry in os.listdir("/proc"):
+            if not entry.isdigit():
+                continue
+            try:
+                with open(f"/proc/{entry}/stat", encoding="utf-8") as f:
+                    ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+                with open(f"/proc/{entry}/status", encoding="utf-8") as f:
+                    for line in f:
+                        if line.startswith("VmRSS:"):
+                            rss_kb[int(entry)] = int(line.split()[1])
+                            break
+            except (OSError, ValueError, IndexError):
+                continue
+            children.setdefault(ppid, []).append(int(entry))
+    except OSError:
+        return None
+    total, stack = 0, [root_pid]
+    while stack:
+        pid = stack.pop()
+        total += rss_kb.get(pid, 0)
+        stack.extend(children.get(pid, []))
+    return total / 1024.0
+
+class Browser:
+    """
+    One Chrome driver plus its MultibetSession and a count of pages it has loaded.
+    `lock` is held while the driver is busy, so the verification fallback can borrow it
+    between comps while its scrape worker is still running (streaming mode).
+    """
+
+    def __init__(self):
+        with metrics.span("driver_start"):
+            self.driver = make_driver()
+        self.session = MultibetSession(self.driver) if MULTIBET_SESSION else None
+        self.pages = 0
+        self.lock = threading.Lock()
+
+    @contextmanager
+    def borrow(self):
+        """Use the driver outside its worker; the MultiBet page is reloaded on the next comp."""
+        with self.lock:
+            try:
+                yield self.driver
+            finally:
+                if self.session is not None:
+                    self.session.input_el = None  # we navigated away: cached handles are gone
+
+    def rss_mb(self) -> Optional[float]:
+        try:
+            return _process_tree_rss_mb(self.driver.service.process.pid)
+        except Exception:
+            return None
+
+    def healthy(self) -> bool:
+        try:
+            self.driver.execute_script("return 1")
+            return True
+        except Exception:
+            return False
+
+    def quit(self) -> None:
         try:
-            WebDriverWait(driver, 12).until(EC.presence_of_all_elements_located((By.TAG_NAME, "table")))
+            self.driver.quit()
         except Exception:
             pass
-        soup = BeautifulSoup(driver.page_source, "html.parser")
 
-        # find subheading anchor
-        anchor_cell = None
-        for td_sub in soup.find_all("td", class_="subheading"):
-            if (search_phrase or "").lower() in td_sub.get_text(" ", strip=True).lower():
-                anchor_cell = td_sub
-                break
-        if not anchor_cell:
+class ScraperRuntime:
+    """
+    The expensive-to-build parts of a run: Chrome drivers, the HTTP session, the
+    parse pool and the Postgres connection.
+    run_once() builds one and tears it down; the daemon keeps one warm across
+    cycles and calls recycle() in between. Browsers are started lazily.
+    """
+
+    def __init__(self, workers: int = SCRAPE_WORKERS):
+        self.browsers: List[Optional[Browser]] = [None] * max(1, workers)
+        self.http = make_http_session(pool_size=max(10, VERIFY_CONCURRENCY)) if FETCH_ENGINE == "http" else None
+        self.parse_pool = make_parse_pool()
+        self.conn = None
+        self._start_locks = [threading.Lock() for _ in self.browsers]
+
+    def browser(self, i: int) -> Browser:
+        # a scrape worker and the streaming verifier may both ask for browser 0 first
+        with self._start_locks[i]:
+            if self.browsers[i] is None:
+                self.browsers[i] = Browser()
+            return self.browsers[i]
+
+    def fallback_browser(self) -> Optional[Browser]:
+        """Browser for the verification stage's Selenium fallback (None if Chrome won't start)."""
+        try:
+            return self.browser(0)
+        except Exception as e:
+            print(f"[runtime] no driver for verification fallback: {type(e).__name__}: {e}")
+            return None
+
+    def db(self):
+        """Persistent Postgres connection, or None when DATABASE_URL isn't set."""
+        db_url = os.environ.get("DATABASE_URL")
+        if not db_url:
             return None
+        if self.conn is None or self.conn.closed:
+            self.conn = psycopg2.connect(db_url)
+        return self.conn
+
+    def drop_db(self) -> None:
+        if self.conn is not None:
+            try:
+                self.conn.close()
+            except Exception:
+                pass
+        self.conn = None
+
+    def recycle(self, max_pages: int = DRIVER_MAX_PAGES, max_rss_mb: float = DRIVER_MAX_RSS_MB) -> None:
+        """Quit browsers that are dead, have loaded max_pages, or whose process tree grew past max_rss_mb."""
+        for i, b in enumerate(self.browsers):
+            if b is None:
+                continue
+            rss = b.rss_mb() if max_rss_mb > 0 else None
+            reason = None
+            if not b.healthy():
+                reason = "unresponsive"
+            elif max_pages > 0 and b.pages >= max_pages:
+                reason = f"{b.pages} pages"
+            elif rss is not None and rss > max_rss_mb:
+                reason = f"rss {rss:.0f}MB"
+            if reason:
+                print(f"[runtime] recycling driver {i} ({reason})")
+                b.quit()
+                self.browsers[i] = None
+
+    def close(self) -> None:
+        for b in self.browsers:
+            if b is not None:
+                b.quit()
+        self.browsers = [None] * len(self.browsers)
+        if self.parse_pool is not None:
+            self.parse_pool.shutdown(cancel_futures=True)
+            self.parse_pool = None
+        if self.http is not None:
+            self.http.close()
+            self.http = None
+        self.drop_db()
+
+def _scrape_worker(browser: Browser, todo: "queue.Queue[int]",
+                   results: Dict[int, Any], tag: str = "",
+                   parse_pool: Optional[ProcessPoolExecutor] = None,
+                   on_comp: Optional[Callable[[int, List[Dict[str, Any]]], None]] = None) -> None:
+    """
+    Drain compids from the shared queue on one browser.
+    Errors stay per-compid, exactly like the serial loop.
+    With a parse pool, results[compid] is a Future and the driver moves straight on.
+    """
+    session = browser.session
+    loads_before = session.page_loads if session is not None else 0
+    switches_before = session.switches if session is not None else 0
+    try:
+        _drain_queue(browser, todo, results, tag, parse_pool, on_comp)
+    finally:
+        if session is not None:
+            print(f"{tag}[session] {session.switches - switches_before} comps on "
+                  f"{session.page_loads - loads_before} page load(s)")
+
+def _comp_done(on_comp: Callable[[int, List[Dict[str, Any]]], None], compid: int, fut: Future) -> None:
+    try:
+        rows, _ = fut.result()
+    except Exception:
+        return  # reported when scrape_competitions merges the results
+    if rows:
+        on_comp(compid, rows)
+
+def _drain_queue(browser: Browser, todo: "queue.Queue[int]", results: Dict[int, Any], tag: str,
+                 parse_pool: Optional[ProcessPoolExecutor],
+                 on_comp: Optional[Callable[[int, List[Dict[str, Any]]], None]] = None) -> None:
+    driver, session = browser.driver, browser.session
+    while True:
+        try:
+            compid = todo.get_nowait()
+        except queue.Empty:
+            return
+        print(f"{tag}Scraping compid: {compid} …")
+        browser.pages += 1
+        try:
+            with browser.lock, metrics.span("comp", key=compid):
+                html = collect_competition_html(driver, compid, session)
+            if parse_pool is not None:
+                fut = parse_pool.submit(_timed, parse_multibet_html, html, compid)
+                results[compid] = fut
+                if on_comp is not None:
+                    fut.add_done_callback(functools.partial(_comp_done, on_comp, compid))
+                continue
+            with metrics.span("parse_multibet", key=compid):
+                rows = parse_multibet_html(html, compid) or []
+            results[compid] = rows
+            print(f"{tag}  + {len(rows)} rows (compid {compid})")
+            if on_comp is not None and rows:
+                on_comp(compid, rows)
+        except Exception as e:
+            print(f"{tag}  ! Error on compid {compid}: {type(e).__name__}: {e}")
+
+def scrape_competitions(runtime: ScraperRuntime, comp_ids: List[int],
+                        on_comp: Optional[Callable[[int, List[Dict[str, Any]]], None]] = None,
+                        done: Optional[set] = None) -> List[Dict[str, Any]]:
+    """
+    Run the MultiBet stage over every compid.
+      - one browser: the original serial loop
+      - several browsers: they pull from one shared queue, so a slow comp
+        doesn't hold up a fixed shard
+      - with a parse pool, page HTML is parsed in worker processes while the drivers navigate
+    Rows are merged back in comp_ids order, so output doesn't depend on timing.
+    on_comp(compid, rows) is also called as soon as each comp's rows are parsed (any thread).
+    `done` collects the compids that were scraped and parsed (errors leave them out).
+    """
+    if not comp_ids:
+        return []
+    todo: "queue.Queue[int]" = queue.Queue()
+    for compid in comp_ids:
+        todo.put(compid)
+    results: Dict[int, Any] = {}
+    parse_pool = runtime.parse_pool
+
+    workers = max(1, min(len(runtime.browsers), len(comp_ids)))
+    if workers == 1:
+        _scrape_worker(runtime.browser(0), todo, results, parse_pool=parse_pool, on_comp=on_comp)
+    else:
+        print(f"[pool] scraping {len(comp_ids)} comps with {workers} workers")
+
+        def run(i: int) -> None:
+            _scrape_worker(runtime.browser(i), todo, results, tag=f"[w{i}] ", parse_pool=parse_pool, on_comp=on_comp)
+
+        with ThreadPoolExecutor(max_workers=workers) as ex:
+            futures = [ex.submit(run, i) for i in range(workers)]
+            for i, fut in enumerate(futures):
+                try:
+                    fut.result()
+                except Exception as e:
+                    # e.g. Chrome failed to start; the other workers drain the queue
+                    print(f"[pool] worker {i} failed: {type(e).__name__}: {e}")
+
+    all_rows: List[Dict[str, Any]] = []
+    for compid in comp_ids:
+        if compid not in results:
+            continue  # the scrape itself failed; already reported by the worker
+        rows = results[compid]
+        if isinstance(rows, Future):
+            try:
+                rows, secs = rows.result()
+                metrics.observe("parse_multibet", secs, key=compid)
+                print(f"  + {len(rows)} rows (compid {compid})")
+            except Exception as e:
+                metrics.incr("errors.parse_multibet")
+                print(f"  ! Parse error on compid {compid}: {type(e).__name__}: {e}")
+                continue
+        if done is not None:
+            done.add(compid)
+        all_rows.extend(rows)
+    return all_rows
+
+# === Second stage: open betting page and compute best-agency odds ===
+FETCH_STATS: Dict[str, int] = {"http": 0, "selenium": 0}
+
+def _fetch_http(session: requests.Session, url: str) -> Optional[str]:
+    """Plain HTTP fetch; None unless the page actually carries 'subheading' tables."""
+    try:
+        resp = session.get(url, timeout=HTTP_TIMEOUT)
+    except requests.RequestException:
+        return None
+    html = resp.text if resp.status_code == 200 else ""
+    return html if "subheading" in html else None
 
+def _fetch_selenium(driver: webdriver.Chrome, url: str) -> str:
+    driver.get(url)
+    _drain_performance_log(driver)
+    try:
+        WebDriverWait(driver, 12, poll_frequency=POLL_SECS).until(
+            EC.presence_of_all_elements_located((By.TAG_NAME, "table"))
+        )
+    except Exception:
+        pass
+    return driver.page_source
+
+def _normalize_subheading(text: str) -> str:
+    return " ".join((text or "").split()).lower()
+
+def _extract_block(anchor_cell) -> Optional[Dict[str, Any]]:
+    """Headers, agency rows and best odds for the block under one td.subheading."""
+    try:
         anchor_tr = anchor_cell.find_parent("tr")
         header_tds = anchor_tr.find_all("td", recursive=False)
         header_len = len(header_tds)
@@ -402,6 +998,8 @@ def _scrape_betting_table_for_search(driver: webdriver.Chrome, url: str, search_
         left_head = td_text_safe(header_tds, header_left_idx)
         right_head = td_text_safe(header_tds, header_right_idx)
         headers = ["Agency", left_head, right_head, "Updated"]
+        # every outcome column from left to right (three-way layouts carry the draw in between)
+        outcomes = [td_text_safe(header_tds, i) for i in range(header_left_idx, header_right_idx + 1)]
 
         rows_out = []
 
@@ -457,6 +1055,7 @@ def _scrape_betting_table_for_search(driver: webdriver.Chrome, url: str, search_
                 "agency": agency,
                 "left": left_txt,
                 "right": right_txt,
+                "odds": [safe(i) for i in range(l_idx, r_idx + 1)],
                 "updated": updated if u_idx is not None else "",
                 "updatedMs": updated_ms,
                 "updatedISO": updated_iso
@@ -474,152 +1073,641 @@ def _scrape_betting_table_for_search(driver: webdriver.Chrome, url: str, search_
         if not rows_out:
             return None
 
-        def to_float(x):
-            try:
-                return float(x)
-            except Exception:
-                m = re.findall(r"(\d+(?:\.\d+)?)", x or "")
-                return float(m[-1]) if m else None
-
-        best_left  = (None, -1.0)
-        best_right = (None, -1.0)
-        for r in rows_out:
-            lf, rf = to_float(r["left"]), to_float(r["right"])
-            if lf is not None and lf > best_left[1]:
-                best_left = (r["agency"], lf)
-            if rf is not None and rf > best_right[1]:
-                best_right = (r["agency"], rf)
-
-        best = {
-            "left":  {"agency": best_left[0],  "odds": best_left[1]  if best_left[1]  > 0 else None},
-            "right": {"agency": best_right[0], "odds": best_right[1] if best_right[1] > 0 else None},
-        }
+        best_agency, best_odds = best_prices(rows_out, len(outcomes))
+        by_outcome = [{"agency": a, "odds": o} for a, o in zip(best_agency, best_odds)]
+        best = {"left": by_outcome[0], "right": by_outcome[-1], "outcomes": by_outcome}
 
-        return {"headers": headers, "rows": rows_out, "best": best}
+        return {"headers": headers, "outcomes": outcomes, "rows": rows_out, "best": best}
     except Exception:
         return None
 
-def save_opportunities_to_db(items: List[Dict[str, Any]]) -> None:
+def _first_heading(headings: Iterable[str], key: str) -> Optional[str]:
+    """The first heading (in page order) containing `key`: the old linear td.subheading search."""
+    for heading in headings:
+        if key in heading:
+            return heading
+    return None
+
+def parse_betting_page(html: str, phrases: Optional[Iterable[str]] = None) -> Dict[str, Optional[Dict[str, Any]]]:
+    """
+    Parse a betting page once into {normalized subheading text: extracted block}.
+    Keys keep document order and the first occurrence of a heading wins, so a
+    substring scan over the keys matches the old linear td.subheading search.
+    With `phrases`, only the blocks those phrases resolve to are extracted (block
+    extraction is ~40% of a large page's parse, and a page is usually looked up
+    for a handful of markets); lookups for those phrases resolve the same way.
+    """
+    soup = make_soup(html)
+    cells: Dict[str, Any] = {}
+    for td_sub in soup.find_all("td", class_="subheading"):
+        cells.setdefault(_normalize_subheading(td_sub.get_text(" ", strip=True)), td_sub)
+
+    wanted = set(cells)
+    if phrases is not None:
+        wanted = {_first_heading(cells, _normalize_subheading(p)) for p in phrases}
+
+    index: Dict[str, Optional[Dict[str, Any]]] = {}
+    blocks_by_tr: Dict[int, Optional[Dict[str, Any]]] = {}
+    for key, td_sub in cells.items():
+        if key not in wanted:
+            continue
+        tr_id = id(td_sub.find_parent("tr"))
+        if tr_id not in blocks_by_tr:
+            blocks_by_tr[tr_id] = _extract_block(td_sub)
+        index[key] = blocks_by_tr[tr_id]
+    return index
+
+# page = one fetch+parse per URL; exact/scan/miss = how phrase lookups were resolved
+CACHE_STATS: Dict[str, int] = {"pages": 0, "lookups": 0, "exact": 0, "scan": 0, "miss": 0}
+
+def lookup_betting_table(index: Dict[str, Optional[Dict[str, Any]]], search_phrase: str) -> Optional[Dict[str, Any]]:
+    """
+    The first subheading (in page order) that contains the phrase, as the old
+    per-phrase search did: a later heading that equals the phrase doesn't win
+    over an earlier one that merely contains it. Counted as exact when the
+    match is the whole subheading.
+    """
+    key = _normalize_subheading(search_phrase)
+    heading = _first_heading(index, key)
+    if heading is None:
+        CACHE_STATS["miss"] += 1
+        return None
+    CACHE_STATS["exact" if heading == key else "scan"] += 1
+    return index[heading]
+
+def _fetch_selenium_guarded(driver: webdriver.Chrome, url: str, guard: Optional[Callable] = None) -> str:
+    if guard is None:
+        return _fetch_selenium(driver, url)
+    with guard():
+        return _fetch_selenium(driver, url)
+
+async def _fetch_pages_async(driver: Optional[webdriver.Chrome], session: Optional[requests.Session],
+                             phrases: Dict[str, List[str]], parse_pool: Optional[ProcessPoolExecutor] = None,
+                             guard: Optional[Callable] = None
+                             ) -> Dict[str, Optional[Dict[str, Optional[Dict[str, Any]]]]]:
+    """
+    Fetch + parse every betting page concurrently, once per URL, extracting only
+    the blocks that URL's phrases need.
+      - at most VERIFY_CONCURRENCY fetches in flight, VERIFY_HOST_CONCURRENCY per host
+      - request starts on one host are spaced by VERIFY_HOST_DELAY
+      - the Selenium fallback shares one driver, so it's serialized behind a lock
+        (and behind guard(), e.g. Browser.borrow, when a scrape worker owns that driver)
+    Blocking I/O (requests, Selenium) runs in the default thread pool; parsing goes to
+    the process pool when there is one.
+    """
+    loop = asyncio.get_running_loop()
+    global_sem = asyncio.Semaphore(VERIFY_CONCURRENCY)
+    host_sems: Dict[str, asyncio.Semaphore] = {}
+    host_next_start: Dict[str, float] = {}
+    driver_lock = asyncio.Lock()
+
+    async def one(url: str) -> Optional[Dict[str, Optional[Dict[str, Any]]]]:
+        html, spent = None, 0.0  # fetch time only, not time queued behind the limits
+        if session is not None:
+            host = urlsplit(url).netloc
+            host_sem = host_sems.setdefault(host, asyncio.Semaphore(VERIFY_HOST_CONCURRENCY))
+            async with global_sem, host_sem:
+                now = loop.time()
+                start = max(now, host_next_start.get(host, now))
+                host_next_start[host] = start + VERIFY_HOST_DELAY
+                if start > now:
+                    await asyncio.sleep(start - now)
+                t0 = time.perf_counter()
+                html = await asyncio.to_thread(_fetch_http, session, url)
+                spent += time.perf_counter() - t0
+            if html is not None:
+                FETCH_STATS["http"] += 1
+        if html is None and driver is not None:
+            async with driver_lock:
+                FETCH_STATS["selenium"] += 1
+                t0 = time.perf_counter()
+                try:
+                    html = await asyncio.to_thread(_fetch_selenium_guarded, driver, url, guard)
+                except Exception:
+                    html = None
+                spent += time.perf_counter() - t0
+        metrics.observe("verify_fetch", spent, key=url)
+        if not html:
+            metrics.incr("errors.verify_fetch")
+            return None
+        record_page(page_key(url), html)
+        try:
+            if parse_pool is not None:
+                index, secs = await loop.run_in_executor(parse_pool, _timed, parse_betting_page, html, phrases[url])
+            else:
+                index, secs = await asyncio.to_thread(_timed, parse_betting_page, html, phrases[url])
+        except Exception:
+            metrics.incr("errors.parse_betting")
+            return None
+        metrics.observe("parse_betting", secs, key=url)
+        return index
+
+    urls = list(phrases)
+    pages = await asyncio.gather(*(one(url) for url in urls))
+    return dict(zip(urls, pages))
+
+def verify_tables(driver: Optional[webdriver.Chrome], session: Optional[requests.Session],
+                  pairs: List[Tuple[str, str]], parse_pool: Optional[ProcessPoolExecutor] = None,
+                  guard: Optional[Callable] = None
+                  ) -> Dict[Tuple[str, str], Optional[Dict[str, Any]]]:
+    """
+    Run the concurrent verification stage; returns {(url, phrase): table or None}.
+    Each URL is fetched and indexed once, then every phrase on it is a dict lookup.
+    """
+    if not pairs:
+        return {}
+    t0 = time.time()
+    phrases: Dict[str, List[str]] = {}
+    for url, phrase in pairs:
+        phrases.setdefault(url, []).append(phrase)
+    urls = list(phrases)
+    pages = asyncio.run(_fetch_pages_async(driver, session, phrases, parse_pool, guard))
+
+    out: Dict[Tuple[str, str], Optional[Dict[str, Any]]] = {}
+    for url, phrase in pairs:
+        index = pages.get(url)
+        out[(url, phrase)] = lookup_betting_table(index, phrase) if index else None
+    CACHE_STATS["pages"] += len(urls)
+    CACHE_STATS["lookups"] += len(pairs)
+
+    hits = len(pairs) - len(urls)
+    print(f"[verify] {len(pairs)} pairs over {len(urls)} pages in {time.time() - t0:.1f}s "
+          f"(concurrency={VERIFY_CONCURRENCY}, per-host={VERIFY_HOST_CONCURRENCY})")
+    print(f"[verify] page cache: {hits} hits / {len(urls)} misses ({hits / len(pairs):.0%} hit rate) | "
+          f"index exact={CACHE_STATS['exact']} scan={CACHE_STATS['scan']} miss={CACHE_STATS['miss']}")
+    return out
+
+def opportunity_key(item: Dict[str, Any]) -> str:
     """
-    Write the current opportunities into the Postgres 'opportunities' table.
+    Stable identity of an opportunity across runs: competition, game, start, market and
+    the two selections - but NOT the odds, so a price move updates the row in place.
+    """
+    sides = [part.rsplit(" - ", 1)[0].strip() for part in (item.get("match") or "").split(" | ")]
+    ident = [item.get("competitionid"), item.get("game"), item.get("date"), item.get("market"), sides]
+    return hashlib.sha1(json.dumps(ident, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+_SCHEMA_SQL = """
+ALTER TABLE opportunities ADD COLUMN IF NOT EXISTS opp_key TEXT;
+CREATE UNIQUE INDEX IF NOT EXISTS opportunities_opp_key_idx ON opportunities (opp_key);
+CREATE TABLE IF NOT EXISTS scrape_status (
+  id            SMALLINT PRIMARY KEY DEFAULT 1 CHECK (id = 1),
+  last_updated  TIMESTAMPTZ NOT NULL
+);
+"""
+
+# Connections (by id) whose database we've already brought up to the opp_key schema
+_SCHEMA_READY: set = set()
+
+def _stage_rows(cur, rows: List[Tuple[str, str]]) -> None:
+    """Load (opp_key, data) into the opp_stage temp table: COPY for big batches, execute_values otherwise."""
+    if len(rows) >= DB_COPY_THRESHOLD:
+        buf = io.StringIO()
+        csv.writer(buf).writerows(rows)
+        buf.seek(0)
+        cur.copy_expert("COPY opp_stage (opp_key, data) FROM STDIN WITH (FORMAT csv)", buf)
+    elif rows:
+        execute_values(cur, "INSERT INTO opp_stage (opp_key, data) VALUES %s", rows)
+
+def save_opportunities_to_db(items: List[Dict[str, Any]], conn=None, prune: bool = True,
+                             last_updated: Optional[str] = None) -> None:
+    """
+    Sync the Postgres 'opportunities' table to the current items.
 
     We:
       - DROP the 'url' field (you said you don't need it in the DB)
-      - Store the rest of the object as JSONB in the 'data' column
-      - DELETE all existing rows first (simple v1: only keep latest scrape)
+      - key every item by opportunity_key() (first one wins, items arrive best-ROI first)
+      - stage the batch in a temp table, then in ONE transaction:
+          delete rows whose key vanished, insert new keys, and update a row only
+          when its JSONB actually changed
+    Readers never see an empty table, and untouched rows cost no writes.
+    prune=False only upserts (streaming a comp's rows mid-run); the end-of-run
+    sync prunes whatever vanished.
+    last_updated (the run's timestamp) goes into scrape_status in the same
+    transaction; scraped_at only moves when a row changes, so it can't tell
+    readers when the scraper last ran. Carried rows keep the scraped_at of the
+    scrape that produced them (the item's own "scraped_at").
+    Pass `conn` to reuse a long-lived connection (daemon mode); otherwise we
+    connect via DATABASE_URL and close again.
     """
-    db_url = os.environ.get("DATABASE_URL")
-    if not db_url:
-        print("[db] DATABASE_URL not set, skipping DB write")
-        return
-
-    print(f"[db] writing {len(items)} items to Postgres...")
-
-    conn = psycopg2.connect(db_url)
+    own_conn = conn is None
+    if own_conn:
+        db_url = os.environ.get("DATABASE_URL")
+        if not db_url:
+            print("[db] DATABASE_URL not set, skipping DB write")
+            return
+        conn = psycopg2.connect(db_url)
+
+    rows: Dict[str, str] = {}
+    for it in items:
+        record = dict(it)           # copy so we don't mutate original
+        record.pop("url", None)     # drop URL; not needed in DB
+        rows.setdefault(opportunity_key(it), json.dumps(record))
+    if len(rows) < len(items):
+        print(f"[db] {len(items) - len(rows)} duplicate opportunity keys dropped")
+
+    print(f"[db] syncing {len(rows)} items to Postgres...")
+
+    cur = conn.cursor()
     try:
-        cur = conn.cursor()
-
-        # Simple v1: clear old rows, then insert fresh ones
-        cur.execute("DELETE FROM opportunities;")
-
-        rows = []
-        for it in items:
-            record = dict(it)           # copy so we don't mutate original
-            record.pop("url", None)     # drop URL; not needed in DB
-            rows.append(json.dumps(record))
-
-        if rows:
-            execute_values(
-                cur,
-                "INSERT INTO opportunities (data) VALUES %s",
-                [(r,) for r in rows],   # each row is a single JSONB value
-            )
+        if id(conn) not in _SCHEMA_READY:
+            cur.execute(_SCHEMA_SQL)
+            conn.commit()
+            _SCHEMA_READY.add(id(conn))
+
+        cur.execute("CREATE TEMP TABLE opp_stage (opp_key TEXT PRIMARY KEY, data JSONB NOT NULL) ON COMMIT DROP;")
+        _stage_rows(cur, list(rows.items()))
+
+        deleted = 0
+        if prune:
+            cur.execute("""
+                DELETE FROM opportunities o
+                WHERE o.opp_key IS NULL
+                   OR NOT EXISTS (SELECT 1 FROM opp_stage s WHERE s.opp_key = o.opp_key);
+            """)
+            deleted = cur.rowcount
+
+        cur.execute("""
+            INSERT INTO opportunities (opp_key, data, scraped_at)
+            SELECT opp_key, data, COALESCE((data->>'scraped_at')::timestamptz, now()) FROM opp_stage
+            ON CONFLICT (opp_key) DO UPDATE
+               SET data = EXCLUDED.data, scraped_at = EXCLUDED.scraped_at
+             WHERE opportunities.data IS DISTINCT FROM EXCLUDED.data
+            RETURNING (xmax = 0);
+        """)
+        written = [r[0] for r in cur.fetchall()]
+        inserted = sum(1 for r in written if r)
+
+        if last_updated is not None:
+            cur.execute("""
+                INSERT INTO scrape_status (id, last_updated) VALUES (1, %s)
+                ON CONFLICT (id) DO UPDATE SET last_updated = EXCLUDED.last_updated;
+            """, (last_updated,))
 
         conn.commit()
-        print(f"[db] wrote {len(rows)} rows to opportunities")
+        metrics.incr("db.inserted", inserted)
+        metrics.incr("db.changed", len(written) - inserted)
+        metrics.incr("db.deleted", deleted)
+        if prune:
+            metrics.gauge("db.unchanged", len(rows) - len(written))
+        print(f"[db] opportunities: +{inserted} new, ~{len(written) - inserted} changed, "
+              f"-{deleted} gone, ={len(rows) - len(written)} unchanged")
+    except Exception:
+        conn.rollback()
+        raise
     finally:
         cur.close()
-        conn.close()
+        if own_conn:
+            _SCHEMA_READY.discard(id(conn))
+            conn.close()
 
 # === Orchestrator ===
-def run_once(comp_ids: List[int]) -> Dict[str, Any]:
-    driver = make_driver()
-    all_rows: List[Dict[str, Any]] = []
-    try:
-        # 1) scrape multibet page for each compid
-        for compid in comp_ids:
-            print(f"Scraping compid: {compid} …")
+def verify_rows(rows: List[Dict[str, Any]],
+                table_cache: Dict[Tuple[str, str], Optional[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    """Attach each row's betting table, re-price it from the best agencies and keep what's still an arb."""
+    tables = [table_cache.get((it["url"], it.get("search_phrase") or "")) if it.get("url") else None
+              for it in rows]
+    # best price per outcome + market % for every market at once (2-, 3- and N-way)
+    with metrics.span("arb_engine"):
+        markets = evaluate_markets(tables, [len((it.get("match") or "").split(" | ")) for it in rows])
+    verified: List[Dict[str, Any]] = []
+    for it, table, market in zip(rows, tables, markets):
+        if table:
+            it["book_table"] = table
+
+            # ➊ Exclude if ANY agency in the table is exactly "Bookmaker"
+            has_bookmaker = any(
+                (r.get("agency") or "").strip().lower() == "bookmaker"
+                for r in (table.get("rows") or [])
+            )
+            if has_bookmaker:
+                continue  # drop this row entirely
+
+            # ➋ Recompute market% and ROI from the current best price on every leg and
+            #    keep only if still an arb. No result means the block can't price the bet
+            #    (fewer outcomes than legs, or a leg nobody prices): don't pass the
+            #    MultiBet price off as verified
+            if market is None:
+                metrics.incr("verify.unpriced")
+                continue
+            if market["market_percentage"] >= 100.0:
+                continue  # no longer an arbitrage after the best-odds refresh
+            it["market_percentage"] = round(market["market_percentage"], 2)
+            it["roi"] = round(market["roi"], 6)
+            it["legs"] = market["outcomes"]
+        verified.append(it)
+    return verified
+
+def _verify_comp_rows(runtime: ScraperRuntime, rows: List[Dict[str, Any]]
+                      ) -> Dict[Tuple[str, str], Optional[Dict[str, Any]]]:
+    """Fetch the betting tables for `rows`; the Selenium fallback borrows browser 0 under its lock."""
+    pairs = list(dict.fromkeys(
+        (it["url"], it.get("search_phrase") or "") for it in rows if it.get("url")
+    ))
+    fallback = runtime.fallback_browser() if pairs else None
+    return verify_tables(fallback.driver if fallback else None, runtime.http, pairs, runtime.parse_pool,
+                         guard=fallback.borrow if fallback else None)
+
+class CompStream:
+    """
+    Streaming output: each comp's rows are verified as soon as the comp is scraped and
+    pushed out (NDJSON lines and/or a DB upsert) while the browsers move on.
+    One consumer thread, so comps are verified and written one at a time, in the order
+    they finish; finish() waits for the backlog and returns every verified row.
+    Rows go out with their stake plans; the caller plans `carried` before start().
+    """
+
+    def __init__(self, runtime: ScraperRuntime, outputs: set):
+        self.runtime = runtime
+        self.ndjson = NdjsonStream(STREAM_PATH) if "ndjson" in outputs else None
+        self.db = "db" in outputs
+        self.verified: List[Dict[str, Any]] = []
+        self.lookups = 0
+        self._todo: "queue.Queue[Optional[Tuple[int, List[Dict[str, Any]]]]]" = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="comp-stream", daemon=True)
+        self._t0 = time.time()
+
+    def start(self, carried: List[Dict[str, Any]]) -> None:
+        """Open the outputs with the rows carried over from comps that aren't due this run."""
+        if self.ndjson is not None:
+            self.ndjson.start(carried)
+        if carried:
+            self._save_db("carried", carried)
+        self._thread.start()
+
+    def put(self, compid: int, rows: List[Dict[str, Any]]) -> None:
+        self._todo.put((compid, rows))
+
+    def finish(self) -> List[Dict[str, Any]]:
+        if self._thread.is_alive():
+            self._todo.put(None)
+            self._thread.join()
+        return self.verified
+
+    def _run(self) -> None:
+        while True:
+            job = self._todo.get()
+            if job is None:
+                return
+            compid, rows = job
             try:
-                rows = scrape_competition(driver, compid) or []
-                all_rows.extend(rows)
-                print(f"  + {len(rows)} rows")
+                with metrics.span("verify", key=compid):
+                    table_cache = _verify_comp_rows(self.runtime, rows)
+                out = verify_rows(rows, table_cache)
             except Exception as e:
-                print(f"  ! Error on compid {compid}: {type(e).__name__}: {e}")
+                print(f"[stream] ! compid {compid} not verified: {type(e).__name__}: {e}")
                 continue
-
-        # 2) verify on betting page (if we have a URL), recompute market% & ROI from best agencies
-        table_cache: Dict[Tuple[str, str], Optional[Dict[str, Any]]] = {}
-        verified: List[Dict[str, Any]] = []
-        for it in all_rows:
-            url    = it.get("url")
-            phrase = it.get("search_phrase") or ""
-            table  = None
-            if url:
-                key = (url, phrase)
-                if key not in table_cache:
-                    table_cache[key] = _scrape_betting_table_for_search(driver, url, phrase)
-                table = table_cache[key]
-
-            # --- inside run_once(), in the "verified" build loop after we've set `table` ---
-            if table:
-                it["book_table"] = table
-
-                # ➊ Exclude if ANY agency in the table is exactly "Bookmaker"
-                has_bookmaker = any(
-                    (r.get("agency") or "").strip().lower() == "bookmaker"
-                    for r in (table.get("rows") or [])
-                )
-                if has_bookmaker:
-                    continue  # drop this row entirely
-
-                best = table.get("best") or {}
-                L = (best.get("left")  or {}).get("odds")
-                R = (best.get("right") or {}).get("odds")
-
-                # ➋ If we have current best prices, recompute market% and ROI and keep only if still an arb
-                if isinstance(L, (int, float)) and isinstance(R, (int, float)) and L > 0 and R > 0:
-                    new_market_pct = ((1.0 / L) + (1.0 / R)) * 100.0
-                    if new_market_pct >= 100.0:
-                        continue  # no longer an arbitrage after the best-odds refresh
-                    it["market_percentage"] = round(new_market_pct, 2)
-                    it["roi"] = round((1.0 / (new_market_pct / 100.0)) - 1.0, 6)
-
-
-            verified.append(it)
-
-        all_rows = verified
-
-    finally:
+            self.lookups += len(table_cache)
+            self.verified.extend(out)
+            if out:
+                with metrics.span("stakes", key=compid):
+                    add_stake_plans(out)
+                self._emit(compid, out)
+                if len(self.verified) == len(out):
+                    metrics.gauge("stream.first_rows_secs", round(time.time() - self._t0, 3))
+            print(f"[stream] compid {compid}: {len(out)}/{len(rows)} rows out at +{time.time() - self._t0:.1f}s")
+
+    def _emit(self, compid: int, rows: List[Dict[str, Any]]) -> None:
+        if self.ndjson is not None:
+            try:
+                self.ndjson.append(rows)
+            except OSError as e:
+                print(f"[stream] ndjson append failed: {type(e).__name__}: {e}")
+        self._save_db(compid, rows)
+
+    def _save_db(self, key: Any, rows: List[Dict[str, Any]]) -> None:
+        if not self.db:
+            return
         try:
-            driver.quit()
-        except Exception:
-            pass
-
-    all_rows.sort(key=lambda r: r.get('roi', 0.0), reverse=True)
+            conn = self.runtime.db()
+            if conn is not None:
+                with metrics.span("db_stream", key=key):
+                    save_opportunities_to_db(rows, conn, prune=False)
+        except Exception as e:
+            print(f"[db] error streaming compid {key}: {type(e).__name__}: {e}")
+            self.runtime.drop_db()
+
+def _reset_run_stats() -> None:
+    """Start a run's counters from zero (the daemon reports per cycle)."""
+    metrics.reset()
+    with _STATS_LOCK:
+        for stats in (FETCH_STATS, CACHE_STATS, CAPTURE_STATS):
+            for k in stats:
+                stats[k] = 0
+
+def _write_run_metrics() -> None:
+    """Fold the waits and fetch/cache/capture stats into the metrics, write the report, print the table."""
+    for label, secs in list(WAIT_LOG):
+        metrics.observe(f"wait.{label}", secs)
+    for prefix, stats in (("fetch", FETCH_STATS), ("cache", CACHE_STATS), ("capture", CAPTURE_STATS)):
+        for k, v in stats.items():
+            metrics.incr(f"{prefix}.{k}", v)
+    if CACHE_STATS["lookups"]:
+        metrics.gauge("verify.page_cache_hit_rate", round(1 - CACHE_STATS["pages"] / CACHE_STATS["lookups"], 4))
+    report = metrics.snapshot()
+    print(metrics.summary_table(report))
+    if METRICS_DIR and METRICS_DIR != "0":
+        try:
+            metrics.write_report(METRICS_DIR, report)
+        except OSError as e:
+            print(f"[metrics] could not write the run report: {type(e).__name__}: {e}")
 
-    # NEW: write to Postgres as well
+def run_once(comp_ids: List[int], runtime: Optional[ScraperRuntime] = None) -> Dict[str, Any]:
+    """
+    One full scrape -> verify -> write cycle.
+    Without `runtime` everything (drivers, session, pools, DB) is built here and torn
+    down at the end; the daemon passes its warm runtime instead.
+    """
+    _reset_run_stats()
+    print(f"[parser] backend={PARSER_BACKEND}")
+    scrape_ids: List[int] = comp_ids
+    carried: List[Dict[str, Any]] = []
+    schedule = RefreshSchedule.load(SCHEDULE_STATE) if ADAPTIVE_SCHEDULE else None
+    if schedule is not None:
+        now = time.time()
+        schedule.forget_except(comp_ids)
+        scrape_ids = schedule.due(comp_ids, now)
+        due = set(scrape_ids)
+        carried = schedule.carried_items([c for c in comp_ids if c not in due])
+        print(schedule.summary(comp_ids, now))
+        print(f"[schedule] {len(scrape_ids)}/{len(comp_ids)} comps due; carrying {len(carried)} items over")
+    metrics.gauge("comps.total", len(comp_ids))
+    metrics.gauge("comps.scraped", len(scrape_ids))
+
+    own_runtime = runtime is None
+    if runtime is None:
+        runtime = ScraperRuntime()
+    all_rows: List[Dict[str, Any]] = []
+    scraped_ok: set = set()
+    stream = CompStream(runtime, STREAM_OUTPUT) if STREAM_OUTPUT else None
     try:
-        save_opportunities_to_db(all_rows)
-    except Exception as e:
-        print(f"[db] error writing to Postgres: {type(e).__name__}: {e}")
+        # stake plans go on each batch once, as it's produced: carried rows now (they're
+        # streamed out first), each comp in the stream, the rest once verified
+        with metrics.span("stakes"):
+            add_stake_plans(carried)
+        if stream is not None:
+            stream.start(carried)
+
+        # 1) scrape multibet page for each due compid (optionally across a pool of drivers)
+        with metrics.span("scrape"):
+            all_rows = scrape_competitions(runtime, scrape_ids, on_comp=stream.put if stream else None,
+                                           done=scraped_ok)
+        metrics.gauge("rows.scraped", len(all_rows))
+
+        # 2) verify on betting page (if we have a URL), recompute market% & ROI from best agencies
+        if stream is not None:
+            # each comp was verified (and streamed out) as soon as it was scraped
+            verified = stream.finish()
+            lookups = stream.lookups
+        else:
+            # fetch every distinct (url, phrase) concurrently, then apply back in row order
+            with metrics.span("verify"):
+                table_cache = _verify_comp_rows(runtime, all_rows)
+            verified = verify_rows(all_rows, table_cache)
+            lookups = len(table_cache)
+            with metrics.span("stakes"):
+                add_stake_plans(verified)
+
+        metrics.gauge("rows.verified", len(verified))
+        if ODDS_HISTORY and verified:
+            try:
+                with metrics.span("history"):
+                    obs = observations_from_items(verified, int(time.time() * 1000))
+                    size = OddsHistory(ODDS_HISTORY_DIR).append(obs)
+                print(f"[history] appended {len(obs)} observations ({size / 1024:.1f} KiB)")
+            except Exception as e:
+                print(f"[history] append failed: {type(e).__name__}: {e}")
+
+        if schedule is not None:
+            now = time.time()
+            failed = [c for c in scrape_ids if c not in scraped_ok]
+            for compid in scrape_ids:
+                if compid not in scraped_ok:
+                    continue
+                schedule.record(compid,
+                                [r for r in all_rows if r.get("competitionid") == compid],
+                                [r for r in verified if r.get("competitionid") == compid],
+                                now)
+            schedule.save()
+            if failed:
+                # a failed scrape isn't "no arbs": keep last run's items and leave the comp due
+                kept = schedule.carried_items(failed)
+                with metrics.span("stakes"):
+                    add_stake_plans(kept)
+                carried.extend(kept)
+                print(f"[schedule] {len(failed)} comps failed; keeping their {len(kept)} previous items")
+
+        metrics.gauge("rows.carried", len(carried))
+        all_rows = verified + carried
+        planned = sum(1 for r in all_rows if "stakes" in r)
+        print(f"[stakes] {planned}/{len(all_rows)} items planned for bankrolls "
+              f"{', '.join(f'${b:g}' for b in STAKE_BANKROLLS)} at ${', $'.join(f'{s:g}' for s in STAKE_STEPS)} rounding")
+        print(f"[verify] {lookups} betting lookups | "
+              f"http={FETCH_STATS['http']} selenium={FETCH_STATS['selenium']} (engine={FETCH_ENGINE})")
+
+
+        summary = wait_summary()
+        if summary:
+            print(summary)
+        if CAPTURE_MODE == "cdp":
+            print(f"[capture] odds payloads: cdp={CAPTURE_STATS['cdp']} dom-fallback={CAPTURE_STATS['dom']}")
+
+        all_rows.sort(key=lambda r: r.get('roi', 0.0), reverse=True)
+        if stream is not None and stream.ndjson is not None:
+            stream.ndjson.finalize(all_rows)  # the streamed lines, replaced by the sorted set
+
+        run_at = dt.datetime.utcnow().isoformat() + 'Z'
+
+        # NEW: write to Postgres as well
+        try:
+            conn = runtime.db()
+            if conn is None:
+                print("[db] DATABASE_URL not set, skipping DB write")
+            else:
+                with metrics.span("db_write"):
+                    save_opportunities_to_db(all_rows, conn, last_updated=run_at)
+        except Exception as e:
+            print(f"[db] error writing to Postgres: {type(e).__name__}: {e}")
+            runtime.drop_db()  # reconnect next cycle
+    finally:
+        if stream is not None:
+            stream.finish()  # a failed run still drains what it streamed before closing the runtime
+        if own_runtime:
+            runtime.close()
 
-    payload = {"lastUpdated": dt.datetime.utcnow().isoformat() + 'Z', "items": all_rows}
+    payload = {"lastUpdated": run_at, "items": all_rows}
     os.makedirs(os.path.dirname(DATA_PATH), exist_ok=True)
-    with open(DATA_PATH, 'w', encoding='utf-8') as f:
-        json.dump(payload, f, ensure_ascii=False)
+    with metrics.span("write_json"):
+        write_json_atomic(DATA_PATH, payload)  # readers never see a half-written snapshot
+    metrics.gauge("rows.written", len(all_rows))
     print(f"Wrote {len(all_rows)} rows to {DATA_PATH}")
+    _write_run_metrics()
     return payload
 
+def run_daemon(comp_ids: List[int], interval: float = SCRAPE_INTERVAL) -> None:
+    """
+    Keep scraping every `interval` seconds on one warm runtime.
+      - a lock file next to DATA_PATH stops two scrapers overlapping on one host
+      - cycles never overlap: an overrunning cycle is followed immediately by the next
+      - SIGTERM/SIGINT finish the current cycle and shut down cleanly (a second one aborts)
+      - drivers are recycled between cycles after DRIVER_MAX_PAGES pages or DRIVER_MAX_RSS_MB
+    """
+    os.makedirs(os.path.dirname(DATA_PATH), exist_ok=True)
+    lock_file = open(DATA_PATH + ".lock", "w")
+    try:
+        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        print("[daemon] another scraper holds the lock; exiting")
+        lock_file.close()
+        return
+
+    stop = threading.Event()
+
+    def on_signal(signum, _frame):
+        if stop.is_set():
+            raise KeyboardInterrupt
+        print(f"[daemon] got signal {signum}; finishing the current cycle")
+        stop.set()
+
+    signal.signal(signal.SIGTERM, on_signal)
+    signal.signal(signal.SIGINT, on_signal)
+
+    runtime = ScraperRuntime()
+    cycle = 0
+    print(f"[daemon] {len(comp_ids)} comps every {interval:.0f}s")
+    try:
+        while not stop.is_set():
+            cycle += 1
+            t0 = time.monotonic()
+            reset_waits()
+            try:
+                run_once(comp_ids, runtime)
+            except Exception as e:
+                print(f"[daemon] cycle {cycle} failed: {type(e).__name__}: {e}")
+            runtime.recycle()
+
+            took = time.monotonic() - t0
+            if took >= interval:
+                print(f"[daemon] cycle {cycle} took {took:.1f}s (over the {interval:.0f}s interval)")
+            else:
+                print(f"[daemon] cycle {cycle} took {took:.1f}s")
+            stop.wait(max(0.0, interval - took))
+    finally:
+        runtime.close()
+        fcntl.flock(lock_file, fcntl.LOCK_UN)
+        lock_file.close()
+        print("[daemon] stopped")
+
 if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Scrape MultiBet arbs into opportunities.json (+ Postgres).")
+    ap.add_argument("--daemon", action="store_true",
+                    default=os.getenv("SCRAPE_DAEMON", "").lower() in ("1", "true", "yes"),
+                    help="Keep running on a warm browser instead of a single pass (SCRAPE_DAEMON=1)")
+    ap.add_argument("--interval", type=float, default=SCRAPE_INTERVAL,
+                    help="Seconds between cycle starts in daemon mode (SCRAPE_INTERVAL)")
+    args = ap.parse_args()
+
     comp_ids = parse_comp_ids(os.getenv('COMP_IDS'))
-    run_once(comp_ids)
+    if args.daemon:
+        run_daemon(comp_ids, args.interval)
+    else:
+        run_once(comp_ids)
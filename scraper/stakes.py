@@ -0,0 +1,115 @@
+"""
+Rounded stake plans for every opportunity in a run, vectorized with NumPy.
+
+For each bankroll B and rounding step s (whole dollars, $5, ...) we do what the web
+calculator's "Auto" mode does, for any number of legs:
+  - total T = B rounded to the step
+  - ideal stake per leg: T * (1/o_j) / sum(1/o)       (equal payout on every outcome)
+  - each leg is rounded down or up to the step; of the floor/ceil combinations that
+    still add up to T, keep the one with the best guaranteed profit
+    (min payout - T), then the most even payouts
+All rows with the same number of legs are solved together as one array.
+"""
+import os
+from itertools import product
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from arb_engine import to_odds
+
+
+def _floats(env: str, default: str) -> List[float]:
+    return [float(x) for x in (os.getenv(env) or default).split(",") if x.strip()]
+
+
+STAKE_BANKROLLS = _floats("STAKE_BANKROLLS", "100,500,1000")
+STAKE_STEPS     = _floats("STAKE_STEPS", "1,5")
+
+
+def _num(x: float) -> Any:
+    return int(x) if float(x).is_integer() else x
+
+
+def leg_odds(item: Dict[str, Any]) -> Optional[List[float]]:
+    """The odds we'd bet at: the verified best legs, else the MultiBet prices in `match`."""
+    if item.get("legs"):
+        odds = [to_odds(l.get("odds")) for l in item["legs"]]
+    else:
+        try:
+            odds = [float(part.split(" - ")[1]) for part in (item.get("match") or "").split(" | ")]
+        except (IndexError, ValueError):
+            return None
+    return odds if len(odds) >= 2 and all(o > 1 for o in odds) else None
+
+
+def plan_stakes(odds: np.ndarray, bankroll: float, step: float) -> Dict[str, np.ndarray]:
+    """
+    odds: (rows, legs) decimal odds. Returns per row the rounded stakes (rows, legs),
+    total, guaranteed payout and profit.
+    """
+    rows, legs = odds.shape
+    total = np.round(bankroll / step) * step
+    inv = 1.0 / odds
+    ideal = total * inv / inv.sum(axis=1, keepdims=True)
+    lo = np.floor(ideal / step + 1e-9) * step
+    hi = np.maximum(np.ceil(ideal / step - 1e-9) * step, lo)
+
+    combos = np.array(list(product((False, True), repeat=legs)))                       # (combos, legs)
+    stakes = np.where(combos[None, :, :], hi[:, None, :], lo[:, None, :])              # (rows, combos, legs)
+    spent = stakes.sum(axis=2)
+    payouts = stakes * odds[:, None, :]
+    worst = payouts.min(axis=2)
+    profit = worst - spent
+    spread = payouts.max(axis=2) - worst
+    # combos that don't add up to T never win; profit first, then even payouts
+    score = np.where(np.isclose(spent, total), profit * 1e9 - spread, -np.inf)
+    pick = score.argmax(axis=1)
+
+    at = np.arange(rows)
+    return {"stakes": stakes[at, pick], "total": spent[at, pick],
+            "payout": worst[at, pick], "profit": profit[at, pick]}
+
+
+def add_stake_plans(items: List[Dict[str, Any]],
+                    bankrolls: Sequence[float] = STAKE_BANKROLLS,
+                    steps: Sequence[float] = STAKE_STEPS) -> int:
+    """
+    Write item["stakes"] (one plan per bankroll x step) and item["roi_rounded"] (the
+    first bankroll at the coarsest step: what's left of the ROI once stakes are rounded).
+    Returns how many items got plans.
+    """
+    by_legs: Dict[int, List[int]] = {}
+    odds_of: Dict[int, List[float]] = {}
+    for i, it in enumerate(items):
+        odds = leg_odds(it)
+        if odds is None:
+            it.pop("stakes", None)
+            it.pop("roi_rounded", None)
+            continue
+        odds_of[i] = odds
+        by_legs.setdefault(len(odds), []).append(i)
+
+    plans: Dict[int, List[Dict[str, Any]]] = {i: [] for i in odds_of}
+    for idx in by_legs.values():
+        odds = np.array([odds_of[i] for i in idx])
+        for bankroll in bankrolls:
+            for step in steps:
+                p = plan_stakes(odds, bankroll, step)
+                for r, i in enumerate(idx):
+                    total = float(p["total"][r])
+                    profit = float(p["profit"][r])
+                    plans[i].append({
+                        "bankroll": _num(bankroll),
+                        "step": _num(step),
+                        "stakes": [round(float(s), 2) for s in p["stakes"][r]],
+                        "payout": round(float(p["payout"][r]), 2),
+                        "profit": round(profit, 2),
+                        "roi": round(profit / total, 6) if total > 0 else 0.0,
+                    })
+
+    rank = (_num(bankrolls[0]), _num(max(steps))) if bankrolls and steps else None
+    for i, item_plans in plans.items():
+        items[i]["stakes"] = item_plans
+        items[i]["roi_rounded"] = next((p["roi"] for p in item_plans if (p["bankroll"], p["step"]) == rank), None)
+    return len(plans)
@@ -0,0 +1,54 @@
+"""
+Output files that readers can pick up while a run is still going.
+
+  NdjsonStream   one opportunity per line; start() replaces the file for a new run,
+                 append() adds each competition's verified rows as soon as they're ready,
+                 finalize() swaps in the complete, sorted set at the end
+  write_json_atomic   write-to-temp + rename, so a reader never sees a half-written snapshot
+
+Appends are a single write per competition; a reader tailing the file should still skip
+a last line that doesn't parse (it may be mid-write).
+"""
+import os
+import json
+from typing import Any, Dict, Iterable
+
+
+def _atomic_write(path: str, text: str) -> None:
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp, path)
+
+
+def write_json_atomic(path: str, payload: Any) -> None:
+    _atomic_write(path, json.dumps(payload, ensure_ascii=False))
+
+
+def _lines(items: Iterable[Dict[str, Any]]) -> str:
+    return "".join(json.dumps(it, ensure_ascii=False) + "\n" for it in items)
+
+
+class NdjsonStream:
+    def __init__(self, path: str):
+        self.path = path
+        self.rows = 0
+
+    def start(self, items: Iterable[Dict[str, Any]] = ()) -> None:
+        """A fresh file for this run, holding `items` (e.g. rows carried over from the last one)."""
+        items = list(items)
+        _atomic_write(self.path, _lines(items))
+        self.rows = len(items)
+
+    def append(self, items: Iterable[Dict[str, Any]]) -> None:
+        items = list(items)
+        if not items:
+            return
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(_lines(items))
+        self.rows += len(items)
+
+    def finalize(self, items: Iterable[Dict[str, Any]]) -> None:
+        """Replace the streamed rows with the run's final (sorted, de-duplicated) set."""
+        self.start(items)
@@ -0,0 +1,163 @@
+"""
+Async notification delivery for notify.py.
+
+  - every hit is a text block; blocks are packed into as few messages as each
+    platform allows (Telegram 4096 chars, Discord 2000)
+  - one pooled requests.Session; each channel posts its messages in order, spaced
+    to the platform's rate limit, and all channels deliver concurrently
+  - 429s wait out retry_after; connection errors and 5xx retry with exponential backoff
+  - API base URLs come from the environment, so a local stub server can stand in
+"""
+import abc, asyncio, os, random, time
+from typing import Dict, List, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+TELEGRAM_API_BASE = os.environ.get("TELEGRAM_API_BASE", "https://api.telegram.org").rstrip("/")
+MAX_ATTEMPTS = int(os.environ.get("NOTIFY_MAX_ATTEMPTS", "5"))
+BACKOFF_SECS = float(os.environ.get("NOTIFY_BACKOFF_SECS", "0.5"))
+TIMEOUT_SECS = float(os.environ.get("NOTIFY_TIMEOUT_SECS", "10"))
+
+
+def chunk_messages(header: str, blocks: List[str], limit: int) -> List[str]:
+    """Pack blocks (separated by blank lines) under `header` into messages of at most `limit` chars."""
+    msgs: List[str] = []
+    cur = header
+    for b in blocks:
+        if len(b) > limit - len(header) - 2:
+            b = b[: max(0, limit - len(header) - 3)] + "…"
+        if len(cur) + 2 + len(b) > limit:
+            msgs.append(cur)
+            cur = header
+        cur = cur + "\n\n" + b
+    if cur != header or not msgs:
+        msgs.append(cur)
+    return msgs
+
+
+class Channel(abc.ABC):
+    name = "channel"
+    limit = 2000
+    min_interval = 0.0  # seconds between posts to this channel
+
+    @abc.abstractmethod
+    def post(self, session: requests.Session, text: str) -> requests.Response:
+        """Send one message; the response decides whether it is retried."""
+
+    def retry_after(self, resp: requests.Response) -> Optional[float]:
+        try:
+            body = resp.json()
+        except ValueError:
+            body = {}
+        v = body.get("retry_after") or (body.get("parameters") or {}).get("retry_after") or resp.headers.get("Retry-After")
+        try:
+            return float(v) if v is not None else None
+        except (TypeError, ValueError):
+            return None
+
+
+class Telegram(Channel):
+    name, limit, min_interval = "telegram", 4096, 1.0  # ~1 msg/s per chat
+
+    def __init__(self, token: str, chat_id: str):
+        self.url = f"{TELEGRAM_API_BASE}/bot{token}/sendMessage"
+        self.chat_id = chat_id
+
+    def post(self, session, text):
+        return session.post(self.url, data={"chat_id": self.chat_id, "text": text,
+                                            "disable_web_page_preview": "true"}, timeout=TIMEOUT_SECS)
+
+
+class Discord(Channel):
+    name, limit, min_interval = "discord", 2000, 0.4  # webhooks allow ~5 per 2s
+
+    def __init__(self, webhook_url: str):
+        self.url = webhook_url
+
+    def post(self, session, text):
+        return session.post(self.url, json={"content": text}, timeout=TIMEOUT_SECS)
+
+
+def channels_from_env() -> List[Channel]:
+    out: List[Channel] = []
+    tok, chat = os.environ.get("TELEGRAM_BOT_TOKEN"), os.environ.get("TELEGRAM_CHAT_ID")
+    if tok and chat:
+        out.append(Telegram(tok, chat))
+    if os.environ.get("DISCORD_WEBHOOK_URL"):
+        out.append(Discord(os.environ["DISCORD_WEBHOOK_URL"]))
+    return out
+
+
+def make_session(pool_size: int = 4) -> requests.Session:
+    s = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    s.mount("http://", adapter)
+    s.mount("https://", adapter)
+    return s
+
+
+async def _send_one(ch: Channel, session: requests.Session, text: str, stats: Dict) -> bool:
+    for attempt in range(1, MAX_ATTEMPTS + 1):
+        t0 = time.monotonic()
+        wait = None
+        try:
+            resp = await asyncio.to_thread(ch.post, session, text)
+            stats["latency"].append(time.monotonic() - t0)
+            if resp.status_code < 300:
+                return True
+            if resp.status_code == 429:
+                stats["rate_limited"] += 1
+                wait = ch.retry_after(resp)
+            elif resp.status_code < 500:
+                print(f"[notify] {ch.name}: HTTP {resp.status_code}, not retrying: {resp.text[:200]}")
+                return False
+            err = f"HTTP {resp.status_code}"
+        except requests.RequestException as e:
+            err = type(e).__name__
+        if attempt == MAX_ATTEMPTS:
+            print(f"[notify] {ch.name}: giving up after {attempt} attempts ({err})")
+            return False
+        stats["retries"] += 1
+        if wait is None:
+            wait = BACKOFF_SECS * 2 ** (attempt - 1) * (1 + random.random() * 0.25)
+        await asyncio.sleep(wait)
+    return False
+
+
+async def _deliver_channel(ch: Channel, session: requests.Session, header: str, blocks: List[str]) -> Dict:
+    stats = {"channel": ch.name, "messages": 0, "sent": 0, "retries": 0, "rate_limited": 0, "latency": []}
+    t0 = time.monotonic()
+    last = None
+    for text in chunk_messages(header, blocks, ch.limit):
+        if last is not None:
+            gap = ch.min_interval - (time.monotonic() - last)
+            if gap > 0:
+                await asyncio.sleep(gap)
+        stats["messages"] += 1
+        stats["sent"] += await _send_one(ch, session, text, stats)
+        last = time.monotonic()
+    stats["elapsed"] = time.monotonic() - t0
+    return stats
+
+
+async def _deliver(channels: List[Channel], header: str, blocks: List[str]) -> List[Dict]:
+    session = make_session(pool_size=max(2, len(channels) * 2))
+    try:
+        return await asyncio.gather(*(_deliver_channel(ch, session, header, blocks) for ch in channels))
+    finally:
+        session.close()
+
+
+def deliver(header: str, blocks: List[str], channels: Optional[List[Channel]] = None) -> List[Dict]:
+    """Send every block to every channel; prints and returns a per-channel report."""
+    channels = channels_from_env() if channels is None else channels
+    if not channels or not blocks:
+        return []
+    reports = asyncio.run(_deliver(channels, header, blocks))
+    for r in reports:
+        lat = sorted(r["latency"]) or [0.0]
+        print(f"[notify] {r['channel']}: {r['sent']}/{r['messages']} messages in {r['elapsed']:.2f}s "
+              f"(p50 {lat[len(lat) // 2] * 1000:.0f}ms, max {lat[-1] * 1000:.0f}ms, "
+              f"{r['retries']} retries, {r['rate_limited']} rate-limited)")
+    return reports
@@ -1,5 +1,8 @@
 #!/usr/bin/env python3
-import argparse, json, os, re, subprocess, sys
+import argparse, json, os, re, sys
+
+from deliver import deliver
+from seen_store import DEFAULT_TTL_DAYS, SeenStore
 
 def norm_agency(a: str) -> str:
     a = (a or "")
@@ -18,7 +21,10 @@ def load_json(path, default):
 def main():
     p = argparse.ArgumentParser()
     p.add_argument("--input", required=True, help="opportunities.json path")
-    p.add_argument("--seen", required=True, help="seen_keys.json path")
+    p.add_argument("--seen", required=True, help="seen-key store (SQLite) path")
+    p.add_argument("--seen-legacy", default=None, help="old seen_keys.json to import when the store is new")
+    p.add_argument("--seen-ttl-days", type=float, default=DEFAULT_TTL_DAYS,
+                   help="forget keys after this long even if their event has no date")
     p.add_argument("--roi-threshold-pct", type=float, default=float(os.environ.get("ROI_THRESHOLD_PCT","2.0")))
     p.add_argument("--notify-bookies", default=os.environ.get("NOTIFY_BOOKIES","sportsbet,bet365,neds,tab"))
     args = p.parse_args()
@@ -31,8 +37,17 @@ def main():
         cur = {"items": cur}
     items = cur.get("items", [])
 
-    seen = load_json(args.seen, [])
-    seen_set = set(seen if isinstance(seen, list) else [])
+    seen = SeenStore(args.seen, ttl_days=args.seen_ttl_days)
+    if seen.is_new and args.seen_legacy:
+        print(f"Imported {seen.import_legacy(args.seen_legacy)} live keys from {args.seen_legacy}")
+    expired = seen.purge()
+
+    def legs_of(it):
+        # every outcome's best price (three-way arbs have a draw leg); older items only have left/right
+        if it.get("legs"):
+            return it["legs"]
+        best = (it.get("book_table") or {}).get("best") or {}
+        return [best.get("left") or {}, best.get("right") or {}]
 
     def key(it):
         def n(x): return (x or "").strip().lower()
@@ -44,6 +59,9 @@ def main():
 
     new_hits = []
     for it in items:
+        if it.get("carried"):
+            # not re-checked this run (its comp wasn't due): the prices are as of it["scraped_at"]
+            continue
         try:
             roi = float(it.get("roi") or 0.0)
         except Exception:
@@ -51,25 +69,23 @@ def main():
         if roi < thresh:
             continue
 
-        best = (it.get("book_table") or {}).get("best") or {}
-        L = best.get("left")  or {}
-        R = best.get("right") or {}
-        if not (L.get("agency") and R.get("agency") and L.get("odds") and R.get("odds")):
+        legs = legs_of(it)
+        if not legs or not all(l.get("agency") and l.get("odds") for l in legs):
             continue
 
-        if norm_agency(L["agency"]) not in allow or norm_agency(R["agency"]) not in allow:
+        if any(norm_agency(l["agency"]) not in allow for l in legs):
             continue
 
         k = key(it)
-        if k in seen_set:
+        if seen.is_past(it.get("dateISO")) or k in seen:
             continue
 
         new_hits.append(it)
-        seen_set.add(k)
+        seen.add(k, it.get("dateISO"))
 
-    # write back seen
-    with open(args.seen, "w", encoding="utf-8") as f:
-        json.dump(sorted(list(seen_set)), f, ensure_ascii=False, indent=0)
+    # write back seen (only the new keys; expired ones were purged above)
+    print(f"Seen keys: {seen.count()} live, +{seen.added} new, -{expired} expired")
+    seen.close()
 
     if not new_hits:
         print("No new hits above threshold; nothing to notify.")
@@ -78,8 +94,6 @@ def main():
     new_hits.sort(key=lambda x: float(x.get('roi') or 0), reverse=True)
 
     def fmt(it):
-        best = it["book_table"]["best"]
-        L, R = best["left"], best["right"]
         sport = it.get("sport") or ""
         game  = it.get("game") or ""
         market= it.get("market") or ""
@@ -89,33 +103,16 @@ def main():
         line1 = f"⚡ {sport}"
         line2 = f"{game} — {market}"
         line3 = f"{match}"
-        line4 = f"{L['agency']} @ {float(L['odds']):.2f}  |  {R['agency']} @ {float(R['odds']):.2f}"
+        line4 = "  |  ".join(f"{l['agency']} @ {float(l['odds']):.2f}" for l in legs_of(it))
         line5 = f"ROI: {roi_pct}  |  {date}"
         return "\n".join([line1, line2, line3, line4, line5])
 
-    msg = "New arbs over threshold (" + str(args.roi_threshold_pct) + "%)\n\n" + "\n\n".join(fmt(it) for it in new_hits[:8])
-    print(msg)
-
-    # Telegram
-    tok = os.environ.get("TELEGRAM_BOT_TOKEN")
-    chat= os.environ.get("TELEGRAM_CHAT_ID")
-    if tok and chat:
-        api = f"https://api.telegram.org/bot{tok}/sendMessage"
-        subprocess.run([
-            "curl","-fsS","-X","POST",api,
-            "-d", f"chat_id={chat}",
-            "--data-urlencode","disable_web_page_preview=true",
-            "--data-urlencode", f"text={msg}"
-        ], check=False)
-
-    # Discord
-    wh = os.environ.get("DISCORD_WEBHOOK_URL")
-    if wh:
-        payload = json.dumps({"content": msg})
-        subprocess.run([
-            "curl","-fsS","-H","Content-Type: application/json",
-            "-d", payload, wh
-        ], check=False)
+    header = "New arbs over threshold (" + str(args.roi_threshold_pct) + "%)"
+    blocks = [fmt(it) for it in new_hits]
+    print(header + "\n\n" + "\n\n".join(blocks))
+
+    # Telegram + Discord, concurrently, every hit (chunked to each platform's size limit)
+    deliver(header, blocks)
 
     return 0
 
@@ -267,22 +267,24 @@ function parseHeaderCell(cell = "") {
   return { side, line };
 }
 
-function buildLegsFromBookTable(item) {
+// The bet's legs as [{ name, agency, odds }]: the scraper's verified legs (2-, 3- or N-way),
+// else best.left / best.right with headers[1] / headers[2] for older two-way rows.
+function itemLegs(item) {
   const bt = item?.book_table;
+  if (Array.isArray(item?.legs) && item.legs.length >= 2) return item.legs;
   if (!bt?.best || !Array.isArray(bt?.headers)) return null;
 
   // headers: ["Agency", "Over 3.50", "Under 3.50", "Updated"]
   // left column corresponds to headers[1], right column to headers[2]
-  const leftHeader = bt.headers[1] ?? "";
-  const rightHeader = bt.headers[2] ?? "";
-
-  const left = parseHeaderCell(leftHeader);
-  const right = parseHeaderCell(rightHeader);
-
-  const bestLeft = bt.best.left;   // {agency, odds}
-  const bestRight = bt.best.right; // {agency, odds}
+  return [
+    { name: bt.headers[1] ?? "", ...bt.best.left },   // {agency, odds}
+    { name: bt.headers[2] ?? "", ...bt.best.right },
+  ];
+}
 
-  if (!bestLeft?.agency || !bestRight?.agency) return null;
+function buildLegsFromBookTable(item) {
+  const legs = itemLegs(item);
+  if (!legs || !legs.every((l) => l?.agency)) return null;
 
   // For consistency with your design, prepend "+" if line is numeric-like and missing sign
   const normalizeLine = (ln) => {
@@ -294,22 +296,16 @@ function buildLegsFromBookTable(item) {
     return s;
   };
 
-  return [
-    {
-      side: left.side,
-      line: normalizeLine(left.line),
-      odds: Number(bestLeft.odds),
-      bookie: bestLeft.agency,
-      bookieKey: normalizeBookieKey(bestLeft.agency),
-    },
-    {
-      side: right.side,
-      line: normalizeLine(right.line),
-      odds: Number(bestRight.odds),
-      bookie: bestRight.agency,
-      bookieKey: normalizeBookieKey(bestRight.agency),
-    },
-  ];
+  return legs.map((l) => {
+    const { side, line } = parseHeaderCell(l.name);
+    return {
+      side,
+      line: normalizeLine(line),
+      odds: Number(l.odds),
+      bookie: l.agency,
+      bookieKey: normalizeBookieKey(l.agency),
+    };
+  });
 }
 
 function loadLeagueMap(activeCompIdsPath) {
@@ -334,9 +330,7 @@ function dedupeKeyFromItem(item, league) {
   const comp = String(item?.competitionid ?? "");
   const game = item?.game ?? "";
   const market = item?.market ?? "";
-  const headers = item?.book_table?.headers ?? [];
-  const h1 = headers[1] ?? "";
-  const h2 = headers[2] ?? "";
+  const names = (itemLegs(item) ?? []).map((l) => l?.name ?? "");
 
   return [
     String(sport).trim().toLowerCase(),
@@ -344,8 +338,7 @@ function dedupeKeyFromItem(item, league) {
     comp.trim(),
     String(game).trim().toLowerCase(),
     String(market).trim().toLowerCase(),
-    String(h1).trim().toLowerCase(),
-    String(h2).trim().toLowerCase(),
+    ...names.map((n) => String(n).trim().toLowerCase()),
   ].join("|");
 }
 
@@ -407,9 +400,10 @@ async function main() {
 
     const legs = buildLegsFromBookTable(item);
     if (!legs) continue;
+    // the post card and its example stakes are two-leg only: don't post half of a 3-way arb
+    if (legs.length !== 2) continue;
 
-    const headers = item?.book_table?.headers ?? [];
-    const left = parseHeaderCell(headers[1] ?? "");
+    const left = parseHeaderCell(itemLegs(item)[0]?.name ?? "");
     const lineDisplay = left?.line ? String(left.line).trim() : "";
 
     const key = dedupeKeyFromItem(item, league);
@@ -0,0 +1,98 @@
+"""
+Seen-key store for notify.py: SQLite, one row per notified arb.
+
+Rows hold a 12-byte hash of the key plus an expiry. A key expires a day after its
+event's dateISO (the event is over, nothing can re-notify), or after the TTL when
+the item has no date. Each run purges expired rows and inserts only the new keys;
+it VACUUMs only when the purge freed something, so the file stays the size of the
+live set without rewriting it on every run.
+"""
+import hashlib, json, os, re, sqlite3, time
+from datetime import datetime, timezone
+from typing import Optional
+
+DEFAULT_TTL_DAYS = float(os.environ.get("SEEN_TTL_DAYS", "14"))
+DATE_GRACE_SECS = 86400  # dateISO has no time or zone; keep keys a day past it
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS seen (
+    key_hash   BLOB PRIMARY KEY,
+    expires_at INTEGER NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS seen_expires ON seen (expires_at);
+"""
+
+_DATE_RE = re.compile(r"(\d{4}-\d{2}-\d{2})$")
+
+
+def key_hash(key: str) -> bytes:
+    return hashlib.blake2b(key.encode("utf-8"), digest_size=12).digest()
+
+
+def expiry_for(date_iso: Optional[str], now: float, ttl_days: float = DEFAULT_TTL_DAYS) -> int:
+    """End of the event's day (+ grace) when we know it, else now + TTL; never later than now + TTL."""
+    ttl_end = now + ttl_days * 86400
+    if date_iso:
+        try:
+            day = datetime.strptime(date_iso[:10], "%Y-%m-%d").replace(tzinfo=timezone.utc)
+            return int(min(ttl_end, day.timestamp() + 86400 + DATE_GRACE_SECS))
+        except ValueError:
+            pass
+    return int(ttl_end)
+
+
+class SeenStore:
+    def __init__(self, path: str, ttl_days: float = DEFAULT_TTL_DAYS, now: Optional[float] = None):
+        self.path = path
+        self.ttl_days = ttl_days
+        self.now = time.time() if now is None else now
+        self.is_new = not os.path.exists(path)
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript(SCHEMA)
+        self.added = 0
+        self.purged = 0
+
+    def purge(self) -> int:
+        cur = self.conn.execute("DELETE FROM seen WHERE expires_at <= ?", (int(self.now),))
+        self.purged += cur.rowcount
+        return cur.rowcount
+
+    def __contains__(self, key: str) -> bool:
+        return self.conn.execute("SELECT 1 FROM seen WHERE key_hash = ?", (key_hash(key),)).fetchone() is not None
+
+    def is_past(self, date_iso: Optional[str]) -> bool:
+        """The event's key would already be expired: it's over, don't notify (or re-notify) it."""
+        return expiry_for(date_iso, self.now, self.ttl_days) <= self.now
+
+    def add(self, key: str, date_iso: Optional[str] = None) -> None:
+        self.conn.execute(
+            "INSERT OR REPLACE INTO seen (key_hash, expires_at) VALUES (?, ?)",
+            (key_hash(key), expiry_for(date_iso, self.now, self.ttl_days)),
+        )
+        self.added += 1
+
+    def import_legacy(self, json_path: str) -> int:
+        """Load an old seen_keys.json list; dateISO is the last '|' field of those keys."""
+        try:
+            with open(json_path, "r", encoding="utf-8") as f:
+                keys = json.load(f)
+        except Exception:
+            return 0
+        rows = []
+        for k in keys if isinstance(keys, list) else []:
+            m = _DATE_RE.search(str(k))
+            exp = expiry_for(m.group(1) if m else None, self.now, self.ttl_days)
+            if exp > self.now:
+                rows.append((key_hash(str(k)), exp))
+        self.conn.executemany("INSERT OR IGNORE INTO seen (key_hash, expires_at) VALUES (?, ?)", rows)
+        return len(rows)
+
+    def count(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM seen").fetchone()[0]
+
+    def close(self) -> None:
+        self.conn.commit()
+        if self.purged:
+            self.conn.execute("VACUUM")
+        self.conn.close()
+
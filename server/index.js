@@ -8,6 +8,7 @@ import helmet from 'helmet';
 import morgan from 'morgan';
 import { fileURLToPath } from 'url';
 import 'dotenv/config';
+import { makeOpportunitiesRoute, resolveLeagueMap } from './opportunities.js';
 
 // --- GitHub Actions trigger config ---
 const GH_OWNER = process.env.GH_OWNER || "gschubert05";
@@ -30,6 +31,14 @@ async function ensureSchema() {
       data        JSONB NOT NULL,
       scraped_at  TIMESTAMPTZ DEFAULT now()
     );
+    -- stable per-opportunity key so the scraper can upsert instead of delete + reinsert
+    ALTER TABLE opportunities ADD COLUMN IF NOT EXISTS opp_key TEXT;
+    CREATE UNIQUE INDEX IF NOT EXISTS opportunities_opp_key_idx ON opportunities (opp_key);
+    -- when the scraper last finished a run (written by its end-of-run sync)
+    CREATE TABLE IF NOT EXISTS scrape_status (
+      id            SMALLINT PRIMARY KEY DEFAULT 1 CHECK (id = 1),
+      last_updated  TIMESTAMPTZ NOT NULL
+    );
   `;
   try {
     await pool.query(sql);
@@ -104,198 +113,6 @@ async function fetchWithRetry(url, { attempts = 3, timeoutMs = 5000 } = {}) {
   throw lastErr;
 }
 
-// --- helpers ---
-function toStrId(x) { return String(x ?? '').trim(); }
-
-// Very tolerant mapper: accepts several shapes and tries to build { compid -> leagueName }
-function resolveLeagueMap(json) {
-  if (!json || typeof json !== 'object') return {};
-
-  // 1) { leagues_by_compid: { "15": "NFL", ... } }
-  if (json.leagues_by_compid && typeof json.leagues_by_compid === 'object') {
-    return json.leagues_by_compid;
-  }
-
-  // 2) top-level object of id->name
-  if (!Array.isArray(json)) {
-    const vals = Object.values(json);
-    if (vals.length && vals.every(v => typeof v === 'string')) return json;
-  }
-
-  const out = {};
-
-  // 3) arrays of objects: items/competitions/active/rows etc.
-  const candidates = [
-    json.items, json.competitions, json.active, json.rows, json.data, json.list, json.leagues
-  ].filter(Array.isArray);
-
-  // also allow the json *itself* to be an array
-  if (Array.isArray(json)) candidates.push(json);
-
-  for (const arr of candidates) {
-    for (const r of arr) {
-      if (!r || typeof r !== 'object') continue;
-      const id = toStrId(r.competitionid ?? r.competitionId ?? r.id ?? r.compid ?? r.cid);
-      const name = r.league ?? r.name ?? r.league_name ?? r.title ?? '';
-      if (id && name) out[id] = name;
-    }
-  }
-
-  // 4) arrays like [["15","NFL"],["16","NBA"]] or [[15,"NFL"],...]
-  const pairish = candidates.find(a =>
-    Array.isArray(a) && a.length && Array.isArray(a[0]) && a[0].length >= 2
-  );
-  if (pairish) {
-    for (const row of pairish) {
-      const id = toStrId(row[0]);
-      const name = row[1];
-      if (id && typeof name === 'string' && name) out[id] = name;
-    }
-  }
-
-  return out;
-}
-
-function cleanAgency(name) {
-  if (!name) return '';
-  let out = String(name).split('(')[0];
-  out = out.split('-')[0];
-  return out.trim();
-}
-
-function getAestYearMonth() {
-  // AEST (Brisbane) year + month index (0-11)
-  const parts = new Intl.DateTimeFormat("en-AU", {
-    timeZone: "Australia/Brisbane",
-    year: "numeric",
-    month: "2-digit",
-  }).formatToParts(new Date());
-
-  const get = (t) => parts.find(p => p.type === t)?.value ?? "";
-  return {
-    year: Number(get("year")),
-    month: Number(get("month")) - 1,
-  };
-}
-
-function isLiveishDate(dstr) {
-  if (typeof dstr !== 'string') return false;
-  const s = dstr.toLowerCase();
-  // website uses these when game is about to start / underway
-  return /\bto go\b/.test(s) || /\bago\b/.test(s);
-}
-
-function requiredLeftOdds(bestRight) {
-  const br = Number(bestRight);
-  if (!(br > 1)) return Infinity;
-  return 1 / (1 - 1 / br);
-}
-function requiredRightOdds(bestLeft) {
-  const bl = Number(bestLeft);
-  if (!(bl > 1)) return Infinity;
-  return 1 / (1 - 1 / bl);
-}
-
-function shouldDropBet365Glitch(it) {
-  const rows = it?.book_table?.rows || [];
-  if (!rows.length) return false;
-
-  const bestLAgency = cleanAgency(it?.book_table?.best?.left?.agency || '').toLowerCase();
-  const bestRAgency = cleanAgency(it?.book_table?.best?.right?.agency || '').toLowerCase();
-
-  // Only care when bet365 is actually the best on a side
-  const betIsBestLeft  = bestLAgency === 'bet365';
-  const betIsBestRight = bestRAgency === 'bet365';
-  if (!betIsBestLeft && !betIsBestRight) return false;
-
-  // Count unique agencies in table
-  const agencies = rows
-    .map(r => cleanAgency(r?.agency || '').toLowerCase())
-    .filter(Boolean);
-  const uniq = new Set(agencies);
-  const n = uniq.size;
-
-  // Your explicit rule: if only 2 bookies showing odds, ignore it
-  if (n <= 2) return true;
-
-  const bestLeftOdds  = Number(it?.book_table?.best?.left?.odds);
-  const bestRightOdds = Number(it?.book_table?.best?.right?.odds);
-  if (!(bestLeftOdds > 1 && bestRightOdds > 1)) return false;
-
-  const needL = requiredLeftOdds(bestRightOdds);
-  const needR = requiredRightOdds(bestLeftOdds);
-
-  const leftProfitable  = new Set();
-  const rightProfitable = new Set();
-
-  for (const r of rows) {
-    const a = cleanAgency(r?.agency || '').toLowerCase();
-    if (!a) continue;
-
-    const lo = Number(r?.left);
-    const ro = Number(r?.right);
-
-    if (lo >= needL) leftProfitable.add(a);
-    if (ro >= needR) rightProfitable.add(a);
-  }
-
-  const halfOrMore = Math.ceil(n / 2);
-
-  // If bet365 is the ONLY profitable bookie on its side,
-  // and half+ of bookies are profitable on the other side, drop it.
-  if (betIsBestLeft) {
-    const onlyBet365OnLeft = leftProfitable.size === 1 && leftProfitable.has('bet365');
-    if (onlyBet365OnLeft && rightProfitable.size >= halfOrMore) return true;
-  }
-
-  if (betIsBestRight) {
-    const onlyBet365OnRight = rightProfitable.size === 1 && rightProfitable.has('bet365');
-    if (onlyBet365OnRight && leftProfitable.size >= halfOrMore) return true;
-  }
-
-  return false;
-}
-
-const MONTHS = { jan:0,feb:1,mar:2,apr:3,may:4,jun:5,jul:6,aug:7,sep:8,oct:9,nov:10,dec:11 };
-function coerceISO(dstr) {
-  if (typeof dstr !== 'string') return null;
-  const m = dstr.match(/^\w{3}\s+(\d{1,2})\s+([A-Za-z]{3})\s+(\d{1,2}):(\d{2})/);
-  if (!m) return null;
-
-  const day = parseInt(m[1], 10);
-  const mon = MONTHS[m[2].toLowerCase()];
-  if (mon == null) return null;
-
-  // ✅ only change: choose year using AEST month rule
-  const nowAest = getAestYearMonth();
-  const year = (mon < nowAest.month) ? (nowAest.year + 1) : nowAest.year;
-
-  const d = new Date(Date.UTC(year, mon, day, 0, 0, 0));
-  const yyyy = d.getUTCFullYear();
-  const mm = String(d.getUTCMonth() + 1).padStart(2, '0');
-  const dd = String(d.getUTCDate()).padStart(2, '0');
-  return `${yyyy}-${mm}-${dd}`;
-}
-
-function coerceKickoffISO(dstr) {
-  if (typeof dstr !== 'string') return null;
-  const m = dstr.match(/^\w{3}\s+(\d{1,2})\s+([A-Za-z]{3})\s+(\d{1,2}):(\d{2})/);
-  if (!m) return null;
-
-  const day = parseInt(m[1], 10);
-  const mon = MONTHS[m[2].toLowerCase()];
-  const hh = parseInt(m[3], 10);
-  const mi = parseInt(m[4], 10);
-  if (mon == null) return null;
-
-  // ✅ only change: choose year using AEST month rule
-  const nowAest = getAestYearMonth();
-  const year = (mon < nowAest.month) ? (nowAest.year + 1) : nowAest.year;
-
-  const d = new Date(Date.UTC(year, mon, day, hh, mi, 0));
-  return d.toISOString(); // unchanged (still Z, same as before)
-}
-
 // --- loaders (URL-or-local, with cache & fallback) ---
 async function loadData() {
   if (!DATA_URL) {
@@ -410,191 +227,8 @@ async function debugLeagues(req, res) {
 app.get('/api/_debug/leagues', debugLeagues);
 app.get('/api/_debug_leagues', debugLeagues); // your earlier path
 
-// --- API: opportunities ---
-app.get('/api/opportunities', async (req, res) => {
-  // 1) Load items from Postgres
-  let items = [];
-  let lastUpdated = null;
-
-  try {
-    const result = await pool.query('SELECT data, scraped_at FROM opportunities');
-    items = result.rows.map(r => r.data);
-
-    if (result.rows.length > 0) {
-      const latest = result.rows.reduce((max, r) => {
-        const t = r.scraped_at ? new Date(r.scraped_at).getTime() : 0;
-        return t > max ? t : max;
-      }, 0);
-      if (latest > 0) {
-        lastUpdated = new Date(latest).toISOString();
-      }
-    }
-  } catch (e) {
-    console.error('DB error loading opportunities', e);
-    return res.json({
-      ok: false,
-      lastUpdated: null,
-      total: 0,
-      page: 1,
-      pages: 1,
-      sports: [],
-      competitionIds: [],
-      leagues: [],
-      agencies: [],
-      items: []
-    });
-  }
-
-  // 2) Load active leagues (same as before)
-  const active = await loadActive();
-  const leagueMap = resolveLeagueMap(active);
-
-  const {
-    sports = '',
-    sport = '',
-    competitionIds = '',
-    competitionId = '',
-    leagues = '',
-    dateFrom = '',
-    dateTo = '',
-    minRoi = '0',
-    sortBy = 'roi',
-    sortDir = 'desc',
-    page = '1',
-    pageSize = '50',
-    bookies = '',
-  } = req.query;
-
-  for (const it of items) {
-    if (!it.dateISO && it.date) {
-      const iso = coerceISO(it.date);
-      if (iso) it.dateISO = iso;
-    }
-    if (!it.kickoff && it.date) {
-      const k = coerceKickoffISO(it.date);
-      if (k) it.kickoff = k;
-    }
-  }
-
-  const mRoi = Number(minRoi) || 0;
-  const p = Math.max(1, Number(page) || 1);
-  const ps = Math.min(500, Math.max(1, Number(pageSize) || 50));
-
-  const toLowerSet = (csv) =>
-    new Set(String(csv || '').split(',').map(s => s.trim()).filter(Boolean).map(s => s.toLowerCase()));
-  const toIdSet = (csv) => new Set(String(csv || '').split(',').map(s => s.trim()).filter(Boolean));
-
-  const sportSet  = (sports ? toLowerSet(sports) : toLowerSet(sport));
-  const compSet   = (competitionIds ? toIdSet(competitionIds) : toIdSet(competitionId));
-  const bookSet   = toLowerSet(bookies);
-  const leagueSet = new Set(String(leagues || '').split(',').map(s => s.trim()).filter(Boolean));
-
-  const clean = (s) => (s || '').trim().toLowerCase();
-
-  let base = (items || []).filter((it) => {
-    const rows = it.book_table?.rows || [];
-    const bestL = clean(it.book_table?.best?.left?.agency || '');
-    const bestR = clean(it.book_table?.best?.right?.agency || '');
-    const anyBookmaker = bestL === 'bookmaker' || bestR === 'bookmaker' || rows.some(r => clean(r?.agency) === 'bookmaker');
-    if (anyBookmaker) return false;
-
-    // drop "to go" / "ago" timestamps (in-play / near start)
-    if (isLiveishDate(it.date)) return false;
-
-    // drop suspected bet365 glitch arbs
-    if (shouldDropBet365Glitch(it)) return false;
-
-    const L = it.book_table?.best?.left?.odds;
-    const R = it.book_table?.best?.right?.odds;
-    if (Number.isFinite(L) && Number.isFinite(R) && L > 0 && R > 0) {
-      const mktPct = (1 / L + 1 / R) * 100;
-      if (!Number.isFinite(mktPct) || mktPct >= 100) return false;
-      it.market_percentage = Math.round(mktPct * 100) / 100;
-      it.roi = Math.round(((1 / (mktPct / 100)) - 1) * 1e6) / 1e6;
-    }
-    return true;
-  });
-
-  // attach league
-  for (const it of base) {
-    const compId = toStrId(it.competitionid ?? it.competitionId ?? '');
-    it.league = leagueMap[compId] || null;
-  }
-
-  let filtered = base.filter(it => {
-    const roiOk = (Number(it.roi) || 0) >= mRoi / 100;
-    const s = (it.sport || '').toLowerCase();
-    const sportOk = sportSet.size === 0 || sportSet.has(s);
-    const cid = toStrId(it.competitionid ?? it.competitionId ?? '');
-    const compOk = compSet.size === 0 || compSet.has(cid);
-    const dfOk = !dateFrom || (it.dateISO && it.dateISO >= dateFrom);
-    const dtOk = !dateTo || (it.dateISO && it.dateISO <= dateTo);
-
-    let bookOk = true;
-    if (bookSet.size > 0) {
-      const leftA = cleanAgency(it.book_table?.best?.left?.agency || '').toLowerCase();
-      const rightA = cleanAgency(it.book_table?.best?.right?.agency || '').toLowerCase();
-      bookOk = !!(leftA && rightA && bookSet.has(leftA) && bookSet.has(rightA));
-    }
-
-    const leagueOk = leagueSet.size === 0 ? true : (it.league && leagueSet.has(it.league));
-    return roiOk && sportOk && compOk && dfOk && dtOk && bookOk && leagueOk;
-  });
-
-  const dir = sortDir === 'asc' ? 1 : -1;
-  const key = (a) => {
-    switch (sortBy) {
-      case 'dateISO': return a.dateISO || '';
-      case 'kickoff': return a.kickoff || '';
-      case 'sport':   return (a.sport || '').toLowerCase();
-      case 'league':  return (a.league || '').toLowerCase();
-      case 'roi':
-      default:        return Number(a.roi) || 0;
-    }
-  };
-  filtered.sort((a, b) => (key(a) > key(b) ? 1 : key(a) < key(b) ? -1 : 0) * dir);
-
-  const total = filtered.length;
-  const pages = Math.max(1, Math.ceil(total / ps));
-  const start = (p - 1) * ps;
-  const pageItems = filtered.slice(start, start + ps);
-
-  const sportsList = [...new Set(base.map(i => i.sport).filter(Boolean))].sort((a,b)=>(a||'').localeCompare(b||''));
-  const competitionIdsList = [...new Set(base.map(i => i.competitionid || i.competitionId).filter(Boolean))].sort((a,b)=>Number(a)-Number(b));
-  const leaguesList = [...new Set(base.map(i => i.league).filter(Boolean))].sort((a,b)=>a.localeCompare(b));
-
-  const agenciesSet = new Set();
-
-  for (const it of base) {
-    // 1) Add ALL agencies present in the odds table rows (this is the key fix)
-    const rows = it.book_table?.rows || [];
-    for (const row of rows) {
-      const a = cleanAgency(row?.agency || '');
-      if (a) agenciesSet.add(a);
-    }
-
-    // 2) Also keep the best sides (harmless redundancy)
-    const l = cleanAgency(it.book_table?.best?.left?.agency || '');
-    const r = cleanAgency(it.book_table?.best?.right?.agency || '');
-    if (l) agenciesSet.add(l);
-    if (r) agenciesSet.add(r);
-  }
-
-  const agencies = [...agenciesSet].sort((a,b)=>a.localeCompare(b));
-
-  res.json({
-    ok: true,
-    lastUpdated,
-    total,
-    page: p,
-    pages,
-    sports: sportsList,
-    competitionIds: competitionIdsList, // still available if you want to use IDs
-    leagues: leaguesList,               // names (what app.js uses)
-    agencies,
-    items: pageItems
-  });
-});
+// --- API: opportunities (see opportunities.js) ---
+app.get('/api/opportunities', makeOpportunitiesRoute({ pool, loadActive }));
 
 // --- API: trigger GitHub Actions scrape ---
 app.post('/api/trigger-scrape', express.json(), async (req, res) => {
@@ -13,6 +13,14 @@ async function main() {
       data        JSONB NOT NULL,
       scraped_at  TIMESTAMPTZ DEFAULT now()
     );
+    -- stable per-opportunity key so the scraper can upsert instead of delete + reinsert
+    ALTER TABLE opportunities ADD COLUMN IF NOT EXISTS opp_key TEXT;
+    CREATE UNIQUE INDEX IF NOT EXISTS opportunities_opp_key_idx ON opportunities (opp_key);
+    -- when the scraper last finished a run (written by its end-of-run sync)
+    CREATE TABLE IF NOT EXISTS scrape_status (
+      id            SMALLINT PRIMARY KEY DEFAULT 1 CHECK (id = 1),
+      last_updated  TIMESTAMPTZ NOT NULL
+    );
   `;
   console.log('Creating opportunities table if not exists...');
   await pool.query(sql);
@@ -0,0 +1,398 @@
+// server/opportunities.js
+// The /api/opportunities handler and its helpers. No dependencies beyond Node, so the route
+// can be exercised with a stub pool instead of Postgres (see test/opportunities.test.mjs).
+//
+// An opportunity is priced on its legs: item.legs from the scraper (2-, 3- or N-way),
+// else book_table.best.left/right for older two-way rows.
+
+// --- helpers ---
+export function toStrId(x) { return String(x ?? '').trim(); }
+
+// Very tolerant mapper: accepts several shapes and tries to build { compid -> leagueName }
+export function resolveLeagueMap(json) {
+  if (!json || typeof json !== 'object') return {};
+
+  // 1) { leagues_by_compid: { "15": "NFL", ... } }
+  if (json.leagues_by_compid && typeof json.leagues_by_compid === 'object') {
+    return json.leagues_by_compid;
+  }
+
+  // 2) top-level object of id->name
+  if (!Array.isArray(json)) {
+    const vals = Object.values(json);
+    if (vals.length && vals.every(v => typeof v === 'string')) return json;
+  }
+
+  const out = {};
+
+  // 3) arrays of objects: items/competitions/active/rows etc.
+  const candidates = [
+    json.items, json.competitions, json.active, json.rows, json.data, json.list, json.leagues
+  ].filter(Array.isArray);
+
+  // also allow the json *itself* to be an array
+  if (Array.isArray(json)) candidates.push(json);
+
+  for (const arr of candidates) {
+    for (const r of arr) {
+      if (!r || typeof r !== 'object') continue;
+      const id = toStrId(r.competitionid ?? r.competitionId ?? r.id ?? r.compid ?? r.cid);
+      const name = r.league ?? r.name ?? r.league_name ?? r.title ?? '';
+      if (id && name) out[id] = name;
+    }
+  }
+
+  // 4) arrays like [["15","NFL"],["16","NBA"]] or [[15,"NFL"],...]
+  const pairish = candidates.find(a =>
+    Array.isArray(a) && a.length && Array.isArray(a[0]) && a[0].length >= 2
+  );
+  if (pairish) {
+    for (const row of pairish) {
+      const id = toStrId(row[0]);
+      const name = row[1];
+      if (id && typeof name === 'string' && name) out[id] = name;
+    }
+  }
+
+  return out;
+}
+
+export function cleanAgency(name) {
+  if (!name) return '';
+  let out = String(name).split('(')[0];
+  out = out.split('-')[0];
+  return out.trim();
+}
+
+function getAestYearMonth() {
+  // AEST (Brisbane) year + month index (0-11)
+  const parts = new Intl.DateTimeFormat("en-AU", {
+    timeZone: "Australia/Brisbane",
+    year: "numeric",
+    month: "2-digit",
+  }).formatToParts(new Date());
+
+  const get = (t) => parts.find(p => p.type === t)?.value ?? "";
+  return {
+    year: Number(get("year")),
+    month: Number(get("month")) - 1,
+  };
+}
+
+export function isLiveishDate(dstr) {
+  if (typeof dstr !== 'string') return false;
+  const s = dstr.toLowerCase();
+  // website uses these when game is about to start / underway
+  return /\bto go\b/.test(s) || /\bago\b/.test(s);
+}
+
+// The block's outcome headers; older two-way tables only have headers[1..2]
+export function tableOutcomes(bt) {
+  if (Array.isArray(bt?.outcomes) && bt.outcomes.length) return bt.outcomes;
+  const h = bt?.headers || [];
+  return [h[1] ?? 'Left', h[2] ?? 'Right'];
+}
+
+// One agency's prices, one per outcome (older rows only have left/right: the outer two)
+export function rowOdds(row, n) {
+  if (Array.isArray(row?.odds) && row.odds.length === n) return row.odds;
+  const out = new Array(n).fill(null);
+  out[0] = row?.left;
+  out[n - 1] = row?.right;
+  return out;
+}
+
+// The bet's legs as [{ name, agency, odds, col }], col being the leg's outcome column.
+// Like the scraper's arb engine, a 2-leg bet on a 3-outcome block takes the outer two.
+export function itemLegs(it) {
+  const bt = it?.book_table || {};
+  const outcomes = tableOutcomes(bt);
+  const n = outcomes.length;
+  const legs = Array.isArray(it?.legs) && it.legs.length >= 2
+    ? it.legs
+    : [{ ...bt.best?.left, name: outcomes[0] }, { ...bt.best?.right, name: outcomes[n - 1] }];
+  return legs.map((l, k) => ({
+    name: l?.name ?? '',
+    agency: l?.agency ?? '',
+    odds: Number(l?.odds),
+    col: legs.length === 2 ? (k === 0 ? 0 : n - 1) : k,
+  }));
+}
+
+// Lowest odds on leg j that still make an arb with the best prices on every other leg
+function requiredLegOdds(legs, j) {
+  const others = legs.reduce((s, l, k) => (k === j ? s : s + 1 / l.odds), 0);
+  if (!(others < 1)) return Infinity;
+  return 1 / (1 - others);
+}
+
+export function shouldDropBet365Glitch(it) {
+  const rows = it?.book_table?.rows || [];
+  if (!rows.length) return false;
+
+  const legs = itemLegs(it);
+  const bestAgencies = legs.map(l => cleanAgency(l.agency || '').toLowerCase());
+
+  // Only care when bet365 is actually the best on a leg
+  if (!bestAgencies.includes('bet365')) return false;
+
+  // Count unique agencies in table
+  const agencies = rows
+    .map(r => cleanAgency(r?.agency || '').toLowerCase())
+    .filter(Boolean);
+  const uniq = new Set(agencies);
+  const n = uniq.size;
+
+  // Your explicit rule: if only 2 bookies showing odds, ignore it
+  if (n <= 2) return true;
+
+  if (!legs.every(l => l.odds > 1)) return false;
+
+  const nOutcomes = tableOutcomes(it.book_table).length;
+  const need = legs.map((_, j) => requiredLegOdds(legs, j));
+  const profitable = legs.map(() => new Set());
+
+  for (const r of rows) {
+    const a = cleanAgency(r?.agency || '').toLowerCase();
+    if (!a) continue;
+
+    const prices = rowOdds(r, nOutcomes);
+    legs.forEach((l, j) => {
+      if (Number(prices[l.col]) >= need[j]) profitable[j].add(a);
+    });
+  }
+
+  const halfOrMore = Math.ceil(n / 2);
+
+  // If bet365 is the ONLY profitable bookie on its leg,
+  // and half+ of bookies are profitable on every other leg, drop it.
+  return legs.some((_, j) =>
+    bestAgencies[j] === 'bet365' &&
+    profitable[j].size === 1 && profitable[j].has('bet365') &&
+    profitable.every((s, k) => k === j || s.size >= halfOrMore)
+  );
+}
+
+const MONTHS = { jan:0,feb:1,mar:2,apr:3,may:4,jun:5,jul:6,aug:7,sep:8,oct:9,nov:10,dec:11 };
+export function coerceISO(dstr) {
+  if (typeof dstr !== 'string') return null;
+  const m = dstr.match(/^\w{3}\s+(\d{1,2})\s+([A-Za-z]{3})\s+(\d{1,2}):(\d{2})/);
+  if (!m) return null;
+
+  const day = parseInt(m[1], 10);
+  const mon = MONTHS[m[2].toLowerCase()];
+  if (mon == null) return null;
+
+  // ✅ only change: choose year using AEST month rule
+  const nowAest = getAestYearMonth();
+  const year = (mon < nowAest.month) ? (nowAest.year + 1) : nowAest.year;
+
+  const d = new Date(Date.UTC(year, mon, day, 0, 0, 0));
+  const yyyy = d.getUTCFullYear();
+  const mm = String(d.getUTCMonth() + 1).padStart(2, '0');
+  const dd = String(d.getUTCDate()).padStart(2, '0');
+  return `${yyyy}-${mm}-${dd}`;
+}
+
+export function coerceKickoffISO(dstr) {
+  if (typeof dstr !== 'string') return null;
+  const m = dstr.match(/^\w{3}\s+(\d{1,2})\s+([A-Za-z]{3})\s+(\d{1,2}):(\d{2})/);
+  if (!m) return null;
+
+  const day = parseInt(m[1], 10);
+  const mon = MONTHS[m[2].toLowerCase()];
+  const hh = parseInt(m[3], 10);
+  const mi = parseInt(m[4], 10);
+  if (mon == null) return null;
+
+  // ✅ only change: choose year using AEST month rule
+  const nowAest = getAestYearMonth();
+  const year = (mon < nowAest.month) ? (nowAest.year + 1) : nowAest.year;
+
+  const d = new Date(Date.UTC(year, mon, day, hh, mi, 0));
+  return d.toISOString(); // unchanged (still Z, same as before)
+}
+
+// --- API: opportunities ---
+// pool: anything with pg's query(); loadActive: () => active_comp_ids json
+export function makeOpportunitiesRoute({ pool, loadActive }) {
+  return async (req, res) => {
+    // 1) Load items from Postgres
+    let items = [];
+    let lastUpdated = null;
+
+    try {
+      const result = await pool.query('SELECT data FROM opportunities');
+      items = result.rows.map(r => r.data);
+
+      // the scraper's last run, not the last row change (quiet runs leave scraped_at alone)
+      const status = await pool.query('SELECT last_updated FROM scrape_status WHERE id = 1');
+      if (status.rows.length > 0 && status.rows[0].last_updated) {
+        lastUpdated = new Date(status.rows[0].last_updated).toISOString();
+      }
+    } catch (e) {
+      console.error('DB error loading opportunities', e);
+      return res.json({
+        ok: false,
+        lastUpdated: null,
+        total: 0,
+        page: 1,
+        pages: 1,
+        sports: [],
+        competitionIds: [],
+        leagues: [],
+        agencies: [],
+        items: []
+      });
+    }
+
+    // 2) Load active leagues (same as before)
+    const active = await loadActive();
+    const leagueMap = resolveLeagueMap(active);
+
+    const {
+      sports = '',
+      sport = '',
+      competitionIds = '',
+      competitionId = '',
+      leagues = '',
+      dateFrom = '',
+      dateTo = '',
+      minRoi = '0',
+      sortBy = 'roi',
+      sortDir = 'desc',
+      page = '1',
+      pageSize = '50',
+      bookies = '',
+    } = req.query;
+
+    for (const it of items) {
+      if (!it.dateISO && it.date) {
+        const iso = coerceISO(it.date);
+        if (iso) it.dateISO = iso;
+      }
+      if (!it.kickoff && it.date) {
+        const k = coerceKickoffISO(it.date);
+        if (k) it.kickoff = k;
+      }
+    }
+
+    const mRoi = Number(minRoi) || 0;
+    const p = Math.max(1, Number(page) || 1);
+    const ps = Math.min(500, Math.max(1, Number(pageSize) || 50));
+
+    const toLowerSet = (csv) =>
+      new Set(String(csv || '').split(',').map(s => s.trim()).filter(Boolean).map(s => s.toLowerCase()));
+    const toIdSet = (csv) => new Set(String(csv || '').split(',').map(s => s.trim()).filter(Boolean));
+
+    const sportSet  = (sports ? toLowerSet(sports) : toLowerSet(sport));
+    const compSet   = (competitionIds ? toIdSet(competitionIds) : toIdSet(competitionId));
+    const bookSet   = toLowerSet(bookies);
+    const leagueSet = new Set(String(leagues || '').split(',').map(s => s.trim()).filter(Boolean));
+
+    const clean = (s) => (s || '').trim().toLowerCase();
+
+    let base = (items || []).filter((it) => {
+      const rows = it.book_table?.rows || [];
+      const legs = itemLegs(it);
+      const anyBookmaker = legs.some(l => clean(l.agency) === 'bookmaker') || rows.some(r => clean(r?.agency) === 'bookmaker');
+      if (anyBookmaker) return false;
+
+      // drop "to go" / "ago" timestamps (in-play / near start)
+      if (isLiveishDate(it.date)) return false;
+
+      // drop suspected bet365 glitch arbs
+      if (shouldDropBet365Glitch(it)) return false;
+
+      if (legs.every(l => Number.isFinite(l.odds) && l.odds > 0)) {
+        const mktPct = legs.reduce((s, l) => s + 1 / l.odds, 0) * 100;
+        if (!Number.isFinite(mktPct) || mktPct >= 100) return false;
+        it.market_percentage = Math.round(mktPct * 100) / 100;
+        it.roi = Math.round(((1 / (mktPct / 100)) - 1) * 1e6) / 1e6;
+      }
+      return true;
+    });
+
+    // attach league
+    for (const it of base) {
+      const compId = toStrId(it.competitionid ?? it.competitionId ?? '');
+      it.league = leagueMap[compId] || null;
+    }
+
+    let filtered = base.filter(it => {
+      const roiOk = (Number(it.roi) || 0) >= mRoi / 100;
+      const s = (it.sport || '').toLowerCase();
+      const sportOk = sportSet.size === 0 || sportSet.has(s);
+      const cid = toStrId(it.competitionid ?? it.competitionId ?? '');
+      const compOk = compSet.size === 0 || compSet.has(cid);
+      const dfOk = !dateFrom || (it.dateISO && it.dateISO >= dateFrom);
+      const dtOk = !dateTo || (it.dateISO && it.dateISO <= dateTo);
+
+      let bookOk = true;
+      if (bookSet.size > 0) {
+        // every leg has to be placeable at one of the chosen bookies
+        bookOk = itemLegs(it).every(l => {
+          const a = cleanAgency(l.agency || '').toLowerCase();
+          return !!(a && bookSet.has(a));
+        });
+      }
+
+      const leagueOk = leagueSet.size === 0 ? true : (it.league && leagueSet.has(it.league));
+      return roiOk && sportOk && compOk && dfOk && dtOk && bookOk && leagueOk;
+    });
+
+    const dir = sortDir === 'asc' ? 1 : -1;
+    const key = (a) => {
+      switch (sortBy) {
+        case 'dateISO': return a.dateISO || '';
+        case 'kickoff': return a.kickoff || '';
+        case 'sport':   return (a.sport || '').toLowerCase();
+        case 'league':  return (a.league || '').toLowerCase();
+        case 'roi':
+        default:        return Number(a.roi) || 0;
+      }
+    };
+    filtered.sort((a, b) => (key(a) > key(b) ? 1 : key(a) < key(b) ? -1 : 0) * dir);
+
+    const total = filtered.length;
+    const pages = Math.max(1, Math.ceil(total / ps));
+    const start = (p - 1) * ps;
+    const pageItems = filtered.slice(start, start + ps);
+
+    const sportsList = [...new Set(base.map(i => i.sport).filter(Boolean))].sort((a,b)=>(a||'').localeCompare(b||''));
+    const competitionIdsList = [...new Set(base.map(i => i.competitionid || i.competitionId).filter(Boolean))].sort((a,b)=>Number(a)-Number(b));
+    const leaguesList = [...new Set(base.map(i => i.league).filter(Boolean))].sort((a,b)=>a.localeCompare(b));
+
+    const agenciesSet = new Set();
+
+    for (const it of base) {
+      // 1) Add ALL agencies present in the odds table rows (this is the key fix)
+      const rows = it.book_table?.rows || [];
+      for (const row of rows) {
+        const a = cleanAgency(row?.agency || '');
+        if (a) agenciesSet.add(a);
+      }
+
+      // 2) Also keep the best legs (harmless redundancy)
+      for (const l of itemLegs(it)) {
+        const a = cleanAgency(l.agency || '');
+        if (a) agenciesSet.add(a);
+      }
+    }
+
+    const agencies = [...agenciesSet].sort((a,b)=>a.localeCompare(b));
+
+    res.json({
+      ok: true,
+      lastUpdated,
+      total,
+      page: p,
+      pages,
+      sports: sportsList,
+      competitionIds: competitionIdsList, // still available if you want to use IDs
+      leagues: leaguesList,               // names (what app.js uses)
+      agencies,
+      items: pageItems
+    });
+  };
+}
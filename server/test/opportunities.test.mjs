@@ -0,0 +1,125 @@
+// node --test test/   (no dependencies: the route gets a stub pool instead of Postgres)
+import test from 'node:test';
+import assert from 'node:assert/strict';
+
+import { makeOpportunitiesRoute, itemLegs, shouldDropBet365Glitch } from '../opportunities.js';
+
+// Home / Draw / Away with a different best agency on each outcome
+function threeWay(overrides = {}) {
+  return {
+    sport: 'Soccer',
+    competitionid: '42',
+    game: 'Reds v Blues',
+    market: 'Head to Head',
+    date: 'Sat 14 Mar 19:30',
+    match: 'Sportsbet - 3.0 | TAB - 4.0 | Neds - 3.2',
+    market_percentage: 50,  // stale: the route re-prices from the legs
+    roi: 1,
+    legs: [
+      { name: 'Reds', agency: 'Sportsbet', odds: 3.0 },
+      { name: 'Draw', agency: 'TAB', odds: 4.0 },
+      { name: 'Blues', agency: 'Neds', odds: 3.2 },
+    ],
+    book_table: {
+      headers: ['Agency', 'Reds', 'Blues', 'Updated'],
+      outcomes: ['Reds', 'Draw', 'Blues'],
+      rows: [
+        { agency: 'Sportsbet', left: '3.00', right: '2.90', odds: ['3.00', '3.60', '2.90'] },
+        { agency: 'TAB', left: '2.80', right: '3.00', odds: ['2.80', '4.00', '3.00'] },
+        { agency: 'Neds', left: '2.90', right: '3.20', odds: ['2.90', '3.70', '3.20'] },
+      ],
+      best: {
+        left: { agency: 'Sportsbet', odds: 3.0 },
+        right: { agency: 'Neds', odds: 3.2 },
+        outcomes: [
+          { agency: 'Sportsbet', odds: 3.0 },
+          { agency: 'TAB', odds: 4.0 },
+          { agency: 'Neds', odds: 3.2 },
+        ],
+      },
+    },
+    ...overrides,
+  };
+}
+
+function stubPool(items, lastUpdated = '2026-03-10T01:02:03Z') {
+  return {
+    async query(sql) {
+      if (/FROM opportunities/.test(sql)) return { rows: items.map(data => ({ data })) };
+      if (/FROM scrape_status/.test(sql)) return { rows: [{ last_updated: lastUpdated }] };
+      throw new Error(`unexpected query: ${sql}`);
+    },
+  };
+}
+
+async function call(items, query = {}) {
+  const route = makeOpportunitiesRoute({ pool: stubPool(items), loadActive: async () => ({ leagues_by_compid: { 42: 'A-League' } }) });
+  let body;
+  await route({ query }, { json: (b) => { body = b; } });
+  return body;
+}
+
+test('a 3-way item is priced on all three legs', async () => {
+  const body = await call([threeWay()]);
+  assert.equal(body.ok, true);
+  assert.equal(body.total, 1);
+  assert.equal(body.lastUpdated, '2026-03-10T01:02:03.000Z');
+
+  const it = body.items[0];
+  const pct = (1 / 3.0 + 1 / 4.0 + 1 / 3.2) * 100;
+  assert.equal(it.market_percentage, Math.round(pct * 100) / 100);
+  assert.equal(it.roi, Math.round((100 / pct - 1) * 1e6) / 1e6);
+  assert.equal(it.league, 'A-League');
+  assert.ok(body.agencies.includes('TAB'));
+});
+
+test('a 3-way item that is not an arb on all legs is dropped', async () => {
+  // the outer two alone (3.0 / 3.2) look like a huge arb; with the draw at 2.0 it's not one
+  const it = threeWay();
+  it.legs[1].odds = 2.0;
+  const body = await call([it]);
+  assert.equal(body.total, 0);
+});
+
+test('the bookie filter needs every leg, not just the outer two', async () => {
+  assert.equal((await call([threeWay()], { bookies: 'sportsbet,neds' })).total, 0);
+  assert.equal((await call([threeWay()], { bookies: 'sportsbet,neds,tab' })).total, 1);
+});
+
+test('older two-way rows still price off best.left / best.right', async () => {
+  const it = threeWay();
+  delete it.legs;
+  delete it.book_table.outcomes;
+  it.book_table.rows.forEach(r => delete r.odds);
+  const body = await call([it]);
+  const pct = (1 / 3.0 + 1 / 3.2) * 100;
+  assert.equal(body.items[0].market_percentage, Math.round(pct * 100) / 100);
+});
+
+test('a 2-leg bet on a 3-outcome block uses the outer columns', () => {
+  const it = threeWay();
+  it.legs = [it.legs[0], it.legs[2]];
+  assert.deepEqual(itemLegs(it).map(l => l.col), [0, 2]);
+  assert.deepEqual(itemLegs(threeWay()).map(l => l.col), [0, 1, 2]);
+});
+
+test('bet365 alone on the draw, with the other legs widely profitable, is a glitch', () => {
+  const it = threeWay({
+    legs: [
+      { name: 'Reds', agency: 'Sportsbet', odds: 3.0 },
+      { name: 'Draw', agency: 'bet365', odds: 4.0 },
+      { name: 'Blues', agency: 'Neds', odds: 3.2 },
+    ],
+  });
+  it.book_table.rows = [
+    { agency: 'Sportsbet', odds: ['3.00', '2.60', '3.20'] },
+    { agency: 'TAB', odds: ['3.00', '2.60', '3.20'] },
+    { agency: 'Neds', odds: ['2.95', '2.60', '3.20'] },
+    { agency: 'bet365', odds: ['2.50', '4.00', '2.60'] },
+  ];
+  assert.equal(shouldDropBet365Glitch(it), true);
+
+  // a second bookie close to bet365 on the draw makes it believable
+  it.book_table.rows[1].odds[1] = '3.90';
+  assert.equal(shouldDropBet365Glitch(it), false);
+});
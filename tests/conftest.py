@@ -0,0 +1,8 @@
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# scraper/ and scripts/ are flat script directories with sibling imports
+for sub in ("scraper", "scripts"):
+    sys.path.insert(0, os.path.join(ROOT, sub))
@@ -0,0 +1,55 @@
+"""Betting-page index: phrases resolve to the first matching subheading, and lazy parses agree with full ones."""
+import glob
+import os
+
+import pytest
+
+import scraper
+from parser_parity import read_page
+
+FIXTURES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scraper", "fixtures")
+
+
+def block(heading, home, away):
+    return (f'<tr><td class="subheading">{heading}</td><td></td><td>Home</td><td>Away</td><td>Updated</td></tr>'
+            f'<tr><td><a href="#">Sportsbet</a></td><td>{home}</td><td>{away}</td><td>12:00</td></tr>'
+            '<tr><td></td><td></td></tr>')
+
+
+PAGE = ('<html><body><table class="betting">'
+        + block("Cats v Swans - 1st Half", "1.90", "1.90")
+        + block("Cats v Swans", "2.10", "1.80")
+        + block("Over 160.5", "1.85", "1.95")
+        + '</table></body></html>')
+
+
+def left(table):
+    return table["rows"][0]["left"]
+
+
+def test_an_earlier_containing_heading_beats_a_later_exact_one():
+    index = scraper.parse_betting_page(PAGE)
+    assert list(index) == ["cats v swans - 1st half", "cats v swans", "over 160.5"]
+    # the old search walked td.subheading in order and took the first containing the phrase
+    assert left(scraper.lookup_betting_table(index, "Cats v Swans")) == "1.90"
+    assert left(scraper.lookup_betting_table(index, "Cats  v Swans - 1st HALF")) == "1.90"
+    assert left(scraper.lookup_betting_table(index, "160.5")) == "1.85"
+    assert scraper.lookup_betting_table(index, "Lions v Suns") is None
+
+
+def test_a_lazy_parse_only_extracts_what_the_phrases_need():
+    index = scraper.parse_betting_page(PAGE, ["Cats v Swans", "Lions v Suns"])
+    assert list(index) == ["cats v swans - 1st half"]
+    assert left(scraper.lookup_betting_table(index, "Cats v Swans")) == "1.90"
+
+
+@pytest.mark.parametrize("path", sorted(glob.glob(os.path.join(FIXTURES, "betting", "*.html*"))),
+                         ids=os.path.basename)
+def test_lazy_and_full_parses_resolve_phrases_alike(path):
+    html = read_page(path)
+    full = scraper.parse_betting_page(html)
+    phrases = list(full)[::3] + [h.split(" v ")[0] for h in list(full)[1::5]] + ["no such market"]
+    lazy = scraper.parse_betting_page(html, phrases)
+    assert len(lazy) <= len(phrases) - 1
+    for phrase in phrases:
+        assert scraper.lookup_betting_table(lazy, phrase) == scraper.lookup_betting_table(full, phrase)
@@ -0,0 +1,182 @@
+"""Opportunity keys and the Postgres sync, against an in-memory stand-in that applies the sync's SQL."""
+import csv
+import json
+
+import pytest
+
+import metrics
+import scraper
+
+
+class FakeCursor:
+    """Applies the statements save_opportunities_to_db issues to FakeConn's table, by statement kind."""
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.rowcount = -1
+        self._result = []
+
+    def execute(self, sql, params=None):
+        self.conn.statements.append(" ".join(sql.split()))
+        db = self.conn.work
+        if "CREATE TEMP TABLE opp_stage" in sql:
+            self.conn.stage = {}
+        elif "DELETE FROM opportunities" in sql:
+            gone = [k for k in db["opportunities"] if k not in self.conn.stage]
+            for k in gone:
+                del db["opportunities"][k]
+            self.rowcount = len(gone)
+        elif "INSERT INTO opportunities" in sql:
+            self._result = []
+            for key, data in self.conn.stage.items():
+                if key not in db["opportunities"]:
+                    db["opportunities"][key] = data
+                    self._result.append((True,))
+                elif json.loads(db["opportunities"][key]) != json.loads(data):
+                    db["opportunities"][key] = data
+                    self._result.append((False,))
+        elif "INSERT INTO scrape_status" in sql:
+            db["last_updated"] = params[0]
+
+    def copy_expert(self, sql, buf):
+        self.conn.statements.append(" ".join(sql.split()))
+        self.conn.stage.update((k, d) for k, d in csv.reader(buf))
+
+    def fetchall(self):
+        return self._result
+
+    def close(self):
+        pass
+
+
+class FakeConn:
+    def __init__(self):
+        self.committed = {"opportunities": {}, "last_updated": None}
+        self.work = None
+        self.rollback()
+        self.stage = {}
+        self.statements = []
+        self.commits = 0
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def commit(self):
+        self.committed = self.work
+        self.rollback()
+        self.commits += 1
+
+    def rollback(self):
+        self.work = {"opportunities": dict(self.committed["opportunities"]),
+                     "last_updated": self.committed["last_updated"]}
+
+    @property
+    def rows(self):
+        return {k: json.loads(v) for k, v in self.committed["opportunities"].items()}
+
+
+@pytest.fixture
+def conn(monkeypatch):
+    def execute_values(cur, sql, rows):
+        cur.conn.statements.append(" ".join(sql.split()))
+        cur.conn.stage.update(rows)
+
+    monkeypatch.setattr(scraper, "execute_values", execute_values)
+    c = FakeConn()
+    yield c
+    scraper._SCHEMA_READY.discard(id(c))
+
+
+def item(game, a="2.10", b="1.95", **extra):
+    return {"competitionid": 11, "sport": "AFL", "game": game, "date": "14/03/2026 19:30",
+            "market": "Head to Head", "match": f"Home - {a} | Away - {b}", "roi": 0.01,
+            "url": "https://example.test/bet", **extra}
+
+
+def counters():
+    c = metrics.snapshot()["counters"]
+    return {k: c.get(f"db.{k}", 0) for k in ("inserted", "changed", "deleted")}
+
+
+def test_key_ignores_field_order_and_odds():
+    it = item("Cats v Swans")
+    reordered = dict(reversed(list(it.items())))
+    moved = item("Cats v Swans", a="2.40", b="1.70", roi=0.05, market_percentage=98.1)
+    assert scraper.opportunity_key(reordered) == scraper.opportunity_key(it)
+    assert scraper.opportunity_key(moved) == scraper.opportunity_key(it)
+
+
+@pytest.mark.parametrize("change", [
+    {"game": "Cats v Lions"},
+    {"date": "15/03/2026 19:30"},
+    {"market": "Line"},
+    {"competitionid": 12},
+    {"match": "Home - 2.10 | Draw - 3.00 | Away - 1.95"},
+])
+def test_key_changes_with_the_opportunity(change):
+    assert scraper.opportunity_key({**item("Cats v Swans"), **change}) != scraper.opportunity_key(item("Cats v Swans"))
+
+
+def test_sync_counts_inserts_changes_and_deletes(conn, capsys):
+    metrics.reset()
+    scraper.save_opportunities_to_db([item("A"), item("B"), item("C")], conn, last_updated="2026-03-10T01:00:00Z")
+    assert counters() == {"inserted": 3, "changed": 0, "deleted": 0}
+    assert all("url" not in r for r in conn.rows.values())
+
+    metrics.reset()
+    scraper.save_opportunities_to_db([item("A"), item("B", a="2.30"), item("D")], conn,
+                                     last_updated="2026-03-10T01:05:00Z")
+    assert counters() == {"inserted": 1, "changed": 1, "deleted": 1}
+    assert metrics.snapshot()["gauges"]["db.unchanged"] == 1
+    assert "+1 new, ~1 changed, -1 gone, =1 unchanged" in capsys.readouterr().out
+    assert sorted(r["game"] for r in conn.rows.values()) == ["A", "B", "D"]
+    assert conn.rows[scraper.opportunity_key(item("B"))]["match"] == "Home - 2.30 | Away - 1.95"
+
+
+def test_streamed_batches_only_upsert(conn):
+    scraper.save_opportunities_to_db([item("A"), item("B")], conn)
+    conn.statements.clear()
+    scraper.save_opportunities_to_db([item("C")], conn, prune=False)
+    assert sorted(r["game"] for r in conn.rows.values()) == ["A", "B", "C"]
+    assert not any(s.startswith("DELETE") for s in conn.statements)
+
+
+def test_duplicate_keys_keep_the_first_item(conn):
+    scraper.save_opportunities_to_db([item("A", a="2.50"), item("A", a="2.20")], conn)
+    assert [r["match"] for r in conn.rows.values()] == ["Home - 2.50 | Away - 1.95"]
+
+
+def test_copy_path_stages_the_same_rows(conn, monkeypatch):
+    monkeypatch.setattr(scraper, "DB_COPY_THRESHOLD", 1)
+    scraper.save_opportunities_to_db([item("A"), item("B", game_note='has "quotes", commas')], conn)
+    assert any(s.startswith("COPY opp_stage") for s in conn.statements)
+    assert sorted(r["game"] for r in conn.rows.values()) == ["A", "B"]
+
+
+def test_scrape_status_moves_with_the_sync_even_when_nothing_changed(conn):
+    scraper.save_opportunities_to_db([item("A")], conn, last_updated="2026-03-10T01:00:00Z")
+    scraper.save_opportunities_to_db([item("A")], conn, last_updated="2026-03-10T01:05:00Z")
+    assert conn.committed["last_updated"] == "2026-03-10T01:05:00Z"
+    status = [s for s in conn.statements if "scrape_status (id, last_updated)" in s]
+    assert len(status) == 2
+    # schema setup runs once per connection
+    assert sum("CREATE TABLE IF NOT EXISTS scrape_status" in s for s in conn.statements) == 1
+
+
+def test_streamed_batches_leave_scrape_status_alone(conn):
+    scraper.save_opportunities_to_db([item("A")], conn, prune=False)
+    assert conn.committed["last_updated"] is None
+    assert not any("scrape_status (id, last_updated)" in s for s in conn.statements)
+
+
+def test_a_failed_sync_rolls_back(conn, monkeypatch):
+    scraper.save_opportunities_to_db([item("A")], conn, last_updated="2026-03-10T01:00:00Z")
+
+    def boom(cur, rows):
+        raise RuntimeError("copy failed")
+
+    monkeypatch.setattr(scraper, "_stage_rows", boom)
+    with pytest.raises(RuntimeError):
+        scraper.save_opportunities_to_db([item("B")], conn, last_updated="2026-03-10T01:05:00Z")
+    assert [r["game"] for r in conn.rows.values()] == ["A"]
+    assert conn.committed["last_updated"] == "2026-03-10T01:00:00Z"
@@ -0,0 +1,111 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import deliver
+
+
+class StubWebhook:
+    """Local stand-in for a webhook: replies from a script of (status, body, headers), then 204."""
+
+    def __init__(self, script):
+        self.script = list(script)
+        self.requests = []
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+                stub.requests.append((time.monotonic(), json.loads(body or b"{}")))
+                status, reply, headers = stub.script.pop(0) if stub.script else (204, None, {})
+                self.send_response(status)
+                for k, v in headers.items():
+                    self.send_header(k, v)
+                data = json.dumps(reply).encode() if reply is not None else b""
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/webhook"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def fast_backoff(monkeypatch):
+    monkeypatch.setattr(deliver, "BACKOFF_SECS", 0.01)
+    monkeypatch.setattr(deliver, "MAX_ATTEMPTS", 3)
+
+
+def run(stub, blocks=("hit",)):
+    try:
+        [report] = deliver.deliver("header", list(blocks), [deliver.Discord(stub.url)])
+    finally:
+        stub.close()
+    return report
+
+
+def test_channel_is_abstract():
+    with pytest.raises(TypeError):
+        deliver.Channel()
+
+
+def test_429_waits_out_retry_after(fast_backoff):
+    stub = StubWebhook([(429, {"retry_after": 0.3}, {})])
+    report = run(stub)
+    assert (report["sent"], report["retries"], report["rate_limited"]) == (1, 1, 1)
+    (t1, _), (t2, _) = stub.requests
+    assert t2 - t1 >= 0.3
+
+
+def test_429_retry_after_header(fast_backoff):
+    stub = StubWebhook([(429, None, {"Retry-After": "0.2"})])
+    report = run(stub)
+    assert report["sent"] == 1 and report["rate_limited"] == 1
+    (t1, _), (t2, _) = stub.requests
+    assert t2 - t1 >= 0.2
+
+
+def test_5xx_retries_with_backoff(fast_backoff):
+    stub = StubWebhook([(502, None, {}), (503, None, {})])
+    report = run(stub)
+    assert (report["sent"], report["retries"], report["rate_limited"]) == (1, 2, 0)
+    times = [t for t, _ in stub.requests]
+    assert len(times) == 3
+    # exponential backoff: BACKOFF_SECS, then twice that
+    assert times[1] - times[0] >= 0.01
+    assert times[2] - times[1] >= 0.02
+
+
+def test_gives_up_after_max_attempts(fast_backoff):
+    stub = StubWebhook([(500, None, {})] * 5)
+    report = run(stub)
+    assert report["sent"] == 0 and report["retries"] == 2
+    assert len(stub.requests) == 3
+
+
+def test_4xx_is_not_retried(fast_backoff):
+    stub = StubWebhook([(400, {"message": "bad"}, {})])
+    report = run(stub)
+    assert report["sent"] == 0 and report["retries"] == 0
+    assert len(stub.requests) == 1
+
+
+def test_messages_are_chunked_and_spaced(fast_backoff, monkeypatch):
+    monkeypatch.setattr(deliver.Discord, "min_interval", 0.1)
+    stub = StubWebhook([])
+    report = run(stub, blocks=["x" * 900] * 5)
+    assert report["messages"] == report["sent"] == len(stub.requests) == 3
+    assert all(len(body["content"]) <= deliver.Discord.limit for _, body in stub.requests)
+    times = [t for t, _ in stub.requests]
+    assert all(b - a >= 0.1 for a, b in zip(times, times[1:]))
@@ -0,0 +1,127 @@
+"""Competition discovery: the HTTP probe's verdicts, sharding, merging and the re-probe backoff."""
+import json
+import os
+
+import pytest
+
+import discover_active_compids as discover
+
+FIXTURES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scraper", "fixtures")
+
+
+def read_fixture(rel):
+    with open(os.path.join(FIXTURES, rel), encoding="utf-8") as f:
+        return f.read()
+
+
+def test_probe_confirms_a_raw_page_with_odds():
+    for rel in ("discover/active.html", "discover/market_header.html"):
+        assert discover.probe_verdict(discover.analyze_page(read_fixture(rel))) is True
+
+
+def test_probe_never_calls_a_page_inactive():
+    # no recorded inactive raw page yet: anything without odds markers goes to Chrome
+    for html in (read_fixture("discover/inactive.html"), "", "<html><body>Loading…</body></html>"):
+        assert discover.probe_verdict(discover.analyze_page(html)) is None
+
+
+
+@pytest.mark.parametrize("n", [1, 3, 8])
+def test_shards_cover_the_range_without_gaps_or_overlap(n):
+    ids = discover.parse_range("1-3000")
+    shards = [discover.shard_ids(ids, discover.parse_shard(f"{i}/{n}")) for i in range(1, n + 1)]
+    assert sum(len(s) for s in shards) == len(ids)
+    assert sorted(x for s in shards for x in s) == ids
+    # interleaved, so the dense low IDs are shared out evenly
+    assert max(len(s) for s in shards) - min(len(s) for s in shards) <= 1
+    assert all(s[0] <= n for s in shards)
+
+
+@pytest.mark.parametrize("spec", ["0/8", "9/8", "1/0"])
+def test_bad_shard_spec(spec):
+    with pytest.raises(ValueError):
+        discover.parse_shard(spec)
+
+
+def test_merge_is_lossless(tmp_path):
+    ids = discover.parse_range("1-40")
+    paths = []
+    for i in range(1, 5):
+        mine = discover.shard_ids(ids, (i, 4))
+        active = [c for c in mine if c % 3 == 0]
+        payload = {
+            "range": "1-40",
+            "skip": [72],
+            "active_comp_ids": active,
+            "leagues_by_compid": {str(c): f"League {c}" for c in active},
+            "debug_counts": {str(c): {"td_more_market_odds": c} for c in mine},
+        }
+        path = tmp_path / f"shard_{i}.json"
+        path.write_text(json.dumps(payload))
+        paths.append(str(path))
+
+    merged = discover.merge_outputs(paths)
+    expected = [c for c in ids if c % 3 == 0]
+    assert merged["active_comp_ids"] == expected
+    assert merged["leagues_by_compid"] == {str(c): f"League {c}" for c in expected}
+    assert sorted(int(k) for k in merged["debug_counts"]) == ids
+    assert merged["range"] == "1-40"
+    assert merged["skip"] == [72]
+    assert merged["merged_from"] == 4
+
+
+H = 3600.0
+DAY = 86400.0
+
+
+def due(entry, now):
+    return discover.is_due(entry, now, base_hours=20, max_days=14, recent_days=7)
+
+
+def test_unknown_active_and_errored_ids_are_always_due():
+    assert due(None, 0)
+    assert due({"status": "active", "last_checked": 100}, 101)
+    assert due({"status": "error"}, 0)
+
+
+def test_inactive_backoff_doubles_and_caps():
+    ids = {}
+    now = 1_000_000.0
+    discover.update_state(ids, 5, "inactive", None, now)
+    entry = ids["5"]
+    assert entry["fails"] == 1 and entry["last_checked"] == now
+    assert not due(entry, now + 20 * H - 1)
+    assert due(entry, now + 20 * H)
+
+    discover.update_state(ids, 5, "inactive", None, now)
+    assert not due(entry, now + 40 * H - 1)
+    assert due(entry, now + 40 * H)
+
+    entry["fails"] = 30  # 20h * 2**29 would be centuries: capped at max_days
+    assert due(entry, now + 14 * DAY)
+
+
+def test_recently_active_ids_skip_the_backoff():
+    ids = {}
+    now = 1_000_000.0
+    discover.update_state(ids, 9, "active", "A-League", now)
+    assert ids["9"] == {"fails": 0, "last_active": now, "status": "active", "last_checked": now, "league": "A-League"}
+    discover.update_state(ids, 9, "inactive", None, now + H)
+    assert due(ids["9"], now + 2 * H)                  # active an hour ago: keep checking
+
+    later = now + 8 * DAY                              # a week on, the backoff applies
+    discover.update_state(ids, 9, "inactive", None, later)
+    assert not due(ids["9"], later + 19 * H)
+    assert due(ids["9"], later + 40 * H)               # fails == 2
+
+
+def test_an_error_keeps_the_previous_verdict_and_backoff():
+    ids = {}
+    discover.update_state(ids, 3, "inactive", None, 100.0)
+    discover.update_state(ids, 3, "error", None, 200.0)
+    assert ids["3"]["status"] == "inactive"
+    assert ids["3"]["fails"] == 1 and ids["3"]["last_checked"] == 100.0
+    assert ids["3"]["last_error"] == 200.0
+
+    discover.update_state(ids, 4, "error", None, 200.0)
+    assert due(ids["4"], 201.0)  # never checked successfully: retry next run
@@ -0,0 +1,73 @@
+"""MultiBet cells parse into the right number of legs, and verification only keeps bets the block can price."""
+import os
+
+import scraper
+
+FIXTURES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scraper", "fixtures")
+
+
+def read_fixture(rel):
+    with open(os.path.join(FIXTURES, rel), encoding="utf-8") as f:
+        return f.read()
+
+
+def page(*cells):
+    """A minimal MultiBet page: one game, one market per cell."""
+    rows = []
+    for cell in cells:
+        rows.append('<tr><td class="market"><a href="#">Head to Head</a></td></tr>'
+                    f'<tr><td><table class="odds"><tr><td id="more-market-odds">{cell}</td></tr></table></td></tr>')
+    return ('<html><body><select class="dd-select" name="sport"><option selected>Soccer</option></select>'
+            '<table><tr class="game"><td>1</td><td>01/11/2025 19:00</td><td>Reds v Blues</td></tr>'
+            f'<tr><td colspan="3"><table class="markets">{"".join(rows)}</table></td></tr></table></body></html>')
+
+
+def pick(text, marketid="1000"):
+    return f"""<a href="#" onclick="addSelection('5','0','{marketid}','5','1','0','odds');">{text}</a>"""
+
+
+def legs(rows):
+    return [len(r["match"].split(" | ")) for r in rows]
+
+
+def test_extra_links_dont_change_a_two_way_comp():
+    plain = scraper.parse_multibet_html(read_fixture("multibet/afl_small.html"), 11)
+    extra = scraper.parse_multibet_html(read_fixture("multibet/afl_extra_links.html"), 11)
+    assert plain
+    assert extra == plain
+    assert set(legs(extra)) == {2}
+
+
+def test_leg_count_follows_the_selections():
+    rows = scraper.parse_multibet_html(page(
+        pick("Reds - 2.20") + pick("Blues - 2.10") + '<a href="/form">Form - 2024</a>',
+        pick("Reds - 4.40") + pick("Draw - 4.50") + pick("Blues - 4.60"),
+        pick("Reds - 5.00") + pick("Draw - 5.00") + pick("Blues - 5.00") + pick("Neither - 5.00"),
+        pick("Reds - 2.20") + pick("Blues - 2.10") + pick("Reds 1H - 3.50", marketid="1001"),
+    ), 5)
+    assert legs(rows) == [2, 3, 4, 2]
+
+
+def test_dummy_draw_is_dropped():
+    rows = scraper.parse_multibet_html(page(pick("Reds - 2.20") + '<a href="#">Draw - 1.00</a>' + pick("Blues - 2.10")), 5)
+    assert [r["match"] for r in rows] == ["Reds - 2.20 | Blues - 2.10"]
+
+
+def table(outcomes, *prices):
+    return {"headers": ["Agency", outcomes[0], outcomes[-1], "Updated"], "outcomes": outcomes,
+            "rows": [{"agency": a, "odds": list(p), "left": p[0], "right": p[-1]} for a, p in prices]}
+
+
+def test_verify_drops_bets_the_block_cant_price():
+    two_way = table(["Reds", "Blues"], ("Sportsbet", ["2.20", "1.80"]), ("Neds", ["1.80", "2.15"]))
+    unpriced = table(["Reds", "Draw", "Blues"], ("Sportsbet", ["4.40", "", "4.60"]))
+    rows = [
+        {"url": "u1", "match": "Reds - 2.20 | Blues - 2.15"},                 # priced: kept
+        {"url": "u1", "match": "Reds - 4.0 | Draw - 4.0 | Blues - 4.0"},      # 3 legs on a 2-outcome block
+        {"url": "u2", "match": "Reds - 4.4 | Draw - 4.0 | Blues - 4.6"},      # nobody prices the draw
+        {"url": None, "match": "Reds - 2.20 | Blues - 2.15"},                 # no betting page: as before
+    ]
+    out = scraper.verify_rows(rows, {("u1", ""): two_way, ("u2", ""): unpriced})
+    assert out == [rows[0], rows[3]]
+    assert [(l["agency"], l["odds"]) for l in out[0]["legs"]] == [("Sportsbet", 2.2), ("Neds", 2.15)]
+    assert out[0]["market_percentage"] == round((1 / 2.2 + 1 / 2.15) * 100, 2)
@@ -0,0 +1,87 @@
+"""Odds history: daily compaction on rollover, and a compaction that crashes part-way never double-counts."""
+import datetime as dt
+import os
+
+import pytest
+
+import odds_history
+from odds_history import OddsHistory
+
+
+def ms(day, hour=0, minute=0):
+    return int(dt.datetime.fromisoformat(f"{day}T{hour:02d}:{minute:02d}:00+00:00").timestamp() * 1000)
+
+
+def obs(observed_ms, odds=2.1, agency="Sportsbet"):
+    return [{"observed_ms": observed_ms, "updated_ms": observed_ms - 1000, "competitionid": 11,
+             "event": "Cats v Swans", "event_date": "2026-03-14", "market": "Head to Head",
+             "agency": agency, "side": side, "odds": odds} for side in ("Cats", "Swans")]
+
+
+def names(store, day):
+    return sorted(os.listdir(os.path.join(store.root, day)))
+
+
+def scanned(store, **filters):
+    return sorted((o["observed_ms"], o["agency"], o["side"], o["odds"]) for o in store.scan(**filters))
+
+
+@pytest.fixture
+def store(tmp_path):
+    return OddsHistory(str(tmp_path / "history"))
+
+
+def test_the_first_append_of_a_new_day_compacts_the_day_before(store):
+    for minute in (0, 10, 20):
+        store.append(obs(ms("2026-03-10", 23, minute)))
+    assert len(store.segments("2026-03-10")) == 3
+    before = scanned(store)
+
+    store.append(obs(ms("2026-03-11", 0, 5)))
+    assert names(store, "2026-03-10") == [f"seg-{ms('2026-03-10', 23)}-compact.ohs"]
+    assert len(store.segments("2026-03-11")) == 1
+    assert scanned(store, end="2026-03-11") == before
+
+    # later appends the same day leave yesterday alone
+    store.append(obs(ms("2026-03-11", 0, 15)))
+    assert len(store.segments("2026-03-10")) == 1
+    assert len(store.segments("2026-03-11")) == 2
+
+
+def test_a_crash_after_the_merged_write_doesnt_duplicate_rows(store, monkeypatch):
+    for minute in (0, 10, 20):
+        store.append(obs(ms("2026-03-10", 12, minute), odds=2.0 + minute / 100))
+    before = scanned(store)
+
+    def crash(path):
+        raise OSError("killed mid-compaction")
+
+    monkeypatch.setattr(odds_history.os, "remove", crash)
+    with pytest.raises(OSError):
+        store.compact("2026-03-10")
+    monkeypatch.undo()
+
+    assert len(names(store, "2026-03-10")) == 4          # merged segment + all three inputs
+    assert store.segments("2026-03-10") == [os.path.join(store.root, "2026-03-10",
+                                                         f"seg-{ms('2026-03-10', 12)}-compact.ohs")]
+    assert scanned(store) == before
+
+    # the next compaction clears the leftovers
+    store.compact("2026-03-10")
+    assert names(store, "2026-03-10") == [f"seg-{ms('2026-03-10', 12)}-compact.ohs"]
+    assert scanned(store) == before
+
+
+def test_recompacting_a_compacted_day_keeps_every_row(store):
+    store.append(obs(ms("2026-03-10", 12, 0)))
+    store.append(obs(ms("2026-03-10", 12, 10)))
+    store.compact("2026-03-10")
+    store.append(obs(ms("2026-03-10", 12, 20), agency="Neds"))
+    before = scanned(store)
+    assert len(before) == 6
+
+    # same first row, so the new merged segment takes the old one's name
+    assert store.compact("2026-03-10") == (2, 6)
+    assert names(store, "2026-03-10") == [f"seg-{ms('2026-03-10', 12)}-compact.ohs"]
+    assert scanned(store) == before
+    assert scanned(store, agency="Neds") == [r for r in before if r[1] == "Neds"]
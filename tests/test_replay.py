@@ -0,0 +1,110 @@
+"""A page recorded and served back by replay.py parses exactly like the page itself."""
+import gzip
+import os
+import threading
+
+import pytest
+
+import discover_active_compids as discover
+import replay
+import scraper
+
+FIXTURES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scraper", "fixtures")
+
+
+def read_fixture(rel):
+    path = os.path.join(FIXTURES, rel)
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        return f.read()
+
+
+def fixtures(kind):
+    return sorted(os.path.join(kind, n) for n in os.listdir(os.path.join(FIXTURES, kind))
+                  if n.endswith((".html", ".html.gz")))
+
+
+@pytest.fixture
+def stand_in(tmp_path, monkeypatch):
+    """Record every fixture through record_page() (as a RECORD_DIR run would), then serve the archive."""
+    monkeypatch.setattr(replay, "RECORD_DIR", str(tmp_path))
+    monkeypatch.setattr(replay, "_RECORDER", None)
+    base = "http://odds.aussportsbetting.com"
+    urls = {}
+    for i, rel in enumerate(fixtures("betting")):
+        urls[rel] = f"{base}/betting?function=fixture&matchnumber={i}"
+        replay.record_page(replay.page_key(urls[rel]), read_fixture(rel))
+    for i, rel in enumerate(fixtures("discover")):
+        urls[rel] = discover.BASE_URL.format(1000 + i)
+        replay.record_page(replay.page_key(urls[rel]), read_fixture(rel))
+    for i, rel in enumerate(fixtures("multibet")):
+        urls[rel] = f"/_replay/multibet/{2000 + i}"
+        replay.record_page(replay.multibet_key(2000 + i), read_fixture(rel))
+
+    server = replay.serve(str(tmp_path), port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    local = f"http://127.0.0.1:{server.server_address[1]}"
+    session = scraper.make_http_session()
+    yield {rel: local + replay.page_key(url) for rel, url in urls.items()}, session
+    session.close()
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.mark.parametrize("rel", fixtures("betting"))
+def test_replayed_betting_page_parses_like_the_fixture(stand_in, rel):
+    urls, session = stand_in
+    html = scraper._fetch_http(session, urls[rel])  # the verification stage's own fetch
+    assert html is not None
+    assert scraper.parse_betting_page(html) == scraper.parse_betting_page(read_fixture(rel))
+
+
+def test_replayed_pages_through_verify_tables(stand_in):
+    urls, session = stand_in
+    pairs = []
+    for rel in fixtures("betting"):
+        for heading in scraper.parse_betting_page(read_fixture(rel)):
+            pairs.append((urls[rel], heading))
+    tables = scraper.verify_tables(None, session, pairs)
+    expected = {}
+    for rel in fixtures("betting"):
+        index = scraper.parse_betting_page(read_fixture(rel))
+        expected.update({(urls[rel], h): scraper.lookup_betting_table(index, h) for h in index})
+    assert tables == expected
+    assert all(t is not None for t in tables.values())
+
+
+@pytest.mark.parametrize("rel", fixtures("discover"))
+def test_replayed_discover_page_analyzes_like_the_fixture(stand_in, rel):
+    urls, session = stand_in
+    html = session.get(urls[rel], timeout=5).text
+    assert discover.analyze_page(html) == discover.analyze_page(read_fixture(rel))
+
+
+@pytest.mark.parametrize("rel", fixtures("multibet"))
+def test_replayed_multibet_payload_parses_like_the_fixture(stand_in, rel):
+    # the stand-in's update button swaps this fragment into the shell's page
+    urls, session = stand_in
+    html = session.get(urls[rel], timeout=5).text
+    assert scraper.parse_multibet_html(html, 5) == scraper.parse_multibet_html(read_fixture(rel), 5)
+    # only the shell's own compid input and update button are left on the page
+    assert 'name="compid"' not in html and 'id="update"' not in html
+
+
+def test_replayed_fragment_drops_every_kind_of_form_control():
+    page = ("<html><body><form>"
+            "<select class='dd-select' name=compid><option value='11' selected>AFL</option></select>"
+            "<select name=\"compid_filter\"><option>x</option></select>"
+            "<INPUT type=\"hidden\" name='compid' value='11'>"
+            "<input id=update type=submit value=Update>"
+            "<a href='#' id=\"update\" onclick=\"go()\">Update</a>"
+            "</form><table class=\"odds\"><tr><td id=\"more-market-odds\">1.90</td></tr></table></body></html>")
+    out = replay._fragment(page)
+    assert "compid'" not in out and "name=compid" not in out and "update" not in out.lower()
+    assert 'name="compid_filter"' in out and 'id="more-market-odds"' in out
+
+
+def test_unrecorded_page_is_a_404(stand_in):
+    urls, session = stand_in
+    local = urls[fixtures("betting")[0]].split("/betting", 1)[0]
+    assert session.get(local + "/betting?function=nope", timeout=5).status_code == 404
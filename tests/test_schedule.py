@@ -0,0 +1,36 @@
+"""Adaptive refresh: yield scores verified arbs, and carried items say they're carried."""
+from schedule import RefreshSchedule, YIELD_FULL
+
+
+def rows(n, compid=7):
+    return [{"competitionid": compid, "game": f"G{i}", "market": "H2H", "match": f"A - 2.1 | B - 2.0 #{i}"}
+            for i in range(n)]
+
+
+def test_yield_counts_verified_rows_not_candidates(tmp_path):
+    sched = RefreshSchedule(str(tmp_path / "s.json"), min_secs=60, max_secs=1800)
+    sched.record(7, rows(20), [], now=1000.0)
+    assert sched.comps["7"]["yield"] == 0.0
+
+    sched.record(7, rows(20), rows(int(YIELD_FULL)), now=2000.0)
+    assert 0.0 < sched.comps["7"]["yield"] < YIELD_FULL
+
+
+def test_carried_items_are_marked_with_their_scrape_time(tmp_path):
+    path = str(tmp_path / "s.json")
+    sched = RefreshSchedule(path)
+    verified = rows(2)
+    sched.record(7, verified, verified, now=1_700_000_000.0)
+    sched.save()
+
+    later = RefreshSchedule.load(path)
+    carried = later.carried_items([7, 8])
+    assert [it["game"] for it in carried] == ["G0", "G1"]
+    assert all(it["carried"] is True for it in carried)
+    assert {it["scraped_at"] for it in carried} == {"2023-11-14T22:13:20Z"}
+    assert "carried" not in verified[0] and "scraped_at" not in verified[0]
+
+    # carrying again doesn't move scraped_at or touch the stored items
+    again = later.carried_items([7])
+    assert again[0]["scraped_at"] == "2023-11-14T22:13:20Z"
+    assert "carried" not in later.comps["7"]["items"][0]
@@ -0,0 +1,120 @@
+import json
+import sqlite3
+from datetime import datetime, timezone
+
+import pytest
+
+from seen_store import DATE_GRACE_SECS, SeenStore, expiry_for
+
+NOW = datetime(2026, 3, 10, 12, 0, tzinfo=timezone.utc).timestamp()
+DAY = 86400
+
+
+def midnight(date_iso):
+    return datetime.strptime(date_iso, "%Y-%m-%d").replace(tzinfo=timezone.utc).timestamp()
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "seen.sqlite")
+
+
+def statements(store):
+    """Record the SQL the store runs from here on."""
+    seen = []
+    store.conn.set_trace_callback(seen.append)
+    return seen
+
+
+def test_dated_keys_expire_a_grace_day_after_the_event():
+    assert expiry_for("2026-03-12", NOW, ttl_days=14) == midnight("2026-03-12") + DAY + DATE_GRACE_SECS
+    # a far-off event is still capped at the TTL
+    assert expiry_for("2026-12-25", NOW, ttl_days=14) == int(NOW + 14 * DAY)
+
+
+@pytest.mark.parametrize("date_iso", [None, "", "soon", "12/03/2026"])
+def test_undated_keys_use_the_ttl(date_iso):
+    assert expiry_for(date_iso, NOW, ttl_days=14) == int(NOW + 14 * DAY)
+
+
+def test_keys_survive_a_reopen_until_they_expire(path):
+    store = SeenStore(path, ttl_days=14, now=NOW)
+    assert store.is_new
+    store.add("a|2026-03-12", "2026-03-12")
+    store.add("b")
+    store.close()
+
+    store = SeenStore(path, ttl_days=14, now=NOW + DAY)
+    assert not store.is_new
+    assert store.purge() == 0
+    assert "a|2026-03-12" in store and "b" in store and "c" not in store
+    store.close()
+
+    # past the event's grace day: the dated key goes, the undated one waits out its TTL
+    store = SeenStore(path, ttl_days=14, now=midnight("2026-03-12") + DAY + DATE_GRACE_SECS)
+    assert store.purge() == 1
+    assert "a|2026-03-12" not in store and "b" in store
+    store.close()
+
+    store = SeenStore(path, ttl_days=14, now=NOW + 14 * DAY)
+    assert store.purge() == 1
+    assert store.count() == 0
+    store.close()
+
+
+def test_past_events_are_past(path):
+    store = SeenStore(path, ttl_days=14, now=NOW)
+    assert store.is_past("2026-03-01")
+    assert not store.is_past("2026-03-10")
+    assert not store.is_past(None)
+    store.close()
+
+
+def test_import_legacy_keeps_only_live_keys(path, tmp_path):
+    legacy = tmp_path / "seen_keys.json"
+    legacy.write_text(json.dumps([
+        "11|afl|cats v swans|h2h|cats - 2.1 | swans - 2.0|2026-03-12",
+        "11|afl|old game|h2h|x - 2.1 | y - 2.0|2026-01-02",
+        "12|nrl|undated|h2h|x - 2.1 | y - 2.0|",
+    ]))
+    store = SeenStore(path, ttl_days=14, now=NOW)
+    assert store.import_legacy(str(legacy)) == 2
+    assert "11|afl|cats v swans|h2h|cats - 2.1 | swans - 2.0|2026-03-12" in store
+    assert "11|afl|old game|h2h|x - 2.1 | y - 2.0|2026-01-02" not in store
+    assert "12|nrl|undated|h2h|x - 2.1 | y - 2.0|" in store
+    # importing again changes nothing
+    store.import_legacy(str(legacy))
+    assert store.count() == 2
+    store.close()
+
+    store = SeenStore(path, ttl_days=14, now=NOW)
+    assert store.count() == 2
+    store.close()
+
+
+@pytest.mark.parametrize("content", [None, "{not json", json.dumps({"keys": ["a"]})])
+def test_import_legacy_ignores_missing_or_odd_files(path, tmp_path, content):
+    legacy = tmp_path / "seen_keys.json"
+    if content is not None:
+        legacy.write_text(content)
+    store = SeenStore(path, now=NOW)
+    assert store.import_legacy(str(legacy)) == 0
+    store.close()
+
+
+def test_vacuum_only_when_the_purge_freed_rows(path):
+    store = SeenStore(path, ttl_days=1, now=NOW)
+    store.add("a")
+    seen = statements(store)
+    store.purge()
+    store.close()
+    assert not any(s.startswith("VACUUM") for s in seen)
+
+    store = SeenStore(path, ttl_days=1, now=NOW + 2 * DAY)
+    seen = statements(store)
+    assert store.purge() == 1
+    store.close()
+    assert any(s.startswith("VACUUM") for s in seen)
+
+    with sqlite3.connect(path) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM seen").fetchone()[0] == 0
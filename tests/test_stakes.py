@@ -0,0 +1,75 @@
+"""plan_stakes: rounded plans keep the total, lose a bounded slice of ROI, and never pay out less than staked."""
+import numpy as np
+import pytest
+
+from stakes import add_stake_plans, plan_stakes
+
+
+def random_arbs(rng, rows, legs, edge_max=0.06):
+    """Odds whose implied probabilities sum to 1 / (1 + edge): every row is an arb."""
+    probs = rng.dirichlet(np.ones(legs) * 2, size=rows)
+    probs = np.clip(probs, 0.02, None)
+    probs /= probs.sum(axis=1, keepdims=True)
+    edge = rng.uniform(0.0, edge_max, size=(rows, 1))
+    return np.round(1.0 / (probs / (1 + edge)), 2)
+
+
+@pytest.mark.parametrize("legs", [2, 3, 4])
+@pytest.mark.parametrize("bankroll,step", [(100, 1), (100, 5), (500, 5), (1000, 1), (1000, 10)])
+def test_rounded_plans_bounded_loss(legs, bankroll, step):
+    rng = np.random.default_rng(legs * 1000 + bankroll + step)
+    odds = random_arbs(rng, 2000, legs)
+    p = plan_stakes(odds, bankroll, step)
+    total = round(bankroll / step) * step
+
+    stakes = p["stakes"]
+    assert np.all(stakes >= 0)
+    assert np.allclose(stakes / step, np.round(stakes / step))          # every stake on the step
+    assert np.allclose(p["total"], total)                                # rounding keeps the total
+    payouts = stakes * odds
+    assert np.all(payouts >= 0)
+    assert np.allclose(p["payout"], payouts.min(axis=1))
+
+    # each leg is within one step of its ideal stake, so the guaranteed payout drops by
+    # at most step * (that leg's odds) and ROI by at most step * max(odds) / total
+    inv = 1.0 / odds
+    ideal_roi = 1.0 / inv.sum(axis=1) - 1.0
+    roi = p["profit"] / total
+    bound = step * odds.max(axis=1) / total
+    assert np.all(ideal_roi - roi <= bound + 1e-9)
+    assert np.all(roi <= ideal_roi + 1e-9)
+
+    # where the arb's edge covers that bound, no outcome returns less than was staked
+    safe = ideal_roi > bound
+    if step / total <= 0.01:
+        assert safe.any()  # (coarse steps on a small bankroll can eat the whole edge)
+    assert np.all(payouts[safe] - total >= -1e-9)
+
+
+def test_two_leg_plan_is_the_best_rounded_split():
+    # brute force over every $1 split of $100 for a handful of two-way arbs
+    rng = np.random.default_rng(7)
+    odds = random_arbs(rng, 50, 2)
+    p = plan_stakes(odds, 100, 1)
+    for row, plan_profit in zip(odds, p["profit"]):
+        a = np.arange(0, 101)
+        best = np.minimum(a * row[0], (100 - a) * row[1]).max() - 100
+        assert plan_profit == pytest.approx(best)
+
+
+def test_add_stake_plans_attaches_every_bankroll_and_step():
+    items = [
+        {"legs": [{"odds": 2.1}, {"odds": 2.05}]},
+        {"legs": [{"odds": 3.4}, {"odds": 3.9}, {"odds": 2.6}]},
+        {"match": "Home - 2.10 | Away - 2.00"},
+        {"match": "not a priced match"},
+    ]
+    assert add_stake_plans(items, bankrolls=[100, 500], steps=[1, 5]) == 3
+    for it in items[:3]:
+        assert [(s["bankroll"], s["step"]) for s in it["stakes"]] == [(100, 1), (100, 5), (500, 1), (500, 5)]
+        assert it["roi_rounded"] == it["stakes"][1]["roi"]
+        for s in it["stakes"]:
+            assert round(sum(s["stakes"]), 2) == s["bankroll"]
+            assert min(s["stakes"]) >= 0
+    assert len(items[1]["stakes"][0]["stakes"]) == 3
+    assert "stakes" not in items[3] and "roi_rounded" not in items[3]
@@ -0,0 +1,141 @@
+"""Streaming output: the NDJSON file and the per-comp verify/emit consumer."""
+import json
+import os
+
+import pytest
+
+import scraper
+from stream import NdjsonStream
+
+
+def read_lines(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def test_ndjson_start_append_finalize(tmp_path):
+    path = str(tmp_path / "out" / "opps.ndjson")
+    s = NdjsonStream(path)
+    s.start([{"id": "carried"}])
+    s.append([{"id": 1}, {"id": 2}])
+    s.append([])
+    s.append([{"id": 3}])
+    assert [r["id"] for r in read_lines(path)] == ["carried", 1, 2, 3]
+    assert s.rows == 4
+
+    s.finalize([{"id": 3}, {"id": 1}])
+    assert [r["id"] for r in read_lines(path)] == [3, 1]
+    assert s.rows == 2
+    assert os.listdir(tmp_path / "out") == ["opps.ndjson"]
+
+
+def test_ndjson_finalize_swaps_the_file_in_whole(tmp_path):
+    path = str(tmp_path / "opps.ndjson")
+    s = NdjsonStream(path)
+    s.start()
+    s.append([{"id": 1}])
+    with open(path, encoding="utf-8") as reader:
+        s.finalize([{"id": 2}, {"id": 3}])
+        # a reader that opened the streamed file keeps reading it; it never sees a mix
+        assert [json.loads(line)["id"] for line in reader] == [1]
+    assert [r["id"] for r in read_lines(path)] == [2, 3]
+
+
+def test_ndjson_start_replaces_last_runs_file(tmp_path):
+    path = str(tmp_path / "opps.ndjson")
+    NdjsonStream(path).start([{"id": "old"}])
+    NdjsonStream(path).start()
+    assert read_lines(path) == []
+
+
+TABLE = {"headers": ["Agency", "Reds", "Blues", "Updated"], "outcomes": ["Reds", "Blues"],
+         "rows": [{"agency": "Sportsbet", "odds": ["2.20", "1.80"], "left": "2.20", "right": "1.80"},
+                  {"agency": "Neds", "odds": ["1.80", "2.15"], "left": "1.80", "right": "2.15"}]}
+
+
+def row(compid, game):
+    return {"competitionid": compid, "game": game, "url": f"u{compid}", "match": "Reds - 2.20 | Blues - 2.15"}
+
+
+class StubRuntime:
+    def __init__(self):
+        self.dropped = 0
+
+    def db(self):
+        return object()
+
+    def drop_db(self):
+        self.dropped += 1
+
+
+@pytest.fixture
+def stream(tmp_path, monkeypatch):
+    """A CompStream writing NDJSON and 'DB' batches, with verification served from TABLE."""
+    failing = set()
+    saved = []
+
+    def verify(runtime, rows):
+        compid = rows[0]["competitionid"]
+        if compid in failing:
+            raise RuntimeError("betting page blew up")
+        return {(r["url"], ""): TABLE for r in rows}
+
+    monkeypatch.setattr(scraper, "STREAM_PATH", str(tmp_path / "opps.ndjson"))
+    monkeypatch.setattr(scraper, "_verify_comp_rows", verify)
+    monkeypatch.setattr(scraper, "save_opportunities_to_db",
+                        lambda rows, conn, prune=True: saved.append(([r["game"] for r in rows], prune)))
+    s = scraper.CompStream(StubRuntime(), {"ndjson", "db"})
+    s.failing, s.saved = failing, saved
+    yield s
+    s.finish()
+
+
+def test_carried_rows_go_out_before_any_comp(stream):
+    carried = [dict(row(9, "Old game"), carried=True)]
+    stream.start(carried)
+    assert [r["game"] for r in read_lines(stream.ndjson.path)] == ["Old game"]
+    assert stream.saved == [(["Old game"], False)]
+
+    stream.put(1, [row(1, "A")])
+    stream.finish()
+    assert [r["game"] for r in read_lines(stream.ndjson.path)] == ["Old game", "A"]
+    assert stream.saved[-1] == (["A"], False)
+
+
+def test_comps_stream_in_order_and_finalize_sorts(stream):
+    stream.start([])
+    stream.put(1, [row(1, "A")])
+    stream.put(2, [row(2, "B"), row(2, "C")])
+    verified = stream.finish()
+    assert [r["game"] for r in verified] == ["A", "B", "C"]
+    assert all("legs" in r and "stakes" in r for r in verified)
+    assert [g for g, _ in stream.saved] == [["A"], ["B", "C"]]
+
+    final = sorted(verified, key=lambda r: r["game"], reverse=True)
+    stream.ndjson.finalize(final)
+    assert [r["game"] for r in read_lines(stream.ndjson.path)] == ["C", "B", "A"]
+
+
+def test_a_comp_failing_mid_stream_doesnt_stop_the_rest(stream, capsys):
+    stream.failing.add(2)
+    stream.start([])
+    stream.put(1, [row(1, "A")])
+    stream.put(2, [row(2, "B")])
+    stream.put(3, [row(3, "C")])
+    verified = stream.finish()
+    assert [r["game"] for r in verified] == ["A", "C"]
+    assert [r["game"] for r in read_lines(stream.ndjson.path)] == ["A", "C"]
+    assert "compid 2 not verified" in capsys.readouterr().out
+
+
+def test_a_db_error_drops_the_connection_but_keeps_streaming(stream, monkeypatch):
+    def broken(rows, conn, prune=True):
+        raise OSError("connection reset")
+
+    monkeypatch.setattr(scraper, "save_opportunities_to_db", broken)
+    stream.start([])
+    stream.put(1, [row(1, "A")])
+    stream.put(2, [row(2, "B")])
+    assert [r["game"] for r in stream.finish()] == ["A", "B"]
+    assert stream.runtime.dropped == 2
+    assert [r["game"] for r in read_lines(stream.ndjson.path)] == ["A", "B"]
@@ -384,31 +384,70 @@ function requiredRightOdds(bestLeft) {
   return 1 / (1 - 1 / Number(bestLeft));
 }
 
+// --- Outcomes / legs (2-, 3- or N-way; older rows only have left/right) ---
+function tableOutcomes(t) {
+  if (Array.isArray(t?.outcomes) && t.outcomes.length) return t.outcomes;
+  return [t?.headers?.[1] ?? 'Left', t?.headers?.[2] ?? 'Right'];
+}
+function rowOdds(r, n) {
+  if (Array.isArray(r?.odds) && r.odds.length === n) return r.odds;
+  const out = new Array(n).fill(null);
+  out[0] = r?.left;
+  out[n - 1] = r?.right;
+  return out;
+}
+// Best {agency, odds} per outcome column
+function bestByOutcome(t) {
+  const n = tableOutcomes(t).length;
+  if (Array.isArray(t?.best?.outcomes) && t.best.outcomes.length === n) return t.best.outcomes;
+  const out = new Array(n).fill(null);
+  out[0] = t?.best?.left;
+  out[n - 1] = t?.best?.right;
+  return out;
+}
+// The bet's legs: the scraper's verified legs, else best.left/right.
+// A 2-leg bet on a 3-outcome block uses the outer two columns (same as the scraper).
+function itemLegs(it) {
+  const t = it.book_table || {};
+  const names = tableOutcomes(t);
+  const n = names.length;
+  const legs = Array.isArray(it.legs) && it.legs.length >= 2
+    ? it.legs
+    : [{ ...t.best?.left, name: names[0] }, { ...t.best?.right, name: names[n - 1] }];
+  return legs.map((l, k) => ({
+    name: l?.name ?? '',
+    agency: l?.agency ?? '',
+    odds: Number(l?.odds),
+    col: legs.length === 2 ? (k === 0 ? 0 : n - 1) : k,
+  }));
+}
+
 // --- Expanded odds table ---
 function renderFullBookTable(it) {
   const t = it.book_table;
   if (!t) return '';
-  const headerL = t.headers?.[1] ?? 'Left';
-  const headerR = t.headers?.[2] ?? 'Right';
+  const names = tableOutcomes(t);
+  const best = bestByOutcome(t);
   const rowsHtml = (t.rows || [])
     .map((r) => {
       const agency = cleanAgencyName(r.agency || '');
-      const isBestL =
-        t.best?.left?.agency &&
-        cleanAgencyName(t.best.left.agency) === agency &&
-        Number(t.best.left.odds).toFixed(2) === Number(r.left).toFixed(2);
-      const isBestR =
-        t.best?.right?.agency &&
-        cleanAgencyName(t.best.right.agency) === agency &&
-        Number(t.best.right.odds).toFixed(2) === Number(r.right).toFixed(2);
       const mark = (v, on) =>
         `<span class="px-2 py-0.5 rounded ${on ? 'bg-amber-100 dark:bg-amber-900/40 font-semibold' : ''} tabular-nums">${v || ''}</span>`;
+      const cells = rowOdds(r, names.length)
+        .map((v, j) => {
+          const b = best[j];
+          const isBest =
+            b?.agency &&
+            cleanAgencyName(b.agency) === agency &&
+            Number(b.odds).toFixed(2) === Number(v).toFixed(2);
+          return `<td class="px-3 py-2 text-right">${mark(v, isBest)}</td>`;
+        })
+        .join('');
       return `
       <tr class="border-t border-slate-200 dark:border-slate-700">
         <td class="px-3 py-2"><div class="flex items-center gap-2">
           <img src="${logoFor(agency)}" class="w-5 h-5 rounded" onerror="this.src='/logos/placeholder.jpeg'"><span>${agency}</span></div></td>
-        <td class="px-3 py-2 text-right">${mark(r.left, isBestL)}</td>
-        <td class="px-3 py-2 text-right">${mark(r.right, isBestR)}</td>
+        ${cells}
         <td class="px-3 py-2 text-right text-slate-500 dark:text-slate-400">
           ${r.updatedISO ? formatUpdated(r.updatedISO) : (r.updated || '')}
         </td>
@@ -423,8 +462,7 @@ function renderFullBookTable(it) {
           <thead class="text-slate-600 dark:text-slate-300">
             <tr>
               <th class="px-3 py-2 text-left">Agency</th>
-              <th class="px-3 py-2 text-right">${headerL}</th>
-              <th class="px-3 py-2 text-right">${headerR}</th>
+              ${names.map((h) => `<th class="px-3 py-2 text-right">${h}</th>`).join('')}
               <th class="px-3 py-2 text-right">Updated</th>
             </tr>
           </thead>
@@ -1306,14 +1344,132 @@ async function fetchData() {
   updateSummaryText(state.selectedBookies, state._agencies, els.bookiesSummary, 'All bookies');
   updateSummaryText(state.selectedBookies, state._agencies, els.bookiesSelectedCount, 'All');
 
+  const chip = (agency, odds) => `
+      <div class="bookie-chip">
+        <div class="bookie-identity min-w-0">
+          <img src="${logoFor(agency)}" alt="${agency}" onerror="this.src='/logos/placeholder.jpeg'">
+          <span class="bookie-name truncate">${agency}</span>
+        </div>
+        <span class="bookie-odds tabular-nums">${Number(odds).toFixed(2)}</span>
+      </div>`;
+
+  // -------- shared row markup + expandable odds table --------
+  function fillRow(tr, it, roiLocal, betLabels, bookiesCell) {
+    const kickoffTxt = it.kickoff ? fmtWithTZ(it.kickoff) : (it.date || it.dateISO || '');
+    const leagueCell = it.league || '—';
+    const roiPct   = (roiLocal * 100).toFixed(2) + '%';
+    tr.dataset.roi = String(roiLocal);
+    tr.dataset.game = it.game || '';
+    tr.dataset.market = it.market || '';
+
+    tr.innerHTML = `
+      <td class="col-date">${kickoffTxt}</td>
+
+      <td class="col-roi" data-roi="${roiLocal}">
+        <span class="roi-pill">${roiPct}</span>
+      </td>
+
+      <td class="col-sport">${it.sport || ''}</td>
+
+      <td class="col-league">${leagueCell}</td>
+
+      <td class="col-gm">
+        <div class="gm">
+          <div class="gm-game">${it.game || ''}</div>
+          <div class="gm-market">${it.market || ''}</div>
+        </div>
+      </td>
+
+      <td class="col-bets">
+        <div class="bets">
+          ${betLabels.map(b => `<div>${b}</div>`).join('')}
+        </div>
+      </td>
+
+      <td class="col-bookies">${bookiesCell}</td>
+
+      <td class="col-actions">
+        <button class="toggle-odds icon-btn" title="Show odds table" type="button">
+          <svg xmlns="http://www.w3.org/2000/svg" class="icon" viewBox="0 0 24 24" fill="none">
+            <rect x="3" y="3" width="18" height="18" rx="2" stroke="currentColor" stroke-width="2"/>
+            <path d="M8 7h8M7 11h10M7 15h10M7 19h10" stroke="currentColor" stroke-width="2" stroke-linecap="round"/>
+          </svg>
+        </button>
+      </td>
+    `;
+
+    const trDetails = document.createElement('tr');
+    trDetails.className = 'hidden';
+    const tdDetails = document.createElement('td');
+    tdDetails.colSpan = 8;
+    tdDetails.innerHTML = it.book_table ? renderFullBookTable(it) : '';
+    trDetails.appendChild(tdDetails);
+
+    tr.querySelector('.toggle-odds').addEventListener('click', (e) => {
+      e.stopPropagation();
+      toggleDetails(trDetails);
+    });
+    return trDetails;
+  }
+
+  function toggleDetails(trDetails) {
+    trDetails.classList.toggle('hidden');
+    if (!trDetails.classList.contains('hidden')) {
+      const rect = trDetails.getBoundingClientRect();
+      if (rect.bottom > window.innerHeight) trDetails.scrollIntoView({ block: 'nearest' });
+    }
+  }
+
+  // -------- 3+ leg markets: best allowed price per leg, no pair calculator --------
+  function buildMultiLegBundle(it, allowed, legs) {
+    const tr = document.createElement('tr');
+    tr.className = 'hover:bg-slate-50';
+
+    const n = tableOutcomes(it.book_table).length;
+    const rows = it.book_table?.rows || [];
+    const opts = legs.map(l => rows
+      .map(r => ({ agency: cleanAgencyName(r.agency||''), odds: Number(rowOdds(r, n)[l.col]) }))
+      .filter(o => o.agency && o.odds > 1 && (!allowed || allowed.has(o.agency))));
+    if (opts.some(o => !o.length)) return null; // a leg nobody (allowed) prices
+
+    const chosen = opts.map(o => o.reduce((a, b) => (b.odds > a.odds ? b : a)));
+    const edge = chosen.reduce((s, c) => s + 1 / c.odds, 0);
+    if (edge >= 1) return null; // not profitable given allowed bookies
+    const roiLocal = 1 / edge - 1;
+
+    // other bookies on each leg that still keep it an arb with the chosen prices elsewhere
+    const bookiesCell = `
+      <div class="stack">
+        ${chosen.map((c, j) => {
+          const need = 1 / (1 - (edge - 1 / c.odds));
+          const others = opts[j].filter(o => o.agency !== c.agency && o.odds >= need).length;
+          const label = others > 0
+            ? `<div class="mt-1 text-[11px] text-slate-500 dark:text-slate-400">+${others} other profitable bookie${others>1?'s':''}</div>`
+            : '';
+          return `<div>${chip(c.agency, c.odds)}${label}</div>`;
+        }).join('')}
+      </div>`;
+
+    const trDetails = fillRow(tr, it, roiLocal, legs.map(l => l.name), bookiesCell);
+
+    // the calculator is two-way only; a row click opens the odds table instead
+    tr.addEventListener('click', (e) => {
+      if (e.target.closest('.toggle-odds')) return;
+      toggleDetails(trDetails);
+    });
+
+    return { tr, trDetails, roi: roiLocal };
+  }
+
   // -------- core row building util (returns {bundle|null, roi} ) --------
   function buildBundle(it, allowed) {
+    const legs = itemLegs(it);
+    if (legs.length > 2) return buildMultiLegBundle(it, allowed, legs);
+
     const tr = document.createElement('tr');
     tr.className = 'hover:bg-slate-50';
 
     const bets = parseBets(it.match);
-    const kickoffTxt = it.kickoff ? fmtWithTZ(it.kickoff) : (it.date || it.dateISO || '');
-    const leagueCell = it.league || '—';
 
     // Build option arrays from full table
     let optsAAll = [], optsBAll = [];
@@ -1361,15 +1517,6 @@ async function fetchData() {
       ? `<button class="side-list-btn mt-1 text-[11px] text-slate-500 dark:text-slate-400 underline underline-offset-2" data-side="right">+${rightOthers} other profitable bookie${rightOthers>1?'s':''}</button>`
       : '';
 
-    const chip = (agency, odds) => `
-      <div class="bookie-chip">
-        <div class="bookie-identity min-w-0">
-          <img src="${logoFor(agency)}" alt="${agency}" onerror="this.src='/logos/placeholder.jpeg'">
-          <span class="bookie-name truncate">${agency}</span>
-        </div>
-        <span class="bookie-odds tabular-nums">${Number(odds).toFixed(2)}</span>
-      </div>`;
-
     const bookiesCell = `
       <div class="stack">
         <div>
@@ -1383,8 +1530,6 @@ async function fetchData() {
       </div>`;
 
     const roiLocal = best.roi;
-    const roiPct   = (roiLocal * 100).toFixed(2) + '%';
-    tr.dataset.roi = String(roiLocal);
 
     const title = `${it.game || ''} — ${it.market || ''}`.replace(/"/g, '&quot;');
     const headerL = it.book_table?.headers?.[1] || bets.top || 'Left';
@@ -1395,52 +1540,8 @@ async function fetchData() {
     tr._pairToUse = best;
     tr._leftOptions = optsAAll;
     tr._rightOptions = optsBAll;
-    tr.dataset.game = it.game || '';
-    tr.dataset.market = it.market || '';
-
-    tr.innerHTML = `
-      <td class="col-date">${kickoffTxt}</td>
 
-      <td class="col-roi" data-roi="${roiLocal}">
-        <span class="roi-pill">${roiPct}</span>
-      </td>
-
-      <td class="col-sport">${it.sport || ''}</td>
-
-      <td class="col-league">${leagueCell}</td>
-
-      <td class="col-gm">
-        <div class="gm">
-          <div class="gm-game">${it.game || ''}</div>
-          <div class="gm-market">${it.market || ''}</div>
-        </div>
-      </td>
-
-      <td class="col-bets">
-        <div class="bets">
-          <div>${bets.top}</div>
-          <div>${bets.bottom}</div>
-        </div>
-      </td>
-
-      <td class="col-bookies">${bookiesCell}</td>
-
-      <td class="col-actions">
-        <button class="toggle-odds icon-btn" title="Show odds table" type="button">
-          <svg xmlns="http://www.w3.org/2000/svg" class="icon" viewBox="0 0 24 24" fill="none">
-            <rect x="3" y="3" width="18" height="18" rx="2" stroke="currentColor" stroke-width="2"/>
-            <path d="M8 7h8M7 11h10M7 15h10M7 19h10" stroke="currentColor" stroke-width="2" stroke-linecap="round"/>
-          </svg>
-        </button>
-      </td>
-    `;
-
-    const trDetails = document.createElement('tr');
-    trDetails.className = 'hidden';
-    const tdDetails = document.createElement('td');
-    tdDetails.colSpan = 8;
-    tdDetails.innerHTML = it.book_table ? renderFullBookTable(it) : '';
-    trDetails.appendChild(tdDetails);
+    const trDetails = fillRow(tr, it, roiLocal, [bets.top, bets.bottom], bookiesCell);
 
     // Handlers
     tr.addEventListener('click', (e) => {
@@ -1464,15 +1565,6 @@ async function fetchData() {
       });
     });
 
-    tr.querySelector('.toggle-odds').addEventListener('click', (e) => {
-      e.stopPropagation();
-      trDetails.classList.toggle('hidden');
-      if (!trDetails.classList.contains('hidden')) {
-        const rect = trDetails.getBoundingClientRect();
-        if (rect.bottom > window.innerHeight) trDetails.scrollIntoView({ block: 'nearest' });
-      }
-    });
-
     tr.addEventListener('click', (e) => {
       const btn = e.target.closest('.side-list-btn');
       if (!btn) return;